@@ -0,0 +1,122 @@
+"""
+Benchmark: memory allocated per frame by the capture-to-landmarks path
+
+Compares the old path, which flips every captured frame and converts it
+to RGB into a fresh array, with the current one, which leaves the pixels
+alone (MIRROR_LANDMARKS), converts into a reused buffer and mirrors the
+landmarks numerically.
+
+Allocations are measured with tracemalloc. It sees everything allocated
+through Python's allocators, including numpy arrays and the arrays OpenCV
+returns, but not MediaPipe's internal C++ buffers, so the numbers isolate
+this application's own per-frame allocations. For each frame it reports
+the peak of newly allocated memory during the frame (transient arrays)
+and, over the whole run, the memory still held afterwards (leaks/growth).
+
+Usage: python benchmarks/bench_allocations.py [--video PATH] [--frames N]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from common import PROJECT_ROOT, make_results  # noqa: F401  (puts src/ on sys.path)
+from run_benchmarks import load_frames
+import config
+
+try:
+    from hand_tracker import HandTracker
+except ImportError:
+    # MediaPipe is missing: only the pixel work is compared
+    HandTracker = None
+
+
+def measure(process_frame, frames, count: int, warmup: int = 10):
+    """Per-frame transient peak (bytes), retained growth (bytes) and time (ms)"""
+    for i in range(warmup):
+        process_frame(frames[i % len(frames)])
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    peaks = []
+    start = time.perf_counter()
+    for i in range(count):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        process_frame(frames[i % len(frames)])
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    elapsed = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    return {
+        'peak_kb': float(np.mean(peaks)) / 1024,
+        'max_peak_kb': max(peaks) / 1024,
+        'retained_kb': retained / 1024,
+        'ms': elapsed / count * 1000,
+    }
+
+
+def pixel_paths(frames):
+    rgb = np.empty_like(frames[0])
+
+    def before(frame):
+        flipped = cv2.flip(frame, 1)
+        return cv2.cvtColor(flipped, cv2.COLOR_BGR2RGB)
+
+    def after(frame):
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+
+    return [("pixels: flip + convert (before)", before), ("pixels: convert into buffer (after)", after)]
+
+
+def tracker_paths():
+    options = (config.MAX_NUM_HANDS, config.MIN_DETECTION_CONFIDENCE, config.MIN_TRACKING_CONFIDENCE)
+    flipping = HandTracker(*options)
+    mirroring = HandTracker(*options, mirror_landmarks=True)
+    # Fixed landmarks so both paths also pay for extraction, whatever the frames show
+    results = make_results()
+
+    def before(frame):
+        flipped = cv2.flip(frame, 1)
+        flipping.process_frame(flipped)
+        return flipping.extract_hands_data(results, flipped.shape)
+
+    def after(frame):
+        mirroring.process_frame(frame)
+        return mirroring.extract_hands_data(results, frame.shape)
+
+    paths = [("tracker: flip frame (before)", before), ("tracker: mirror landmarks (after)", after)]
+    return paths, (flipping, mirroring)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--video', help="video fixture; random frames when omitted")
+    parser.add_argument('--frames', type=int, default=200)
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, config.CAMERA_WIDTH, config.CAMERA_HEIGHT)
+    paths = pixel_paths(frames)
+    trackers = ()
+    if HandTracker is None:
+        print("MediaPipe not installed: skipping the tracker paths")
+    else:
+        tracker_benchmarks, trackers = tracker_paths()
+        paths += tracker_benchmarks
+
+    print(f"{args.frames} frames at {config.CAMERA_WIDTH}x{config.CAMERA_HEIGHT}\n")
+    for name, process_frame in paths:
+        result = measure(process_frame, frames, args.frames)
+        print(f"{name:<38} allocated/frame {result['peak_kb']:9.1f} KiB (max {result['max_peak_kb']:9.1f})   "
+              f"retained {result['retained_kb']:7.1f} KiB   {result['ms']:6.2f} ms/frame")
+
+    for tracker in trackers:
+        tracker.close()
+
+
+if __name__ == '__main__':
+    main()
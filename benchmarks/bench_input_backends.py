@@ -0,0 +1,63 @@
+"""
+Micro-benchmark: input-injection calls per second for each backend
+
+Times cursor moves (the per-frame call) and clicks through every backend
+that can be opened here, both on the raw backend and through
+MouseController, so the overhead pyautogui adds on top of the OS call is
+visible. The recording backend only appends to a list and shows the cost
+of MouseController itself.
+
+The pyautogui and xtest backends move the real cursor within a small
+square near the top-left corner, and the click test clicks there; pass
+--no-clicks to skip it.
+
+Usage: python benchmarks/bench_input_backends.py [--iterations N] [--no-clicks]
+"""
+
+import argparse
+
+from common import time_per_call
+from input_backends import BACKENDS, create_backend
+from mouse_controller import MouseController
+import config
+
+
+def report(name: str, result):
+    print(f"{name:<40} {1e6 / result['mean_us']:12,.0f} calls/s   p50 {result['p50_us']:8.2f} us   "
+          f"p95 {result['p95_us']:8.2f} us")
+
+
+def bench_backend(name: str, iterations: int, clicks: bool):
+    try:
+        backend = create_backend(name)
+    except Exception as e:
+        print(f"{name:<40} skipped ({e})")
+        return
+
+    positions = [(100 + i % 50, 100 + (i * 7) % 50) for i in range(iterations + 10)]
+    step = iter(positions)
+    report(f"{name}.move_to", time_per_call(lambda: backend.move_to(*next(step)), iterations))
+
+    controller = MouseController(config.SMOOTHING_FACTOR, config.MOUSE_SPEED_MULTIPLIER,
+                                 config.SCREEN_PADDING, backend=backend)
+    step = iter(positions)
+    report(f"{name}.controller.move_mouse", time_per_call(lambda: controller.move_mouse(*next(step)), iterations))
+
+    if clicks:
+        backend.move_to(100, 100)
+        report(f"{name}.click", time_per_call(backend.click, max(1, iterations // 10), warmup=1))
+    controller.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--no-clicks', action='store_true', help="only move the cursor")
+    args = parser.parse_args()
+
+    for name in BACKENDS:
+        bench_backend(name, args.iterations, not args.no_clicks)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Micro-benchmark: per-frame landmark extraction and gesture distance cost
+
+Compares the previous list-of-dicts representation (21 dicts per hand and a
+scalar np.sqrt per distance) with the array-backed HandData path that fills
+preallocated (21, 3) arrays and computes every distance in one pass.
+
+Gesture distances are timed on landmarks built from the same synthetic
+results, so they run anywhere. Extraction (and the whole frame) goes
+through HandTracker and is only timed when MediaPipe is installed.
+
+Usage: python benchmarks/bench_landmarks.py [--iterations N]
+"""
+
+import argparse
+
+import numpy as np
+
+from common import make_results, print_result, time_per_call
+from gesture_detector import GestureDetector, DISTANCE_PAIRS
+from landmarks import HAND_LABELS, allocate_frame_hands
+import config
+
+try:
+    from hand_tracker import HandTracker
+except ImportError:
+    # MediaPipe is missing: only the distance timings run
+    HandTracker = None
+
+
+FRAME_SHAPE = (config.CAMERA_HEIGHT, config.CAMERA_WIDTH, 3)
+
+
+def legacy_extract(results, frame_shape):
+    hands_data = {'Left': [], 'Right': []}
+    h, w, _ = frame_shape
+    for hand_landmarks, hand_info in zip(results.multi_hand_landmarks, results.multi_handedness):
+        label = hand_info.classification[0].label
+        landmarks = []
+        for lm in hand_landmarks.landmark:
+            landmarks.append({
+                'x': lm.x * w,
+                'y': lm.y * h,
+                'z': lm.z
+            })
+        hands_data[label] = landmarks
+    return hands_data
+
+
+def legacy_distance(landmarks1, landmarks2, index1, index2):
+    # Same checks and arithmetic as the old calculate_distance_between_hands
+    if not landmarks1 or not landmarks2:
+        return float('inf')
+    if len(landmarks1) <= index1 or len(landmarks2) <= index2:
+        return float('inf')
+
+    p1 = landmarks1[index1]
+    p2 = landmarks2[index2]
+
+    dx = p1['x'] - p2['x']
+    dy = p1['y'] - p2['y']
+
+    return np.sqrt(dx**2 + dy**2)
+
+
+def array_hands(results, frame_shape):
+    """HandData for the synthetic results, filled without HandTracker"""
+    h, w, _ = frame_shape
+    hands = allocate_frame_hands(1)[0]
+    for hand_landmarks, hand_info in zip(results.multi_hand_landmarks, results.multi_handedness):
+        classification = hand_info.classification[0]
+        hand = hands[classification.label]
+        hand.landmarks[:] = [(lm.x * w, lm.y * h, lm.z) for lm in hand_landmarks.landmark]
+        hand.score = classification.score
+    present = {hand_info.classification[0].label for hand_info in results.multi_handedness}
+    return {label: hands[label] if label in present else None for label in HAND_LABELS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    results = make_results()
+    detector = GestureDetector()
+    dict_hands = legacy_extract(results, FRAME_SHAPE)
+    hands = array_hands(results, FRAME_SHAPE)
+
+    def legacy_distances(hands_data):
+        for h1, i1, h2, i2 in DISTANCE_PAIRS:
+            legacy_distance(hands_data[h1], hands_data[h2], i1, i2)
+
+    def array_distances(hands_data):
+        detector.update(hands_data)
+        for h1, i1, h2, i2 in DISTANCE_PAIRS:
+            detector._distance(hands_data[h1], i1, hands_data[h2], i2)
+
+    def time_it(func):
+        return time_per_call(func, args.iterations)
+
+    timings = [
+        ("distances: dicts + np.sqrt (before)", time_it(lambda: legacy_distances(dict_hands))),
+        ("distances: arrays + vectorized (after)", time_it(lambda: array_distances(hands))),
+    ]
+    if HandTracker is not None:
+        tracker = HandTracker(config.MAX_NUM_HANDS, config.MIN_DETECTION_CONFIDENCE, config.MIN_TRACKING_CONFIDENCE)
+
+        def extract():
+            return tracker.extract_hands_data(results, FRAME_SHAPE)
+
+        def legacy():
+            return legacy_extract(results, FRAME_SHAPE)
+
+        timings += [
+            ("extract: list of dicts (before)", time_it(legacy)),
+            ("extract: HandData arrays (after)", time_it(extract)),
+            ("frame: dicts + scalar np.sqrt (before)", time_it(lambda: legacy_distances(legacy()))),
+            ("frame: arrays + vectorized (after)", time_it(lambda: array_distances(extract()))),
+        ]
+        tracker.close()
+
+    print(f"Landmark extraction + {len(DISTANCE_PAIRS)} gesture distances, 2 hands, {args.iterations} iterations\n")
+    for name, result in timings:
+        print_result(name, result)
+    if HandTracker is None:
+        print("\nMediaPipe is not installed: extraction and whole-frame timings skipped")
+    before, after = timings[-2][1], timings[-1][1]
+    print(f"\nPer-{'frame' if HandTracker is not None else 'distance pass'} speedup: "
+          f"{before['mean_us'] / after['mean_us']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark: multi-camera throughput, cameras tracked one after another vs
+in parallel
+
+Every camera reads the same video file (--video, or a synthetic clip
+written to a temporary directory) through a VideoFileSource, without
+real-time pacing, into a CameraRig mosaic. Each mode tracks --frames
+mosaics with one tracker per camera and reports mosaics per second and
+camera frames per second. "serial" runs the trackers on the calling
+thread, "parallel" uses MultiCameraTracker's thread pool and "processes"
+additionally puts every tracker in a worker process (TRACKER_PROCESS).
+Decoding is included, as it is live; the "track" column leaves it out.
+
+Without MediaPipe, every tracker is a stub that returns fixed landmarks:
+the mosaic reads, the thread pool and fusion are still measured, and the
+worker-process mode is skipped.
+
+Usage: python benchmarks/bench_multi_camera.py [--cameras N] [--video PATH] [--frames N] [--no-processes]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from common import PROJECT_ROOT  # noqa: F401  (puts src/ on sys.path)
+from capture_sources import SyntheticSource, VideoFileSource
+from landmarks import allocate_frame_hands
+from multi_camera import CameraRig, MultiCameraTracker
+import config
+
+try:
+    from hand_tracker import HandTracker
+except ImportError:
+    # MediaPipe is missing: stub trackers stand in and the process mode is skipped
+    HandTracker = None
+
+
+class StubTracker:
+    """Both hands at fixed positions on every frame, without any inference"""
+
+    def __init__(self, seed: int = 0):
+        self.hands = allocate_frame_hands(1)[0]
+        rng = np.random.default_rng(seed)
+        scale = [config.CAMERA_WIDTH, config.CAMERA_HEIGHT, 0.1]
+        self.hands['Left'].frame_points[:] = rng.uniform(0, 1, (42, 3)) * scale
+        for hand in self.hands.values():
+            hand.score = float(rng.uniform(0.8, 1.0))
+
+    def track(self, frame, timestamp):
+        return None, self.hands
+
+    def close(self):
+        pass
+
+
+def write_clip(path: str, width: int, height: int, frames: int = 90):
+    """A synthetic clip to use as every camera's file"""
+    source = SyntheticSource(width, height, realtime=False)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 30.0, (width, height))
+    for _ in range(frames):
+        writer.write(source.read()[1])
+    writer.release()
+
+
+def create_tracker(process: bool, seed: int = 0):
+    if HandTracker is None:
+        return StubTracker(seed)
+    options = (config.MAX_NUM_HANDS, config.MIN_DETECTION_CONFIDENCE, config.MIN_TRACKING_CONFIDENCE)
+    if process:
+        from tracker_process import ProcessHandTracker
+        tracker = ProcessHandTracker(*options, timeout=30.0)
+        if not tracker.wait_ready(60.0):
+            raise RuntimeError("Hand tracker worker did not start")
+        return tracker
+    return HandTracker(*options)
+
+
+def measure(video: str, cameras: int, frames: int, parallel: bool, process: bool):
+    rig = CameraRig([VideoFileSource(video, loop=True, realtime=False) for _ in range(cameras)], threaded=False)
+    trackers = [create_tracker(process, seed) for seed in range(cameras)]
+    tracker = MultiCameraTracker(trackers, [[[1, 0, 0], [0, 1, 0], [0, 0, 1]]] * cameras, parallel=parallel)
+    mosaic = None
+    try:
+        for _ in range(5):
+            _, mosaic = rig.read(mosaic)
+            tracker.track(mosaic, 0.0)
+
+        tracking = 0.0
+        start = time.perf_counter()
+        for i in range(frames):
+            success, mosaic = rig.read(mosaic)
+            if not success:
+                raise RuntimeError(f"Could not read {video}")
+            track_start = time.perf_counter()
+            tracker.track(mosaic, i / config.CAMERA_FPS)
+            tracking += time.perf_counter() - track_start
+        elapsed = time.perf_counter() - start
+    finally:
+        tracker.close()
+        rig.release()
+    return frames / elapsed, frames / tracking
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cameras', type=int, default=2)
+    parser.add_argument('--video', help="video file every camera reads; a synthetic clip when omitted")
+    parser.add_argument('--frames', type=int, default=200, help="mosaics tracked per mode")
+    parser.add_argument('--no-processes', action='store_true', help="skip the worker-process mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        video = args.video
+        if video is None:
+            video = os.path.join(directory, 'clip.avi')
+            write_clip(video, config.CAMERA_WIDTH, config.CAMERA_HEIGHT)
+
+        modes = [("serial", False, False), ("parallel", True, False)]
+        if HandTracker is None:
+            print("MediaPipe not installed: stub trackers, skipping the processes mode")
+        elif not args.no_processes:
+            modes.append(("processes", True, True))
+
+        print(f"{args.cameras} cameras, {args.frames} mosaics per mode\n")
+        for name, parallel, process in modes:
+            fps, track_fps = measure(video, args.cameras, args.frames, parallel, process)
+            print(f"{name:<10} {fps:7.1f} mosaics/s   {fps * args.cameras:7.1f} camera frames/s   "
+                  f"track {track_fps:7.1f} mosaics/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark: split mode over loopback, per payload and encoding
+
+A sender thread streams the frames of a landmark recording (--recording,
+or a synthetic one) with StreamSender at --fps, stamping each datagram
+with its send time. The main thread receives them with StreamReceiver and
+performs them like NETWORK_MODE "receive" does, into a MouseController
+on the recording input backend. For landmarks, gestures are detected on
+the receiving side; for events, they are detected up front and only the
+events are sent.
+
+Reported per mode: datagram size, bandwidth at 30 FPS including the 28
+bytes of UDP/IPv4 headers, send-to-performed latency percentiles (both
+ends share time.perf_counter on loopback), stale and lost datagrams, the
+cursor moves and actions performed, and for landmarks the largest
+coordinate error int16 quantization introduced.
+
+Usage: python benchmarks/bench_network.py [--recording PATH] [--frames N] [--fps N]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from common import PROJECT_ROOT, write_synthetic_recording  # noqa: F401  (puts src/ on sys.path)
+from actions import ActionFeedback, dispatch, handle_gestures
+from gesture_detector import GestureDetector
+from input_backends import RecordingBackend
+from mouse_controller import MouseController, NullMouseController
+from network import StreamReceiver, StreamSender
+from recorder import Recording
+import config
+
+UDP_IP_HEADERS = 28
+MODES = [("landmarks", False), ("landmarks", True), ("events", False), ("events", True)]
+
+
+def precompute_events(recording: Recording, frames: int):
+    """Gesture events of every frame, as a sender with NETWORK_PAYLOAD "events" detects them"""
+    detector = GestureDetector()
+    mouse = NullMouseController(config.SMOOTHING_FACTOR, config.MOUSE_SPEED_MULTIPLIER, config.SCREEN_PADDING)
+    feedback = ActionFeedback()
+    return [handle_gestures(recording.hands_at(i), detector, mouse, feedback, float(recording.timestamps[i]),
+                            log=lambda message: None)
+            for i in range(frames)]
+
+
+def stream(sender: StreamSender, recording: Recording, events, frames: int, fps: float, send_times: np.ndarray):
+    interval = 1.0 / fps
+    start = time.perf_counter()
+    for i in range(frames):
+        # Paced against the start, so a late frame does not delay the rest
+        delay = start + i * interval - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        send_times[i + 1] = time.perf_counter()
+        sender.send(send_times[i + 1], recording.hands_at(i), events[i] if events is not None else None)
+
+
+def measure(recording: Recording, events, frames: int, fps: float, payload: str, quantize: bool):
+    receiver = StreamReceiver('127.0.0.1', 0, max_age=config.NETWORK_MAX_AGE)
+    sender = StreamSender('127.0.0.1', receiver.address[1], (recording.frame_width, recording.frame_height),
+                          payload, quantize)
+    backend = RecordingBackend()
+    mouse = MouseController(config.SMOOTHING_FACTOR, config.MOUSE_SPEED_MULTIPLIER, config.SCREEN_PADDING,
+                            backend=backend)
+    detector = GestureDetector()
+    feedback = ActionFeedback()
+
+    # Sequence numbers start at 1
+    send_times = np.zeros(frames + 1)
+    latencies = []
+    max_error = 0.0
+    thread = threading.Thread(target=stream, args=(sender, recording, events, frames, fps, send_times))
+    thread.start()
+    try:
+        while True:
+            packet = receiver.receive(timeout=0.5)
+            if packet is None:
+                break
+            if packet.events is not None:
+                dispatch(packet.events, mouse, feedback, packet.timestamp, log=lambda message: None)
+            else:
+                handle_gestures(packet.hands_data, detector, mouse, feedback, packet.timestamp,
+                                log=lambda message: None)
+                original = recording.hands_at(packet.sequence - 1)
+                for label, hand in packet.hands_data.items():
+                    if hand is not None:
+                        max_error = max(max_error, float(np.abs(hand.landmarks - original[label].landmarks).max()))
+            latencies.append(time.perf_counter() - send_times[packet.sequence])
+    finally:
+        thread.join()
+        sender.close()
+        receiver.close()
+
+    bytes_per_datagram = sender.bytes_sent / frames
+    moves = backend.counts['move_to']
+    actions = sum(backend.counts.values()) - moves
+    return {
+        'bytes': bytes_per_datagram,
+        'kbps': (bytes_per_datagram + UDP_IP_HEADERS) * 30 * 8 / 1000,
+        'p50_us': np.percentile(latencies, 50) * 1e6 if latencies else float('nan'),
+        'p99_us': np.percentile(latencies, 99) * 1e6 if latencies else float('nan'),
+        'stale': receiver.stale,
+        'lost': frames - receiver.received,
+        'moves': moves,
+        'actions': actions,
+        'error': max_error,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--recording', help="landmark recording to stream; a synthetic one when omitted")
+    parser.add_argument('--frames', type=int, default=600, help="frames streamed per mode")
+    parser.add_argument('--fps', type=float, default=120.0, help="send rate")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.recording
+        if path is None:
+            path = os.path.join(directory, 'session.bin')
+            write_synthetic_recording(path, frames=args.frames)
+        recording = Recording(path)
+        frames = min(args.frames, len(recording))
+        events = precompute_events(recording, frames)
+
+        print(f"{frames} frames per mode at {args.fps:g} datagrams/s over loopback\n")
+        print(f"{'mode':<18} {'bytes':>7} {'kbit/s@30':>10} {'p50 us':>8} {'p99 us':>8} {'stale':>6} {'lost':>5} "
+              f"{'moves':>6} {'actions':>8} {'max err px':>11}")
+        for payload, quantize in MODES:
+            result = measure(recording, events if payload == "events" else None, frames, args.fps, payload, quantize)
+            name = f"{payload} {'int16' if quantize else 'float32'}"
+            error = f"{result['error']:11.3f}" if payload == "landmarks" else f"{'-':>11}"
+            print(f"{name:<18} {result['bytes']:7.1f} {result['kbps']:10.1f} {result['p50_us']:8.0f} "
+                  f"{result['p99_us']:8.0f} {result['stale']:6d} {result['lost']:5d} {result['moves']:6d} "
+                  f"{result['actions']:8d} {error}")
+
+
+if __name__ == '__main__':
+    main()
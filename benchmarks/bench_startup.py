@@ -0,0 +1,109 @@
+"""
+Benchmark: cold start, from launching the application to the first frame
+that has gone through tracking and gesture dispatch (the first frame that
+can actuate the mouse)
+
+Each run starts the real main() in a fresh interpreter, headless and with
+the configured camera (or --source), waits for its "First frame processed"
+line and then stops it with a termination signal. Sequential startup (model loaded
+before the camera opens) is compared with CONCURRENT_STARTUP.
+
+The first run of each variant also pays for a cold disk cache, so use
+--runs of 3 or more and look at the median.
+
+Usage: python benchmarks/bench_startup.py [--runs N] [--warmup-frames N] [--backend NAME]
+                                          [--source NAME [--source-path PATH]]
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from common import PROJECT_ROOT  # noqa: F401  (puts src/ on sys.path)
+from capture_sources import SOURCES
+
+
+READY_LINE = "First frame processed"
+
+
+def child(args):
+    """Run the application with the requested startup settings"""
+    import config
+    config.DISPLAY_MODE = "headless"
+    config.INPUT_BACKEND = args.backend
+    config.CONCURRENT_STARTUP = args.concurrent
+    config.MODEL_WARMUP_FRAMES = args.warmup_frames
+    if args.source:
+        config.CAMERA_SOURCE = args.source
+        config.CAMERA_SOURCE_PATH = args.source_path
+
+    import main
+    main.main()
+
+
+def launch(concurrent: bool, args, timeout: float = 60.0) -> float:
+    """Seconds from process launch to the first processed frame"""
+    command = [sys.executable, '-u', os.path.abspath(__file__), '--child',
+               '--backend', args.backend, '--warmup-frames', str(args.warmup_frames)]
+    if concurrent:
+        command.append('--concurrent')
+    if args.source:
+        command += ['--source', args.source]
+        if args.source_path:
+            command += ['--source-path', args.source_path]
+
+    # A console control event is the only way to deliver a catchable stop signal on Windows
+    creationflags = getattr(subprocess, 'CREATE_NEW_PROCESS_GROUP', 0)
+    start = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                               text=True, creationflags=creationflags)
+    elapsed = None
+    output = []
+    try:
+        for line in process.stdout:
+            output.append(line)
+            if line.startswith(READY_LINE):
+                elapsed = time.perf_counter() - start
+                break
+            if time.perf_counter() - start > timeout:
+                break
+    finally:
+        process.send_signal(getattr(signal, 'CTRL_BREAK_EVENT', signal.SIGTERM))
+        try:
+            process.communicate(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+
+    if elapsed is None:
+        raise RuntimeError("The application never processed a frame:\n" + "".join(output[-20:]))
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--warmup-frames', type=int, default=2, help="MODEL_WARMUP_FRAMES for every run")
+    parser.add_argument('--backend', default="recording", help="INPUT_BACKEND; 'recording' injects no input")
+    parser.add_argument('--source', choices=SOURCES, help="CAMERA_SOURCE; defaults to the configured one")
+    parser.add_argument('--source-path', help="CAMERA_SOURCE_PATH for the video and images sources")
+    parser.add_argument('--concurrent', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args)
+        return
+
+    print(f"{args.runs} runs per variant, {args.warmup_frames} warm-up frames, {args.backend} backend\n")
+    for name, concurrent in (("sequential", False), ("concurrent", True)):
+        times = sorted(launch(concurrent, args) for _ in range(args.runs))
+        print(f"{name:<12} time to first frame: median {times[len(times) // 2]:6.2f} s   "
+              f"min {times[0]:6.2f} s   max {times[-1]:6.2f} s")
+
+
+if __name__ == '__main__':
+    main()
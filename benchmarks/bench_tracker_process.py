@@ -0,0 +1,103 @@
+"""
+Benchmark: in-process HandTracker vs ProcessHandTracker
+
+For each mode, feeds the same frames through track() and reports the
+end-to-end latency per frame (from handing over the frame to having
+HandData back) and the CPU time per frame summed over all processes
+involved (including the --contention thread when enabled).
+
+--contention starts a Python thread that stands in for gesture logic,
+actuation and GUI work. In process mode it only competes with the
+parent's IPC, not with MediaPipe for the GIL.
+
+Usage: python benchmarks/bench_tracker_process.py [--video PATH] [--frames N] [--contention]
+"""
+
+import argparse
+import threading
+import time
+
+import numpy as np
+
+from common import PROJECT_ROOT  # noqa: F401  (puts src/ on sys.path)
+from run_benchmarks import load_frames
+from hand_tracker import HandTracker
+from tracker_process import ProcessHandTracker
+import config
+
+
+def busy_thread(stop: threading.Event):
+    # Pure-Python work that holds the GIL most of the time
+    while not stop.is_set():
+        total = 0
+        for i in range(20000):
+            total += i * i
+
+
+def measure(tracker, frames, count: int, contention: bool, cpu_time):
+    """track() every frame; frames are first copied into ``buffers`` like a camera would"""
+    stop = threading.Event()
+    worker = None
+    if contention:
+        worker = threading.Thread(target=busy_thread, args=(stop,), daemon=True)
+        worker.start()
+
+    buffers = tracker.allocate_frames(frames[0].shape, frames[0].dtype, 3) \
+        if isinstance(tracker, ProcessHandTracker) else [np.empty_like(frames[0]) for _ in range(3)]
+
+    latencies = []
+    cpu_start = cpu_time()
+    for i in range(count):
+        buffer = buffers[i % len(buffers)]
+        np.copyto(buffer, frames[i % len(frames)])
+        start = time.perf_counter()
+        tracker.track(buffer, i / config.CAMERA_FPS)
+        latencies.append(time.perf_counter() - start)
+    cpu = cpu_time() - cpu_start
+
+    stop.set()
+    if worker is not None:
+        worker.join()
+    latencies.sort()
+    return {
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95)] * 1000,
+        'cpu_ms': cpu / count * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--video', help="video fixture; random frames when omitted")
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--contention', action='store_true', help="run a GIL-heavy thread alongside")
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, config.CAMERA_WIDTH, config.CAMERA_HEIGHT)
+    options = (config.MAX_NUM_HANDS, config.MIN_DETECTION_CONFIDENCE, config.MIN_TRACKING_CONFIDENCE)
+
+    in_process = HandTracker(*options)
+    for frame in frames[:5]:
+        in_process.track(frame, 0.0)
+    in_process_result = measure(in_process, frames, args.frames, args.contention, time.process_time)
+    in_process.close()
+
+    out_of_process = ProcessHandTracker(*options, timeout=30.0)
+    if not out_of_process.wait_ready(60.0):
+        raise RuntimeError("Hand tracker worker did not start")
+    for frame in frames[:5]:
+        out_of_process.track(frame, 0.0)
+    process_result = measure(
+        out_of_process, frames, args.frames, args.contention,
+        lambda: time.process_time() + out_of_process.worker_cpu_time()
+    )
+    out_of_process.close()
+
+    print(f"{args.frames} frames, {'with' if args.contention else 'without'} GIL contention\n")
+    for name, result in (("in-process", in_process_result), ("worker process", process_result)):
+        print(f"{name:<16} latency p50 {result['p50_ms']:7.2f} ms   p95 {result['p95_ms']:7.2f} ms   "
+              f"CPU {result['cpu_ms']:7.2f} ms/frame")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Shared helpers for the benchmark scripts"""
+
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict
+
+# Make the modules in src/ importable the same way main.py imports them
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+
+def time_per_call(func: Callable[[], object], iterations: int, warmup: int = 10) -> Dict[str, float]:
+    """Run func repeatedly and return per-call timings in microseconds"""
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+
+    samples.sort()
+    return {
+        'mean_us': sum(samples) / len(samples) * 1e6,
+        'p50_us': samples[len(samples) // 2] * 1e6,
+        'p95_us': samples[int(len(samples) * 0.95)] * 1e6,
+        'min_us': samples[0] * 1e6,
+    }
+
+
+def print_result(name: str, result: Dict[str, float]):
+    print(f"{name:<40} mean {result['mean_us']:9.2f} us   p50 {result['p50_us']:9.2f} us   "
+          f"p95 {result['p95_us']:9.2f} us")
+
+
+def make_results(num_hands: int = 2, seed: int = 0) -> SimpleNamespace:
+    """MediaPipe-shaped results object with random landmarks"""
+    rng = random.Random(seed)
+    hands, handedness = [], []
+    for label in ('Left', 'Right')[:num_hands]:
+        points = [SimpleNamespace(x=rng.random(), y=rng.random(), z=rng.uniform(-0.1, 0.1)) for _ in range(21)]
+        hands.append(SimpleNamespace(landmark=points))
+        handedness.append(SimpleNamespace(classification=[SimpleNamespace(label=label, score=0.98)]))
+    return SimpleNamespace(multi_hand_landmarks=hands, multi_handedness=handedness)
+
+
+def write_synthetic_recording(path: str, frames: int = 3000, fps: float = 30.0, seed: int = 0, start: float = 0.0):
+    """
+    Write a landmark recording with both hands drifting around the frame,
+    a thumb pinching a different landmark every 1.5 s, the left hand
+    missing now and then and occasional predicted frames, so every gesture
+    path gets exercised
+    """
+    import numpy as np
+    from landmarks import allocate_frame_hands
+    from recorder import SessionRecorder
+    import config
+
+    rng = np.random.default_rng(seed)
+    hands = allocate_frame_hands(1)[0]
+    base = rng.uniform(0, 1, (2, 21, 3)).astype(np.float32) * [200, 200, 0.1]
+    recorder = SessionRecorder(path, config.CAMERA_WIDTH, config.CAMERA_HEIGHT)
+    # (moving hand, landmark, other hand, landmark) brought together, one pattern per 1.5 s
+    pinches = [(0, 4, 0, 8), (0, 4, 0, 12), (0, 4, 0, 16), (0, 4, 0, 20), (1, 4, 1, 16), (1, 4, 1, 20),
+               (1, 4, 1, 11), (1, 4, 1, 10), (1, 8, 0, 8), (1, 4, 0, 8)]
+    for i in range(frames):
+        t = start + i / fps
+        offset = [config.CAMERA_WIDTH * (0.5 + 0.3 * np.sin(t * 0.7)), config.CAMERA_HEIGHT * (0.5 + 0.3 * np.cos(t)), 0]
+        points = hands['Left'].frame_points.reshape(2, 21, 3)
+        points[:] = base + offset + rng.normal(0, 2, (2, 21, 3))
+        points[1, :, 0] += 250
+
+        # Pinches last from 6 to 14 frames, so taps and holds both happen
+        moving, landmark, other, target = pinches[(i // 45) % len(pinches)]
+        if i % 45 < 6 + (i // 45) % 9:
+            points[moving, landmark, :2] = points[other, target, :2]
+        for hand in hands.values():
+            hand.score = 0.9
+            hand.predicted = i % 97 == 0
+
+        present = {'Left': hands['Left'] if i % 200 < 180 else None, 'Right': hands['Right']}
+        recorder.write(t, present)
+    recorder.close()
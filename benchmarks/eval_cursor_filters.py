@@ -0,0 +1,161 @@
+"""
+Offline jitter-vs-lag evaluation of the cursor filters
+
+Feeds one cursor trace through every filter over a sweep of its main
+parameter and reports, per setting:
+
+  jitter  RMS of the second difference of the output (px/frame^2). On the
+          synthetic trace only frames where the hand holds still count,
+          so this is pure noise; on a recording it includes real motion
+  lag     time shift (ms) that best aligns the output with the hand;
+          negative values mean the filter runs ahead of it
+  error   RMS distance to the true hand position (synthetic trace only)
+
+The trace is either the right index fingertip from a recording made with
+RECORD_SESSION_PATH, or a synthetic path of sweeps and holds with
+Gaussian landmark noise. The synthetic measurements arrive --latency
+seconds late, like landmarks coming out of the capture and inference
+stages, so lag and error include the pipeline delay that prediction is
+meant to hide.
+
+Usage: python benchmarks/eval_cursor_filters.py [--recording PATH] [--noise PX] [--latency S]
+"""
+
+import argparse
+
+import numpy as np
+
+import common  # noqa: F401  (puts src/ on sys.path)
+from cursor_filter import EmaFilter, KalmanFilter, OneEuroFilter
+import config
+
+
+SCREEN_SIZE = (1920, 1080)
+MAX_SHIFT = 0.3
+
+
+def synthetic_trace(seconds: float, fps: float, noise: float, latency: float, seed: int = 0):
+    """Alternating fast sweeps and holds across the screen, plus sensor noise and delay"""
+    rng = np.random.default_rng(seed)
+    timestamps = np.arange(int(seconds * fps)) / fps
+    truth = np.empty((len(timestamps), 2))
+
+    target = np.array(SCREEN_SIZE, dtype=float) / 2
+    start = target.copy()
+    segment_start = 0.0
+    duration = 0.5
+    for i, t in enumerate(timestamps):
+        if t - segment_start >= duration:
+            segment_start = t
+            start = target
+            target = rng.uniform(0.1, 0.9, 2) * SCREEN_SIZE if rng.random() < 0.6 else target
+            duration = rng.uniform(0.3, 1.0)
+        # Smoothstep between targets, like a hand accelerating then settling
+        s = min(1.0, (t - segment_start) / duration)
+        s = s * s * (3 - 2 * s)
+        truth[i] = start + (target - start) * s
+
+    delayed = np.column_stack([np.interp(timestamps - latency, timestamps, truth[:, axis]) for axis in range(2)])
+    measured = delayed + rng.normal(0, noise, truth.shape)
+    return timestamps, measured, truth
+
+
+def recording_trace(path: str):
+    from mouse_controller import NullMouseController
+    from recorder import Recording
+
+    recording = Recording(path)
+    controller = NullMouseController(config.SMOOTHING_FACTOR, config.MOUSE_SPEED_MULTIPLIER,
+                                     config.SCREEN_PADDING, SCREEN_SIZE)
+    timestamps, points = [], []
+    for i in range(len(recording)):
+        right = recording.hands_at(i)['Right']
+        if right is None:
+            continue
+        tip = right.landmarks[8]
+        timestamps.append(recording.timestamps[i])
+        points.append(controller.map_to_screen(float(tip[0]), float(tip[1]),
+                                               recording.frame_width, recording.frame_height))
+    return np.array(timestamps), np.array(points), None
+
+
+def run_filter(cursor_filter, timestamps: np.ndarray, measured: np.ndarray) -> np.ndarray:
+    cursor_filter.reset()
+    return np.array([cursor_filter.filter(float(x), float(y), float(t))
+                     for t, (x, y) in zip(timestamps, measured)])
+
+
+def still_frames(truth: np.ndarray, fps: float) -> np.ndarray:
+    """Frames where the true position has not changed for half a second"""
+    moving = np.r_[True, np.any(np.diff(truth, axis=0) != 0, axis=1)]
+    window = int(fps / 2)
+    recent_motion = np.convolve(moving, np.ones(window), mode='full')[:len(truth)]
+    return recent_motion == 0
+
+
+def jitter(output: np.ndarray, mask: np.ndarray = None) -> float:
+    second_difference = np.sum(np.diff(output, n=2, axis=0) ** 2, axis=1)
+    if mask is not None:
+        second_difference = second_difference[mask[2:]]
+    return float(np.sqrt(np.mean(second_difference)))
+
+
+def lag(timestamps: np.ndarray, reference: np.ndarray, output: np.ndarray) -> float:
+    """Shift (s) that minimizes the RMS distance between output(t) and reference(t - shift)"""
+    inside = (timestamps >= timestamps[0] + MAX_SHIFT) & (timestamps <= timestamps[-1] - MAX_SHIFT)
+    times = timestamps[inside]
+    best_shift, best_error = 0.0, np.inf
+    for shift in np.arange(-0.1, MAX_SHIFT, 0.002):
+        shifted = np.column_stack([np.interp(times - shift, timestamps, reference[:, axis]) for axis in range(2)])
+        error = np.mean(np.sum((output[inside] - shifted) ** 2, axis=1))
+        if error < best_error:
+            best_shift, best_error = shift, error
+    return float(best_shift)
+
+
+def candidates():
+    base_alpha = config.SMOOTHING_FACTOR * config.MOUSE_SPEED_MULTIPLIER
+    for alpha in sorted({0.2, 0.35, 0.5, base_alpha, 1.0}):
+        yield "ema", f"alpha={alpha:.2f}", EmaFilter(alpha)
+    for min_cutoff in (0.3, 0.6, config.ONE_EURO_MIN_CUTOFF, 2.0):
+        for beta in (0.003, config.ONE_EURO_BETA, 0.02):
+            yield ("one_euro", f"min_cutoff={min_cutoff:g} beta={beta:g}",
+                   OneEuroFilter(min_cutoff, beta, config.ONE_EURO_D_CUTOFF))
+    for noise in sorted({4.0, config.KALMAN_MEASUREMENT_NOISE, 100.0}):
+        for prediction in sorted({0.0, config.KALMAN_PREDICTION_TIME, 0.06}):
+            yield ("kalman", f"r={noise:g} predict={prediction * 1000:.0f}ms",
+                   KalmanFilter(config.KALMAN_PROCESS_NOISE, noise, prediction))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--recording', help="session recording to take the cursor trace from")
+    parser.add_argument('--seconds', type=float, default=60.0, help="length of the synthetic trace")
+    parser.add_argument('--fps', type=float, default=config.CAMERA_FPS)
+    parser.add_argument('--noise', type=float, default=3.0, help="synthetic landmark noise (px, std)")
+    parser.add_argument('--latency', type=float, default=0.05, help="synthetic capture-to-landmark delay (s)")
+    args = parser.parse_args()
+
+    if args.recording:
+        timestamps, measured, truth = recording_trace(args.recording)
+        print(f"Trace: {args.recording}, {len(timestamps)} frames with a right hand")
+    else:
+        timestamps, measured, truth = synthetic_trace(args.seconds, args.fps, args.noise, args.latency)
+        print(f"Trace: synthetic, {len(timestamps)} frames at {args.fps:g} fps, "
+              f"noise {args.noise:g} px, latency {args.latency * 1000:.0f} ms")
+
+    reference = measured if truth is None else truth
+    mask = None if truth is None else still_frames(truth, args.fps)
+    print()
+    print(f"{'filter':<10} {'parameters':<34} {'jitter':>13} {'lag ms':>8}" + ("" if truth is None else f" {'error px':>9}"))
+    rows = [("input", "", measured)]
+    rows += [(name, label, run_filter(cursor_filter, timestamps, measured)) for name, label, cursor_filter in candidates()]
+    for name, label, output in rows:
+        line = f"{name:<10} {label:<34} {jitter(output, mask):13.2f} {lag(timestamps, reference, output) * 1000:8.0f}"
+        if truth is not None:
+            line += f" {np.sqrt(np.mean(np.sum((output - truth) ** 2, axis=1))):9.2f}"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+"""
+Benchmark suite covering every stage of the per-frame pipeline
+
+Runs headless on synthetic frames and landmarks, or on fixtures: a video
+file (--video) for the image stages and a landmark recording (--recording)
+for the gesture stages. Each stage is timed on its own.
+
+Usage:
+    python benchmarks/run_benchmarks.py                     # print results
+    python benchmarks/run_benchmarks.py --save-baseline     # store as baseline
+    python benchmarks/run_benchmarks.py --check             # fail on regressions
+
+Timings only compare on the machine they were recorded on, so no baseline
+ships with the repository: record one with --save-baseline first. The
+file notes the machine it was recorded on, and --check warns when it runs
+elsewhere.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+from typing import Callable, Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+from common import PROJECT_ROOT, make_results, print_result, time_per_call, write_synthetic_recording
+from actions import ActionFeedback, handle_gestures
+from gesture_detector import GestureDetector
+from mouse_controller import NullMouseController
+from recorder import Recording
+import config
+
+try:
+    from hand_tracker import HandTracker
+except ImportError:
+    # MediaPipe is missing: inference and overlay stages are skipped
+    HandTracker = None
+
+
+DEFAULT_BASELINE = os.path.join(PROJECT_ROOT, 'benchmarks', 'baselines.json')
+# Baseline entry describing where it was recorded, next to the stage results
+MACHINE_KEY = '_machine'
+RESOLUTIONS = ((640, 360), (960, 540), (1280, 720))
+HAND_COUNTS = (1, 2)
+
+
+def load_frames(video_path: str, width: int, height: int, count: int = 30) -> List[np.ndarray]:
+    """Frames from the video fixture resized to width x height, or random noise frames"""
+    frames = []
+    if video_path:
+        cap = cv2.VideoCapture(video_path)
+        while len(frames) < count:
+            success, frame = cap.read()
+            if not success:
+                break
+            frames.append(cv2.resize(frame, (width, height)))
+        cap.release()
+        if not frames:
+            raise RuntimeError(f"Could not read frames from {video_path}")
+    else:
+        rng = np.random.default_rng(0)
+        frames = [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(count)]
+    return frames
+
+
+def cycle(items: List) -> Callable[[], object]:
+    """Return a function that yields the items round-robin"""
+    state = [0]
+
+    def next_item():
+        item = items[state[0] % len(items)]
+        state[0] += 1
+        return item
+    return next_item
+
+
+def image_benchmarks(args) -> List[Tuple[str, Callable[[], object]]]:
+    frames = load_frames(args.video, config.CAMERA_WIDTH, config.CAMERA_HEIGHT)
+    next_frame = cycle(frames)
+    rgb = np.empty_like(frames[0])
+    return [
+        ("camera.flip", lambda: cv2.flip(next_frame(), 1)),
+        ("tracker.color_convert", lambda: cv2.cvtColor(next_frame(), cv2.COLOR_BGR2RGB)),
+        ("tracker.color_convert_reuse", lambda: cv2.cvtColor(next_frame(), cv2.COLOR_BGR2RGB, dst=rgb)),
+    ]
+
+
+def inference_benchmarks(args) -> List[Tuple[str, Callable[[], object]]]:
+    if HandTracker is None:
+        print("MediaPipe not installed: skipping inference benchmarks")
+        return []
+
+    benchmarks = []
+    for width, height in RESOLUTIONS:
+        next_frame = cycle(load_frames(args.video, width, height))
+        for hands in HAND_COUNTS:
+            tracker = HandTracker(hands, config.MIN_DETECTION_CONFIDENCE, config.MIN_TRACKING_CONFIDENCE)
+            benchmarks.append((
+                f"tracker.inference[{width}x{height},{hands}h]",
+                lambda tracker=tracker, next_frame=next_frame: tracker.process_frame(next_frame())
+            ))
+    return benchmarks
+
+
+def landmark_benchmarks(args) -> List[Tuple[str, Callable[[], object]]]:
+    benchmarks = []
+    if HandTracker is not None:
+        tracker = HandTracker(config.MAX_NUM_HANDS, config.MIN_DETECTION_CONFIDENCE, config.MIN_TRACKING_CONFIDENCE)
+        results = make_results()
+        shape = (config.CAMERA_HEIGHT, config.CAMERA_WIDTH, 3)
+        benchmarks.append(("tracker.extract_hands_data", lambda: tracker.extract_hands_data(results, shape)))
+
+    recording = Recording(args.recording)
+    frames = [(recording.hands_at(i), float(recording.timestamps[i])) for i in range(len(recording))]
+    next_frame = cycle(frames)
+    detector = GestureDetector()
+    controller = NullMouseController(config.SMOOTHING_FACTOR, config.MOUSE_SPEED_MULTIPLIER, config.SCREEN_PADDING)
+    feedback = ActionFeedback()
+
+    def discard(message: str):
+        pass
+
+    def gesture_frame():
+        hands_data, timestamp = next_frame()
+        handle_gestures(hands_data, detector, controller, feedback, timestamp, discard)
+
+    rng = np.random.default_rng(0)
+    points = cycle(list(rng.uniform(0, [config.CAMERA_WIDTH, config.CAMERA_HEIGHT], (256, 2))))
+
+    def cursor():
+        x, y = points()
+        screen_x, screen_y = controller.map_to_screen(x, y, config.CAMERA_WIDTH, config.CAMERA_HEIGHT)
+        return controller.smooth_movement(screen_x, screen_y)
+
+    benchmarks += [
+        ("gestures.frame", gesture_frame),
+        ("mouse.map_and_smooth", cursor),
+    ]
+    return benchmarks
+
+
+def overlay_benchmarks(args) -> List[Tuple[str, Callable[[], object]]]:
+    if HandTracker is None:
+        print("MediaPipe not installed: skipping overlay benchmark")
+        return []
+
+    from mediapipe.framework.formats import landmark_pb2
+    from main import draw_overlay
+
+    tracker = HandTracker(config.MAX_NUM_HANDS, config.MIN_DETECTION_CONFIDENCE, config.MIN_TRACKING_CONFIDENCE)
+    detector = GestureDetector()
+    detector.set_drag_active(True)
+    feedback = ActionFeedback()
+
+    synthetic = make_results()
+    hand_landmarks = []
+    for hand in synthetic.multi_hand_landmarks:
+        proto = landmark_pb2.NormalizedLandmarkList()
+        for lm in hand.landmark:
+            proto.landmark.add(x=lm.x, y=lm.y, z=lm.z)
+        hand_landmarks.append(proto)
+    results = type(synthetic)(multi_hand_landmarks=hand_landmarks, multi_handedness=synthetic.multi_handedness)
+
+    source = load_frames(args.video, config.CAMERA_WIDTH, config.CAMERA_HEIGHT, count=1)[0]
+    frame = source.copy()
+
+    def overlay():
+        np.copyto(frame, source)
+        feedback.show("SINGLE CLICK")
+        draw_overlay(frame, results, tracker, detector, feedback, 30.0)
+
+    return [("preview.overlay", overlay)]
+
+
+def run(args) -> Dict[str, Dict[str, float]]:
+    benchmarks = []
+    for group in (image_benchmarks, inference_benchmarks, landmark_benchmarks, overlay_benchmarks):
+        benchmarks += group(args)
+
+    results = {}
+    for name, func in benchmarks:
+        if args.filter and args.filter not in name:
+            continue
+        iterations = args.iterations if not name.startswith("tracker.inference") else args.inference_iterations
+        results[name] = time_per_call(func, iterations)
+        print_result(name, results[name])
+    return results
+
+
+def machine_description() -> Dict[str, object]:
+    return {
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+        'python': platform.python_version(),
+        'mediapipe': HandTracker is not None,
+    }
+
+
+def check_regressions(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                      threshold: float) -> List[str]:
+    failures = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        # Medians are far less sensitive to scheduler noise than means
+        before = baseline[name]['p50_us']
+        after = result['p50_us']
+        if after > before * (1 + threshold):
+            failures.append(f"{name}: {before:.1f} us -> {after:.1f} us (+{(after / before - 1) * 100:.0f}%)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--video', help="Video fixture for the image and inference stages")
+    parser.add_argument('--recording', help="Landmark recording fixture for the gesture stages")
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--inference-iterations', type=int, default=50)
+    parser.add_argument('--filter', help="Only run benchmarks whose name contains this text")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline file")
+    parser.add_argument('--save-baseline', action='store_true', help="Write the results as the new baseline")
+    parser.add_argument('--check', action='store_true', help="Exit with an error if a stage regressed")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Allowed slowdown relative to the baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+    if args.check and not args.save_baseline and not os.path.exists(args.baseline):
+        parser.error(f"--check needs a baseline, and {args.baseline} does not exist: "
+                     f"record one on this machine with --save-baseline first")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.recording:
+            args.recording = os.path.join(tmp, 'synthetic.bin')
+            write_synthetic_recording(args.recording)
+        results = run(args)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        baseline[MACHINE_KEY] = machine_description()
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"\nBaseline saved to {args.baseline}")
+
+    if args.check:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        recorded_on = baseline.get(MACHINE_KEY)
+        if recorded_on is not None and recorded_on != machine_description():
+            print(f"\nWarning: the baseline was recorded on another machine ({recorded_on['platform']}, "
+                  f"{recorded_on['cpus']} CPUs); timings may not compare")
+        failures = check_regressions(results, baseline, args.threshold)
+        if failures:
+            print(f"\nRegressions beyond {args.threshold * 100:.0f}%:")
+            for failure in failures:
+                print(f"  {failure}")
+            sys.exit(1)
+        print(f"\nNo stage regressed beyond {args.threshold * 100:.0f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,21 @@
 """
 PyInstaller build script for AirMouse application
 Run this script to build the executable
+
+--onedir builds a folder instead of a single file. It starts faster:
+a --onefile executable unpacks the whole bundle to a temporary
+directory on every launch.
 """
 
 import PyInstaller.__main__
+import argparse
 import os
 import sys
 
+parser = argparse.ArgumentParser(description="Build the AirMouse executable")
+parser.add_argument('--onedir', action='store_true', help="build a folder with the executable and its files")
+options = parser.parse_args()
+
 # Get the project root directory
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 src_dir = os.path.join(project_root, 'src')
@@ -29,7 +38,7 @@ args = [
     
     # Output configuration
     '--name=AirMouse',                  # Executable name
-    '--onefile',                        # Single executable file
+    '--onedir' if options.onedir else '--onefile',  # Folder (faster startup) or single executable file
     '--windowed',                       # No console window (GUI mode)
     '--clean',                          # Clean build cache
     
@@ -38,9 +47,28 @@ args = [
     
     # Add all Python files from src individually
     f'--add-data={os.path.join(src_dir, "camera.py")};src',
+    f'--add-data={os.path.join(src_dir, "capture_sources.py")};src',
     f'--add-data={os.path.join(src_dir, "hand_tracker.py")};src',
+    f'--add-data={os.path.join(src_dir, "tracker_process.py")};src',
+    f'--add-data={os.path.join(src_dir, "idle_mode.py")};src',
+    f'--add-data={os.path.join(src_dir, "multi_camera.py")};src',
+    f'--add-data={os.path.join(src_dir, "network.py")};src',
     f'--add-data={os.path.join(src_dir, "gesture_detector.py")};src',
+    f'--add-data={os.path.join(src_dir, "gesture_rules.py")};src',
     f'--add-data={os.path.join(src_dir, "mouse_controller.py")};src',
+    f'--add-data={os.path.join(src_dir, "cursor_filter.py")};src',
+    f'--add-data={os.path.join(src_dir, "actuator.py")};src',
+    f'--add-data={os.path.join(src_dir, "input_backends.py")};src',
+    f'--add-data={os.path.join(src_dir, "landmarks.py")};src',
+    f'--add-data={os.path.join(src_dir, "landmark_predictor.py")};src',
+    f'--add-data={os.path.join(src_dir, "actions.py")};src',
+    f'--add-data={os.path.join(src_dir, "pipeline.py")};src',
+    f'--add-data={os.path.join(src_dir, "preview.py")};src',
+    f'--add-data={os.path.join(src_dir, "recorder.py")};src',
+    f'--add-data={os.path.join(src_dir, "metrics.py")};src',
+    f'--add-data={os.path.join(src_dir, "tracing.py")};src',
+    f'--add-data={os.path.join(src_dir, "calibration.py")};src',
+    f'--add-data={os.path.join(src_dir, "config_profile.py")};src',
     f'--add-data={os.path.join(src_dir, "config.py")};src',
     f'--add-data={os.path.join(src_dir, "__init__.py")};src',
     
@@ -87,7 +115,8 @@ PyInstaller.__main__.run(args)
 print("\n" + "=" * 60)
 print("Build complete!")
 print("=" * 60)
-print(f"\nExecutable location: {os.path.join(project_root, 'dist', 'AirMouse.exe')}")
+executable = os.path.join('dist', 'AirMouse', 'AirMouse.exe') if options.onedir else os.path.join('dist', 'AirMouse.exe')
+print(f"\nExecutable location: {os.path.join(project_root, executable)}")
 print("\nNext steps:")
-print("1. Test the executable: dist/AirMouse.exe")
+print(f"1. Test the executable: {executable}")
 print("2. Create installer using Inno Setup (see instructions)")
\ No newline at end of file
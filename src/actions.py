@@ -0,0 +1,106 @@
+"""Translation of detected gestures into mouse and keyboard actions"""
+
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import config
+from gesture_detector import GestureEvents
+from landmarks import HandData
+
+
+class ActionFeedback:
+    def __init__(self):
+        self.text = ""
+        self.counter = 0
+
+    def show(self, text: str, frames: int = 20):
+        self.text = text
+        self.counter = frames
+
+    def tick(self):
+        """Count down one frame; used when no overlay is drawn on the frame loop"""
+        if self.counter > 0:
+            self.counter -= 1
+
+    def snapshot(self) -> 'ActionFeedback':
+        """Copy holding the current text, for drawing on another thread"""
+        copy = ActionFeedback()
+        if self.counter > 0:
+            copy.show(self.text, 1)
+        return copy
+
+    def color(self) -> Tuple[int, int, int]:
+        if "SCROLL" in self.text:
+            return (0, 255, 255) if "UP" in self.text else (255, 100, 0)
+        elif "DRAG" in self.text:
+            return (255, 0, 255)
+        elif "DESKTOP" in self.text:
+            return (255, 165, 0)
+        elif "COPY" in self.text or "PASTE" in self.text:
+            return (0, 200, 255)
+        return (0, 255, 0)
+
+
+# Discrete gesture -> (MouseController method, feedback text, log message)
+ACTIONS = {
+    'single_click': ('click', "SINGLE CLICK", "Single click!"),
+    'double_click': ('double_click', "DOUBLE CLICK", "Double click!"),
+    'copy': ('copy', "COPY (Ctrl+C)", "Copy!"),
+    'paste': ('paste', "PASTE (Ctrl+V)", "Paste!"),
+    'desktop_left': ('switch_desktop_left', "DESKTOP LEFT", "Switch desktop left!"),
+    'desktop_right': ('switch_desktop_right', "DESKTOP RIGHT", "Switch desktop right!"),
+}
+
+
+def handle_gestures(hands_data: Dict[str, Optional[HandData]], gesture_detector, mouse_controller,
+                    feedback: ActionFeedback, timestamp: Optional[float] = None,
+                    log: Callable[[str], None] = print) -> GestureEvents:
+    metrics = gesture_detector.metrics
+    if metrics is None:
+        events = gesture_detector.evaluate(hands_data, timestamp)
+        dispatch(events, mouse_controller, feedback, timestamp, log)
+        return events
+
+    start = time.perf_counter()
+    events = gesture_detector.evaluate(hands_data, timestamp)
+    dispatch(events, mouse_controller, feedback, timestamp, log)
+    metrics.observe('gestures.frame', time.perf_counter() - start)
+    return events
+
+
+def dispatch(events: GestureEvents, mouse_controller, feedback: ActionFeedback,
+             timestamp: Optional[float] = None, log: Callable[[str], None] = print):
+    """Perform the actions for one frame's gesture events"""
+    # Drag mode (highest priority)
+    if events.drag == 'start':
+        mouse_controller.mouse_down()
+        feedback.show("DRAG ON")
+        log("Drag mode activated!")
+    elif events.drag == 'end':
+        mouse_controller.mouse_up()
+        feedback.show("DRAG OFF")
+        log("Drag mode deactivated!")
+
+    for name in events.actions:
+        method, text, message = ACTIONS[name]
+        getattr(mouse_controller, method)()
+        feedback.show(text)
+        log(message)
+
+    if events.scroll == "up":
+        mouse_controller.scroll_up(config.SCROLL_SPEED)
+        feedback.show("SCROLL UP", 5)
+    elif events.scroll == "down":
+        mouse_controller.scroll_down(config.SCROLL_SPEED)
+        feedback.show("SCROLL DOWN", 5)
+
+    if events.cursor is not None:
+        screen_x, screen_y = mouse_controller.map_to_screen(
+            events.cursor[0],
+            events.cursor[1],
+            config.CAMERA_WIDTH,
+            config.CAMERA_HEIGHT
+        )
+
+        smooth_x, smooth_y = mouse_controller.smooth_movement(screen_x, screen_y, events.timestamp)
+        mouse_controller.move_mouse(smooth_x, smooth_y, timestamp)
@@ -0,0 +1,133 @@
+"""Asynchronous mouse and keyboard actuation on a dedicated thread"""
+
+import threading
+import time
+from typing import List, Optional, Tuple
+
+
+class AsyncActuator:
+    """
+    Drop-in front end for a MouseController that queues actions and performs
+    them on a worker thread, so slow OS input injection (hotkeys in
+    particular) never adds to frame time.
+
+    Pending commands are kept in order. A move replaces a move that is still
+    waiting at the end of the queue, so only the newest cursor position is
+    applied, and consecutive scrolls are merged into one net delta. Clicks,
+    hotkeys and button presses are never reordered or dropped.
+    """
+
+    def __init__(self, controller, metrics=None):
+        self.controller = controller
+        self.metrics = metrics
+
+        # Each command is [name, args, enqueue_time, frame_id]
+        self._pending: List[list] = []
+        self._cond = threading.Condition()
+        self._running = True
+        # Button state as seen by the producer; used to release a drag on close
+        self._button_down = False
+        self._thread = threading.Thread(target=self._run, name="actuator", daemon=True)
+        self._thread.start()
+
+    # Cursor math stays on the calling thread: it is cheap and owns the filter state
+    def map_to_screen(self, x: float, y: float, frame_width: int, frame_height: int) -> Tuple[float, float]:
+        return self.controller.map_to_screen(x, y, frame_width, frame_height)
+
+    def smooth_movement(self, x: float, y: float, timestamp: Optional[float] = None) -> Tuple[int, int]:
+        return self.controller.smooth_movement(x, y, timestamp)
+
+    def _submit(self, name: str, *args):
+        with self._cond:
+            if not self._running:
+                return
+            tail = self._pending[-1] if self._pending else None
+            if tail is not None and tail[0] == name == 'move_mouse':
+                # Keep the original enqueue time so queue latency stays honest
+                tail[1] = args
+                if self.metrics is not None:
+                    tail[3] = self.metrics.frame_id
+                    self.metrics.increment('actuator.coalesced_moves')
+            elif tail is not None and tail[0] == name == 'scroll':
+                tail[1] = (tail[1][0] + args[0],)
+                if self.metrics is not None:
+                    self.metrics.increment('actuator.merged_scrolls')
+            else:
+                frame_id = self.metrics.frame_id if self.metrics is not None else 0
+                self._pending.append([name, args, time.perf_counter(), frame_id])
+                self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or not self._running)
+                if not self._pending and not self._running:
+                    return
+                batch, self._pending = self._pending, []
+
+            for name, args, enqueued, frame_id in batch:
+                if self.metrics is not None:
+                    # Trace spans of this action belong to the frame that produced it
+                    self.metrics.set_frame(frame_id)
+                    self.metrics.observe('actuator.queue', time.perf_counter() - enqueued, trace=False)
+                try:
+                    self._execute(name, args)
+                except Exception as e:
+                    # Keep the worker alive; one failed injection must not stop the cursor
+                    print(f"Actuation '{name}' failed: {e}")
+
+    def _execute(self, name: str, args: tuple):
+        if name == 'scroll':
+            delta = args[0]
+            if delta > 0:
+                self.controller.scroll_up(delta)
+            elif delta < 0:
+                self.controller.scroll_down(-delta)
+            return
+        getattr(self.controller, name)(*args)
+
+    def move_mouse(self, x: int, y: int, frame_timestamp: Optional[float] = None):
+        # Dispatched to controller.move_mouse, which records capture-to-cursor latency when it runs
+        self._submit('move_mouse', x, y, frame_timestamp)
+
+    def click(self):
+        self._submit('click')
+
+    def double_click(self):
+        self._submit('double_click')
+
+    def scroll_up(self, speed: int):
+        self._submit('scroll', speed)
+
+    def scroll_down(self, speed: int):
+        self._submit('scroll', -speed)
+
+    def copy(self):
+        self._submit('copy')
+
+    def paste(self):
+        self._submit('paste')
+
+    def switch_desktop_left(self):
+        self._submit('switch_desktop_left')
+
+    def switch_desktop_right(self):
+        self._submit('switch_desktop_right')
+
+    def mouse_down(self):
+        self._button_down = True
+        self._submit('mouse_down')
+
+    def mouse_up(self):
+        self._button_down = False
+        self._submit('mouse_up')
+
+    def close(self, timeout: float = 2.0):
+        """Apply every pending action, release a held button, stop the worker and close the controller"""
+        if self._button_down:
+            self.mouse_up()
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout=timeout)
+        self.controller.close()
@@ -0,0 +1,161 @@
+"""Benchmark this machine and pick the most accurate tracker settings that fit a latency budget"""
+
+import argparse
+import itertools
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from capture_sources import create_source
+from config_profile import save_profile
+import config
+
+
+# Grid searched by calibrate(). Every axis is listed from most to least
+# accurate: two hands enable the two-handed gestures, the full model
+# (complexity 1) places landmarks more precisely than the lite one (0),
+# higher resolutions keep distant hands large enough to track, and
+# higher confidences reject more false detections.
+HAND_COUNTS = (2, 1)
+MODEL_COMPLEXITIES = (1, 0)
+RESOLUTIONS = ((1280, 720), (960, 540), (640, 360))
+CONFIDENCES = (0.7, 0.5)
+
+
+class Candidate(NamedTuple):
+    max_hands: int
+    model_complexity: int
+    width: int
+    height: int
+    min_detection_confidence: float
+    min_tracking_confidence: float
+
+    def settings(self) -> Dict[str, object]:
+        """The config values this candidate stands for"""
+        return {
+            'MAX_NUM_HANDS': self.max_hands,
+            'MODEL_COMPLEXITY': self.model_complexity,
+            'CAMERA_WIDTH': self.width,
+            'CAMERA_HEIGHT': self.height,
+            'MIN_DETECTION_CONFIDENCE': self.min_detection_confidence,
+            'MIN_TRACKING_CONFIDENCE': self.min_tracking_confidence,
+        }
+
+    def describe(self) -> str:
+        return (f"{self.width}x{self.height} {'full' if self.model_complexity else 'lite'} model, "
+                f"{self.max_hands} hand(s), confidence {self.min_detection_confidence}/{self.min_tracking_confidence}")
+
+
+def candidates(max_size: Optional[Tuple[int, int]] = None) -> List[Candidate]:
+    """The grid in decreasing order of accuracy, without resolutions above ``max_size``"""
+    grid = []
+    for hands, complexity, (width, height), detection, tracking in itertools.product(
+            HAND_COUNTS, MODEL_COMPLEXITIES, RESOLUTIONS, CONFIDENCES, CONFIDENCES):
+        if max_size is not None and (width > max_size[0] or height > max_size[1]):
+            continue
+        grid.append(Candidate(hands, complexity, width, height, detection, tracking))
+    return grid
+
+
+def capture_frames(source, count: int) -> List[np.ndarray]:
+    frames = []
+    for _ in range(count):
+        success, frame = source.read()
+        if not success:
+            break
+        frames.append(frame.copy())
+    if not frames:
+        raise RuntimeError("Could not read any frames for calibration")
+    return frames
+
+
+def measure(candidate: Candidate, frames: List[np.ndarray], count: int) -> Dict[str, float]:
+    """Latency of HandTracker.track for ``count`` frames with the candidate's settings"""
+    from hand_tracker import HandTracker
+
+    size = (candidate.width, candidate.height)
+    resized = [cv2.resize(frame, size, interpolation=cv2.INTER_AREA) for frame in frames]
+    tracker = HandTracker(
+        candidate.max_hands,
+        candidate.min_detection_confidence,
+        candidate.min_tracking_confidence,
+        model_complexity=candidate.model_complexity,
+        mirror_landmarks=config.MIRROR_LANDMARKS
+    )
+    try:
+        tracker.warm_up(resized[0].shape, 2)
+        latencies = []
+        for i in range(count):
+            start = time.perf_counter()
+            tracker.track(resized[i % len(resized)], i / config.CAMERA_FPS)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        tracker.close()
+
+    latencies.sort()
+    return {
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95)] * 1000,
+    }
+
+
+def calibrate(frames: List[np.ndarray], budget_ms: float, count: int = 30,
+              log=print) -> Tuple[Candidate, List[Dict[str, object]]]:
+    """
+    Measure candidates from the most accurate down and return the first
+    whose p95 latency fits ``budget_ms``, with every measurement taken.
+    If none fits, the fastest one measured is returned.
+    """
+    height, width = frames[0].shape[:2]
+    results = []
+    best, best_latency = None, float('inf')
+    for candidate in candidates((width, height)):
+        latency = measure(candidate, frames, count)
+        results.append(dict(candidate._asdict(), **latency))
+        fits = latency['p95_ms'] <= budget_ms
+        log(f"  {candidate.describe():<60} p50 {latency['p50_ms']:6.1f} ms   p95 {latency['p95_ms']:6.1f} ms"
+            f"{'   <- fits' if fits else ''}")
+        if fits:
+            return candidate, results
+        if latency['p95_ms'] < best_latency:
+            best, best_latency = candidate, latency['p95_ms']
+
+    if best is None:
+        raise RuntimeError(f"No calibration candidate fits {width}x{height} frames")
+    log(f"No setting fits {budget_ms:g} ms; using the fastest")
+    return best, results
+
+
+def run_calibration(path: str, budget_ms: float, frame_count: int, log=print) -> Candidate:
+    """Capture frames from the configured source, calibrate and save the choice to the profile at ``path``"""
+    # Ask the source for the largest resolution in the grid; smaller ones are downscaled from it
+    config.CAMERA_WIDTH, config.CAMERA_HEIGHT = RESOLUTIONS[0]
+    source = create_source(config.CAMERA_SOURCE, config)
+    try:
+        log(f"Calibrating on {source.describe()} for a {budget_ms:g} ms budget "
+            "(keep your hands in view for representative numbers)")
+        frames = capture_frames(source, frame_count)
+    finally:
+        source.release()
+
+    best, results = calibrate(frames, budget_ms, frame_count, log)
+    save_profile(path, best.settings(), 'calibration', {'latency_budget_ms': budget_ms, 'results': results})
+    log(f"Selected {best.describe()}; saved to {path}")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pick the most accurate tracker settings this machine can sustain")
+    parser.add_argument('--budget', type=float, default=config.CALIBRATION_LATENCY_BUDGET_MS,
+                        help="p95 tracking latency to stay under, in ms")
+    parser.add_argument('--frames', type=int, default=config.CALIBRATION_FRAMES, help="Frames measured per setting")
+    parser.add_argument('--output', default=config.PROFILE_PATH or "profile.json", help="Profile file to write")
+    args = parser.parse_args()
+
+    run_calibration(args.output, args.budget, args.frames)
+
+
+if __name__ == "__main__":
+    main()
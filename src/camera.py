@@ -1,26 +1,188 @@
 """Camera initialization and frame processing"""
 
 import cv2
-from typing import Optional, Tuple
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
 import numpy as np
 
 
 class Camera:
-    def __init__(self, index: int, width: int, height: int, fps: int):
-        self.cap = cv2.VideoCapture(index, cv2.CAP_DSHOW)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
-        self.cap.set(cv2.CAP_PROP_FPS, fps)
-        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-        
-        if not self.cap.isOpened():
-            raise RuntimeError("Failed to open camera")
+    def __init__(self, index: int, width: int, height: int, fps: int,
+                 threaded: bool = False, buffer_count: int = 3, metrics=None,
+                 buffer_allocator: Optional[Callable[[tuple, np.dtype, int], List[np.ndarray]]] = None,
+                 mirror: bool = True, source=None):
+        # Where frames come from: anything with read(image=None) and
+        # release() (see capture_sources); by default capture device ``index``
+        if source is None:
+            from capture_sources import CameraSource
+            source = CameraSource(index, width, height, fps)
+        self.source = source
+
+        # Capture time (time.perf_counter, high resolution on every platform)
+        # and sequence number of the last frame returned by read_frame
+        self.frame_timestamp = 0.0
+        self.frame_id = 0
+        # Frames captured but never returned because a newer one replaced them
+        self.dropped_frames = 0
+        self.metrics = metrics
+
+        # Flip every frame horizontally. With mirror=False frames are returned
+        # as captured and the hand tracker mirrors the landmarks instead.
+        self.mirror = mirror
+        # Non-threaded capture reuses one frame (plus one for the flip)
+        self._frame = None
+        self._flipped = None
+
+        # Optional allocate(shape, dtype, count) for the capture ring, e.g.
+        # ProcessHandTracker.allocate_frames to capture straight into shared memory
+        self.buffer_allocator = buffer_allocator
+        self.threaded = threaded
+        self._thread = None
+        self._failed = False
+        if threaded:
+            self._start_capture_thread(buffer_count)
+
+    def _start_capture_thread(self, buffer_count: int):
+        if buffer_count < 3:
+            raise ValueError("Threaded capture needs at least 3 frame buffers")
+
+        success, first = self.source.read()
+        if not success:
+            raise RuntimeError("Failed to read from camera")
+
+        # Ring of preallocated frames. At any time one slot holds the newest
+        # frame, one is owned by the caller of read_frame and the capture
+        # thread writes into one of the remaining slots.
+        if self.mirror:
+            self._raw = np.empty_like(first)
+        if self.buffer_allocator is not None:
+            self._buffers = self.buffer_allocator(first.shape, first.dtype, buffer_count)
+        else:
+            self._buffers = [np.empty_like(first) for _ in range(buffer_count)]
+        self._timestamps = [0.0] * buffer_count
+        self._ids = [0] * buffer_count
+
+        if self.mirror:
+            cv2.flip(first, 1, dst=self._buffers[0])
+        else:
+            np.copyto(self._buffers[0], first)
+        self._timestamps[0] = time.perf_counter()
+        self._ids[0] = 1
+        self._latest = 0
+        self._reading = -1
+        self._captured = 1
+
+        self._running = True
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._capture_loop, name="camera-capture", daemon=True)
+        self._thread.start()
+
+    def _capture_loop(self):
+        while self._running:
+            if self.mirror:
+                success, raw = self.source.read(self._raw)
+            else:
+                # The slot stays free while it is being filled: read_frame
+                # only ever takes the latest slot
+                with self._cond:
+                    slot = self._free_slot()
+                success, raw = self.source.read(self._buffers[slot])
+            timestamp = time.perf_counter()
+            if not success:
+                with self._cond:
+                    self._failed = True
+                    self._cond.notify_all()
+                return
+
+            if self.mirror:
+                with self._cond:
+                    slot = self._free_slot()
+                # Flip outside the lock so read_frame never waits on pixel work
+                cv2.flip(raw, 1, dst=self._buffers[slot])
+            elif raw is not self._buffers[slot]:
+                # The backend did not fill the buffer in place
+                np.copyto(self._buffers[slot], raw)
+
+            with self._cond:
+                self._captured += 1
+                self._timestamps[slot] = timestamp
+                self._ids[slot] = self._captured
+                self._latest = slot
+                self._cond.notify_all()
+
+    def _free_slot(self) -> int:
+        for slot in range(len(self._buffers)):
+            if slot != self._latest and slot != self._reading:
+                return slot
+        raise RuntimeError("No free frame buffer")
+
+    def _read_threaded(self, timeout: float) -> Tuple[bool, Optional[np.ndarray]]:
+        with self._cond:
+            # Never hand out the same frame twice: wait for a newer one
+            self._cond.wait_for(
+                lambda: self._ids[self._latest] > self.frame_id or self._failed,
+                timeout=timeout
+            )
+            if self._ids[self._latest] <= self.frame_id:
+                return False, None
+
+            slot = self._latest
+            self._reading = slot
+            frame_id = self._ids[slot]
+
+        if self.frame_id:
+            dropped = frame_id - self.frame_id - 1
+            self.dropped_frames += dropped
+            if dropped and self.metrics is not None:
+                self.metrics.increment('camera.dropped_frames', dropped)
+        self.frame_id = frame_id
+        self.frame_timestamp = self._timestamps[slot]
+        # Valid until the next read_frame call, which releases the buffer
+        return True, self._buffers[slot]
+
+    def _read_direct(self) -> Tuple[bool, Optional[np.ndarray]]:
+        success, frame = self.source.read(self._frame)
+        if not success:
+            self._failed = True
+            return False, None
+        self.frame_timestamp = time.perf_counter()
+        self.frame_id += 1
+        # Keep whatever the driver filled so the next read reuses it
+        self._frame = frame
+        if self.mirror:
+            if self._flipped is None or self._flipped.shape != frame.shape:
+                self._flipped = np.empty_like(frame)
+            frame = cv2.flip(frame, 1, dst=self._flipped)
+        # Valid until the next read_frame call
+        return True, frame
+
+    @property
+    def failed(self) -> bool:
+        """
+        True once the source stopped delivering frames. Until then a failed
+        threaded read_frame only means no new frame arrived within the
+        timeout (a stall), and the caller should read again.
+        """
+        return self._failed
     
-    def read_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
-        success, frame = self.cap.read()
-        if success:
-            frame = cv2.flip(frame, 1)
+    def read_frame(self, timeout: float = 1.0) -> Tuple[bool, Optional[np.ndarray]]:
+        start = time.perf_counter() if self.metrics is not None else 0.0
+
+        if self.threaded:
+            success, frame = self._read_threaded(timeout)
+        else:
+            success, frame = self._read_direct()
+
+        if self.metrics is not None:
+            # Spans recorded on this thread from now on belong to the new frame
+            self.metrics.set_frame(self.frame_id)
+            self.metrics.observe('camera.read', time.perf_counter() - start)
         return success, frame
     
     def release(self):
-        self.cap.release()
\ No newline at end of file
+        if self._thread is not None:
+            self._running = False
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.source.release()
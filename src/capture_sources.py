@@ -0,0 +1,234 @@
+"""Frame sources for Camera: capture devices, video files, image sequences and synthetic frames"""
+
+import glob
+import os
+import sys
+import time
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+# Capture APIs by config name; "auto" picks DirectShow on Windows and V4L2 on Linux
+CAPTURE_APIS = {
+    "any": cv2.CAP_ANY,
+    "dshow": cv2.CAP_DSHOW,
+    "msmf": cv2.CAP_MSMF,
+    "v4l2": cv2.CAP_V4L2,
+    "avfoundation": cv2.CAP_AVFOUNDATION,
+}
+
+
+def default_api() -> str:
+    if sys.platform.startswith('win'):
+        return "dshow"
+    if sys.platform.startswith('linux'):
+        return "v4l2"
+    return "any"
+
+
+def decode_fourcc(code: float) -> str:
+    code = int(code)
+    return "".join(chr((code >> 8 * i) & 0xFF) for i in range(4)).strip("\0") or "?"
+
+
+class _Pacer:
+    """Sleeps so that frames come out no faster than ``fps``, like a real camera"""
+
+    def __init__(self, fps: float):
+        self.interval = 1.0 / fps if fps > 0 else 0.0
+        self._next = None
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.perf_counter()
+        if self._next is None or now - self._next > self.interval:
+            # First frame, or the consumer fell behind: don't burst to catch up
+            self._next = now
+        elif self._next > now:
+            time.sleep(self._next - now)
+        self._next += self.interval
+
+
+class CameraSource:
+    """
+    A capture device through OpenCV. ``fourcc``, when given, is requested before the
+    resolution because V4L2 drivers only offer some sizes and rates per
+    pixel format: many webcams deliver 720p at 30 fps only as MJPG and
+    fall back to a few fps in raw YUYV. The format, size and rate the
+    driver actually accepted are read back afterwards.
+    """
+
+    def __init__(self, index: int, width: int, height: int, fps: float,
+                 api: str = "auto", fourcc: Optional[str] = None):
+        self.api = default_api() if api == "auto" else api
+        if self.api not in CAPTURE_APIS:
+            raise ValueError(f"Unknown capture API: {api} (expected auto or one of {', '.join(CAPTURE_APIS)})")
+
+        self.cap = cv2.VideoCapture(index, CAPTURE_APIS[self.api])
+        if not self.cap.isOpened():
+            raise RuntimeError("Failed to open camera")
+
+        if fourcc:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.cap.set(cv2.CAP_PROP_FPS, fps)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        self.requested_fourcc = fourcc
+        self.fourcc = decode_fourcc(self.cap.get(cv2.CAP_PROP_FOURCC))
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS)
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        return self.cap.read(image)
+
+    def describe(self) -> str:
+        text = f"camera ({self.api}) {self.width}x{self.height} {self.fourcc} @ {self.fps:g} fps"
+        if self.requested_fourcc and self.fourcc != self.requested_fourcc:
+            text += f" ({self.requested_fourcc} was not accepted)"
+        return text
+
+    def release(self):
+        self.cap.release()
+
+
+class VideoFileSource:
+    """Frames from a video file, optionally looped and paced at the file's frame rate"""
+
+    def __init__(self, path: str, loop: bool = False, realtime: bool = True):
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Failed to open video file {path}")
+        self.loop = loop
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self._pacer = _Pacer(self.fps if realtime else 0)
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        self._pacer.wait()
+        success, frame = self.cap.read(image)
+        if not success and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, frame = self.cap.read(image)
+        return success, frame
+
+    def describe(self) -> str:
+        return f"video file {self.path} {self.width}x{self.height} @ {self.fps:g} fps"
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageSequenceSource:
+    """
+    Frames from image files: a directory (files in name order) or a glob
+    pattern such as ``frames/*.png``. Every image must have the same size.
+    """
+
+    EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+    def __init__(self, path: str, fps: float = 30.0, loop: bool = False, realtime: bool = True):
+        if os.path.isdir(path):
+            self.files: List[str] = sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.lower().endswith(self.EXTENSIONS)
+            )
+        else:
+            self.files = sorted(glob.glob(path))
+        if not self.files:
+            raise RuntimeError(f"No images found at {path}")
+
+        first = cv2.imread(self.files[0])
+        if first is None:
+            raise RuntimeError(f"Failed to read image {self.files[0]}")
+        self.path = path
+        self.height, self.width = first.shape[:2]
+        self.fps = fps
+        self.loop = loop
+        self._next = 0
+        self._pacer = _Pacer(fps if realtime else 0)
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        if self._next >= len(self.files):
+            if not self.loop:
+                return False, None
+            self._next = 0
+        self._pacer.wait()
+        frame = cv2.imread(self.files[self._next])
+        self._next += 1
+        if frame is None:
+            return False, None
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return True, image
+        return True, frame
+
+    def describe(self) -> str:
+        return f"{len(self.files)} images from {self.path} {self.width}x{self.height} @ {self.fps:g} fps"
+
+    def release(self):
+        pass
+
+
+class SyntheticSource:
+    """
+    Generated frames: a bright disk circling over a dark gradient, drawn
+    into the caller's buffer. Runs the pipeline without any camera or
+    fixture; MediaPipe finds no hands in it.
+    """
+
+    def __init__(self, width: int, height: int, fps: float = 30.0, frames: int = 0, realtime: bool = True):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        # Stop after this many frames (0 = never)
+        self.frames = frames
+        self._count = 0
+        self._pacer = _Pacer(fps if realtime else 0)
+        gradient = np.linspace(0, 96, width, dtype=np.float32).astype(np.uint8)
+        self._background = np.repeat(np.broadcast_to(gradient, (height, width))[:, :, None], 3, axis=2)
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        if self.frames and self._count >= self.frames:
+            return False, None
+        self._pacer.wait()
+        if image is None or image.shape != self._background.shape:
+            image = np.empty_like(self._background)
+        np.copyto(image, self._background)
+
+        angle = 2 * np.pi * self._count / (4 * self.fps)
+        radius = min(self.width, self.height) // 3
+        center = (int(self.width / 2 + radius * np.cos(angle)), int(self.height / 2 + radius * np.sin(angle)))
+        cv2.circle(image, center, max(4, radius // 4), (255, 255, 255), -1)
+        self._count += 1
+        return True, image
+
+    def describe(self) -> str:
+        return f"synthetic {self.width}x{self.height} @ {self.fps:g} fps"
+
+    def release(self):
+        pass
+
+
+SOURCES = ("camera", "video", "images", "synthetic")
+
+
+def create_source(name: str, config):
+    """The frame source selected by CAMERA_SOURCE, configured from the config module"""
+    if name == "camera":
+        return CameraSource(config.CAMERA_INDEX, config.CAMERA_WIDTH, config.CAMERA_HEIGHT, config.CAMERA_FPS,
+                            config.CAMERA_API, config.CAMERA_FOURCC)
+    if name == "video":
+        return VideoFileSource(config.CAMERA_SOURCE_PATH, config.CAMERA_SOURCE_LOOP)
+    if name == "images":
+        return ImageSequenceSource(config.CAMERA_SOURCE_PATH, config.CAMERA_FPS, config.CAMERA_SOURCE_LOOP)
+    if name == "synthetic":
+        return SyntheticSource(config.CAMERA_WIDTH, config.CAMERA_HEIGHT, config.CAMERA_FPS)
+    raise ValueError(f"Unknown camera source: {name} (expected one of {', '.join(SOURCES)})")
@@ -5,16 +5,90 @@ CAMERA_INDEX = 0
 CAMERA_WIDTH = 1280
 CAMERA_HEIGHT = 720
 CAMERA_FPS = 30
+CAMERA_THREADED = False       # Capture on a background thread, always process the newest frame
+CAMERA_BUFFER_COUNT = 3       # Preallocated frame buffers for threaded capture (>= 3)
+MIRROR_LANDMARKS = False      # Mirror landmarks numerically instead of flipping every frame (only the shown preview is flipped)
+CAMERA_SOURCE = "camera"      # "camera", "video" (file), "images" (directory or glob) or "synthetic"
+CAMERA_SOURCE_PATH = None     # Video file or image directory/pattern for the "video" and "images" sources
+CAMERA_SOURCE_LOOP = True     # Restart file sources at the end instead of stopping
+CAMERA_API = "auto"           # Capture API: "auto" (DirectShow on Windows, V4L2 on Linux), "dshow", "msmf", "v4l2", "any"
+CAMERA_FOURCC = None          # Pixel format requested from the camera, e.g. "MJPG" (None = driver default)
+
+# Multiple cameras: one dict per camera, each tracked by its own tracker in parallel, e.g.
+#   CAMERAS = [{"source": "camera", "index": 0},
+#              {"source": "camera", "index": 1, "screen_corners": [[x, y], [x, y], [x, y], [x, y]]}]
+# Keys: "source", "index" and "path" override CAMERA_SOURCE, CAMERA_INDEX and CAMERA_SOURCE_PATH;
+# "screen_corners" (where this camera sees the index fingertip pointing at the screen's
+# top-left, top-right, bottom-right and bottom-left corners) or a 3x3 "homography" maps its
+# landmarks into the shared frame; without either a camera is taken as aligned with it.
+CAMERAS = []                  # Empty = the single camera above
+CAMERA_PARALLEL = True        # Track the cameras concurrently (thread pool; worker processes with TRACKER_PROCESS)
+CAMERA_SWITCH_MARGIN = 0.1    # Score lead another camera needs to take over a hand that is still seen
 
 # Hand tracking settings
 MAX_NUM_HANDS = 2
 MIN_DETECTION_CONFIDENCE = 0.7
 MIN_TRACKING_CONFIDENCE = 0.7
+MODEL_COMPLEXITY = 1              # 1 = full hand landmark model, 0 = lite (faster, less precise)
+
+# Performance profile: calibrated settings applied over this file at startup
+PROFILE_PATH = "profile.json"     # Loaded when it exists (None = never)
+CALIBRATION_MODE = "off"          # "off", "missing" (calibrate when there is no profile yet) or "always"
+CALIBRATION_LATENCY_BUDGET_MS = 25.0  # p95 tracking latency the chosen settings must stay under
+CALIBRATION_FRAMES = 30           # Frames measured per candidate setting
+
+# Startup
+CONCURRENT_STARTUP = False        # Load the hand model on a background thread while the camera opens
+MODEL_WARMUP_FRAMES = 2           # Blank frames run through the model before the first camera frame (0 = none)
+
+# Region-of-interest inference
+ROI_ENABLED = False               # Run the model on a crop around the hands from the previous frame
+ROI_MARGIN = 0.25                 # Crop margin around the hands, as a fraction of their bounding box
+ROI_MAX_SIDE = 0                  # Downscale crops whose longest side exceeds this (0 = never)
+ROI_FULL_FRAME_INTERVAL = 30      # Frames between full-frame searches while fewer than MAX_NUM_HANDS are tracked
+ROI_MAX_AREA = 0.6                # Use the full frame when the crop would cover more than this fraction
+
+# Inference decimation
+INFERENCE_INTERVAL = 1            # Run the hand model every N frames, predict landmarks in between (1 = every frame)
+ADAPTIVE_INFERENCE = False        # Run the model on every frame while hands move fast
+INFERENCE_MOTION_THRESHOLD = 600.0  # Landmark speed (pixels/s) above which adaptive mode infers every frame
+
+# Idle power mode: after IDLE_TIMEOUT seconds without hands, only look for a hand
+# IDLE_CHECK_FPS times per second (and on motion) on a small frame with the lite model
+IDLE_ENABLED = False
+IDLE_TIMEOUT = 10.0
+IDLE_CHECK_FPS = 5.0
+IDLE_CHECK_WIDTH = 320            # Width presence checks downscale the frame to
+IDLE_MOTION_FRACTION = 0.01       # Share of a thumbnail that must change to check at once (0 = periodic only)
+
+# Run MediaPipe in a separate process; frames are shared through shared memory
+TRACKER_PROCESS = False
+TRACKER_PROCESS_TIMEOUT = 2.0     # Seconds without an answer before the worker is restarted
 
 # Mouse control settings
 SMOOTHING_FACTOR = 0.5
 MOUSE_SPEED_MULTIPLIER = 1.5
 SCREEN_PADDING = 100
+ASYNC_ACTUATION = False           # Inject mouse/keyboard input on a worker thread, coalescing queued moves
+INPUT_BACKEND = "pyautogui"       # "pyautogui" (any OS), "xtest" (Linux/X11, lower overhead) or "recording" (no OS input)
+
+# Cursor filter: "ema" (fixed blend of SMOOTHING_FACTOR * MOUSE_SPEED_MULTIPLIER),
+# "one_euro" (speed-adaptive smoothing) or "kalman" (constant velocity with prediction)
+CURSOR_FILTER = "ema"
+ONE_EURO_MIN_CUTOFF = 1.0         # Hz; lower = smoother when the hand is still
+ONE_EURO_BETA = 0.007             # Higher = less lag during fast movement
+ONE_EURO_D_CUTOFF = 1.0           # Hz; cutoff for the speed estimate
+KALMAN_PROCESS_NOISE = 1e6        # Expected hand acceleration variance (px^2/s^4); higher = follows faster
+KALMAN_MEASUREMENT_NOISE = 16.0   # Expected landmark jitter variance in screen pixels squared
+KALMAN_PREDICTION_TIME = 0.03     # Seconds to extrapolate ahead to offset pipeline latency
+
+# Gesture thresholds below are in pixels of a frame this wide and scale with CAMERA_WIDTH
+THRESHOLD_REFERENCE_WIDTH = 1280
+# "pixels": compare pinch distances in frame pixels (thresholds scaled to CAMERA_WIDTH)
+# "hand_size": compare them relative to each hand's wrist-to-middle-knuckle length,
+# which ignores capture resolution and how far the hand is from the camera
+GESTURE_DISTANCE_MODE = "pixels"
+REFERENCE_HAND_SIZE = 150.0       # Wrist-to-middle-knuckle pixels the thresholds were tuned at ("hand_size" mode)
 
 # Gesture settings - Left hand
 SINGLE_CLICK_THRESHOLD = 40.0
@@ -22,6 +96,9 @@ SINGLE_CLICK_MAX_TIME = 0.25
 DOUBLE_CLICK_THRESHOLD = 40.0
 COPY_THRESHOLD = 40.0
 PASTE_THRESHOLD = 40.0
+SINGLE_CLICK_COOLDOWN_MS = 500    # Minimum time between two single clicks
+DOUBLE_CLICK_COOLDOWN_MS = 667    # Minimum time between two double clicks
+COPY_PASTE_COOLDOWN_MS = 667      # Minimum time between two copies (or two pastes)
 
 # Gesture settings - Right hand scroll
 SCROLL_UP_THRESHOLD = 45.0
@@ -31,10 +108,51 @@ SCROLL_SMOOTHING_FRAMES = 5
 
 # Gesture settings - Desktop switching
 DESKTOP_SWITCH_THRESHOLD = 40.0
+DESKTOP_SWITCH_COOLDOWN_MS = 667  # Minimum time between two switches in the same direction
 
 # Gesture settings - Drag mode
 DRAG_START_THRESHOLD = 40.0
 DRAG_END_THRESHOLD = 40.0
+DRAG_COOLDOWN_MS = 667            # Minimum time between two drag starts (or two drag ends)
+
+# Main loop settings
+PIPELINE_MODE = "serial"          # "serial" (one loop) or "threaded" (overlapping stages)
+PIPELINE_QUEUE_SIZE = 1           # Bounded queue length between pipeline stages
+PIPELINE_REPORT_INTERVAL = 5.0    # Seconds between throughput/queue reports (threaded mode)
+
+# Metrics
+METRICS_ENABLED = False           # Record per-stage latency histograms and action counters
+METRICS_EXPORT_PATH = "metrics.json"  # File the metrics are dumped to periodically (None = no export)
+METRICS_EXPORT_FORMAT = "json"    # "json" or "prometheus" (text exposition format)
+METRICS_EXPORT_INTERVAL = 10.0    # Seconds between dumps
+
+# Frame tracing: per-stage spans of every frame kept in memory and written as
+# Chrome/Perfetto trace-event JSON on 't' in the window, SIGUSR1 and at exit
+TRACE_ENABLED = False
+TRACE_PATH = "trace.json"         # Opens in chrome://tracing or https://ui.perfetto.dev
+TRACE_CAPACITY = 65536            # Spans kept; a frame records about 8, so ~4 min at 30 FPS
+TRACE_SECONDS = 30.0              # Span history written on demand (None = the whole ring)
+
+# Session recording
+RECORD_SESSION_PATH = None        # File to record landmarks to for offline replay (None = off)
+
+# Split mode: track on one machine, inject input on another, over UDP
+# "off": track and inject here
+# "send": track here and stream every frame to NETWORK_HOST:NETWORK_PORT, no input injection
+# "receive": no camera or model; listen on NETWORK_HOST:NETWORK_PORT and inject input
+NETWORK_MODE = "off"
+NETWORK_HOST = "127.0.0.1"        # Receiver address ("send") or interface to listen on ("receive", "0.0.0.0" = all)
+NETWORK_PORT = 47800
+NETWORK_PAYLOAD = "landmarks"     # "landmarks" (receiver detects gestures) or "events" (sender detects them)
+NETWORK_QUANTIZE = True           # int16 coordinates: half the datagram size, about 0.1 px error
+NETWORK_MAX_AGE = 0.1             # Seconds a datagram may arrive later than the fastest one before it is stale
+
+# Display
+# "window": draw the overlay and show every frame on the frame loop
+# "preview": draw and show a copy of the latest frame on a separate thread at PREVIEW_FPS
+# "headless": no window and no overlay work; quit with Ctrl+C or SIGTERM
+DISPLAY_MODE = "window"
+PREVIEW_FPS = 10
 
 # Visual settings
 SHOW_LANDMARKS = True
@@ -0,0 +1,41 @@
+"""Profiles: config settings saved to a JSON file and applied over config.py at startup"""
+
+import json
+import os
+import time
+from typing import Dict, Optional
+
+
+def save_profile(path: str, settings: Dict[str, object], tool: str, details: Optional[Dict[str, object]] = None):
+    """
+    Add ``settings`` (config names -> values) to the profile at ``path``.
+    Settings from other tools already in the file are kept, so calibration
+    and tuning can share one profile. ``details`` records how ``tool``
+    chose the settings and is ignored when loading.
+    """
+    profile = {'settings': {}, 'details': {}}
+    if os.path.exists(path):
+        with open(path) as f:
+            profile = json.load(f)
+
+    profile['settings'].update(settings)
+    profile['details'][tool] = dict(details or {}, created=time.strftime('%Y-%m-%dT%H:%M:%S'))
+    with open(path, 'w') as f:
+        json.dump(profile, f, indent=2)
+
+
+def load_profile(path: str) -> Dict[str, object]:
+    with open(path) as f:
+        return json.load(f)['settings']
+
+
+def apply_profile(path: str, config) -> Dict[str, object]:
+    """Override the config module's values with the profile's settings; returns what was applied"""
+    applied = {}
+    for name, value in load_profile(path).items():
+        if not name.isupper() or not hasattr(config, name):
+            print(f"Ignoring unknown setting {name} in profile {path}")
+            continue
+        setattr(config, name, value)
+        applied[name] = value
+    return applied
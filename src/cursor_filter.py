@@ -0,0 +1,160 @@
+"""Cursor smoothing filters with floating-point state"""
+
+import math
+from typing import Tuple
+
+
+class EmaFilter:
+    """Fixed exponential blend per frame; alpha = 1 follows the input exactly"""
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.reset()
+
+    def reset(self):
+        self.x = None
+        self.y = None
+
+    def filter(self, x: float, y: float, timestamp: float) -> Tuple[float, float]:
+        if self.x is None:
+            self.x, self.y = x, y
+        else:
+            self.x += (x - self.x) * self.alpha
+            self.y += (y - self.y) * self.alpha
+        return self.x, self.y
+
+
+class _LowPass:
+    def __init__(self):
+        self.value = None
+
+    def apply(self, value: float, alpha: float) -> float:
+        if self.value is None:
+            self.value = value
+        else:
+            self.value += alpha * (value - self.value)
+        return self.value
+
+
+class OneEuroFilter:
+    """
+    One Euro filter (Casiez et al., CHI 2012): a low-pass filter whose cutoff
+    rises with speed, so slow movements are smoothed heavily and fast ones
+    follow the hand with little lag.
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 0.007, d_cutoff: float = 1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self._values = (_LowPass(), _LowPass())
+        self._derivatives = (_LowPass(), _LowPass())
+        self._last_time = None
+
+    @staticmethod
+    def _alpha(cutoff: float, dt: float) -> float:
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def filter(self, x: float, y: float, timestamp: float) -> Tuple[float, float]:
+        if self._last_time is None:
+            self._last_time = timestamp
+            self._values[0].apply(x, 1.0)
+            self._values[1].apply(y, 1.0)
+            return self._values[0].value, self._values[1].value
+        if timestamp <= self._last_time:
+            # No time has passed (duplicate or out-of-order timestamp): keep the state and output
+            return self._values[0].value, self._values[1].value
+
+        dt = timestamp - self._last_time
+        d_alpha = self._alpha(self.d_cutoff, dt)
+        result = []
+        for axis, value in enumerate((x, y)):
+            derivative = self._derivatives[axis].apply((value - self._values[axis].value) / dt, d_alpha)
+            cutoff = self.min_cutoff + self.beta * abs(derivative)
+            result.append(self._values[axis].apply(value, self._alpha(cutoff, dt)))
+
+        self._last_time = timestamp
+        return result[0], result[1]
+
+
+class KalmanFilter:
+    """
+    Constant-velocity Kalman filter per axis. The output is the filtered
+    position extrapolated prediction_time seconds ahead, which offsets the
+    capture-to-cursor latency of the pipeline.
+    """
+
+    def __init__(self, process_noise: float = 1e6, measurement_noise: float = 16.0,
+                 prediction_time: float = 0.0):
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.prediction_time = prediction_time
+        self.reset()
+
+    def reset(self):
+        # Per axis: position, velocity and the 2x2 covariance (p00, p01, p11)
+        self._state = None
+        self._last_time = None
+        self._output = None
+
+    def filter(self, x: float, y: float, timestamp: float) -> Tuple[float, float]:
+        if self._state is None:
+            big = 1e6
+            self._state = [[x, 0.0, self.measurement_noise, 0.0, big], [y, 0.0, self.measurement_noise, 0.0, big]]
+            self._last_time = timestamp
+            self._output = (x, y)
+            return self._output
+        if timestamp <= self._last_time:
+            # No time has passed (duplicate or out-of-order timestamp): keep the state and output
+            return self._output
+
+        dt = timestamp - self._last_time
+        self._last_time = timestamp
+        q = self.process_noise
+        r = self.measurement_noise
+
+        output = []
+        for axis, measurement in enumerate((x, y)):
+            pos, vel, p00, p01, p11 = self._state[axis]
+
+            # Predict with white-noise acceleration
+            pos += vel * dt
+            p00 += dt * (2 * p01 + dt * p11) + q * dt ** 4 / 4
+            p01 += dt * p11 + q * dt ** 3 / 2
+            p11 += q * dt ** 2
+
+            # Update with the measured position
+            s = p00 + r
+            k0 = p00 / s
+            k1 = p01 / s
+            residual = measurement - pos
+            pos += k0 * residual
+            vel += k1 * residual
+            p11 -= k1 * p01
+            p01 -= k0 * p01
+            p00 -= k0 * p00
+
+            self._state[axis] = [pos, vel, p00, p01, p11]
+            output.append(pos + vel * self.prediction_time)
+
+        self._output = (output[0], output[1])
+        return self._output
+
+
+FILTERS = ("ema", "one_euro", "kalman")
+
+
+def create_filter(name: str, config):
+    """Build the filter called ``name`` with its parameters taken from the config module"""
+    if name == "ema":
+        return EmaFilter(config.SMOOTHING_FACTOR * config.MOUSE_SPEED_MULTIPLIER)
+    if name == "one_euro":
+        return OneEuroFilter(config.ONE_EURO_MIN_CUTOFF, config.ONE_EURO_BETA, config.ONE_EURO_D_CUTOFF)
+    if name == "kalman":
+        return KalmanFilter(config.KALMAN_PROCESS_NOISE, config.KALMAN_MEASUREMENT_NOISE,
+                            config.KALMAN_PREDICTION_TIME)
+    raise ValueError(f"Unknown cursor filter: {name} (expected one of {', '.join(FILTERS)})")
@@ -2,137 +2,218 @@
 
 import numpy as np
 import time
-from typing import List, Dict, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
 from collections import deque
 
+from gesture_rules import (GestureRule, RuleEvaluator, HAND_SIZE_LANDMARKS, MIN_HAND_SIZE, default_rules,
+                           threshold_scale)
+from landmarks import HandData, HAND_LABELS, NUM_LANDMARKS
+import config
+
+
+# Landmark pairs whose 2D distance is needed every frame by the built-in
+# gestures: (hand, index, hand, index). Pairs of custom rules are appended.
+DISTANCE_PAIRS = (
+    ('Left', 4, 'Left', 8),       # Single click
+    ('Left', 4, 'Left', 12),      # Double click
+    ('Left', 4, 'Left', 16),      # Copy
+    ('Left', 4, 'Left', 20),      # Paste
+    ('Right', 4, 'Right', 11),    # Scroll up
+    ('Right', 4, 'Right', 10),    # Scroll down
+    ('Right', 4, 'Right', 16),    # Desktop switch left
+    ('Right', 4, 'Right', 20),    # Desktop switch right
+    ('Left', 8, 'Right', 8),      # Drag start
+    ('Left', 8, 'Right', 4),      # Drag end
+)
+
+
+# Rules that toggle drag mode; reported as GestureEvents.drag, not as actions
+DRAG_RULES = {'drag_start': 'start', 'drag_end': 'end'}
+
+
+class GestureEvents(NamedTuple):
+    """Everything the gesture logic decided for one frame"""
+    timestamp: float
+    # Discrete gestures that fired, e.g. ('single_click', 'copy'), in rule order
+    actions: Tuple[str, ...] = ()
+    # "up", "down" or None
+    scroll: Optional[str] = None
+    # Right index fingertip in frame pixels when the cursor should follow it
+    cursor: Optional[Tuple[float, float]] = None
+    # "start", "end" or None
+    drag: Optional[str] = None
+
 
 class GestureDetector:
-    def __init__(self):
-        # Left hand single click state
-        self.single_click_start_time = None
-        self.single_click_cooldown = 0
-        
-        # Left hand double click state
-        self.double_click_cooldown = 0
-        
-        # Left hand copy state
-        self.copy_cooldown = 0
-        
-        # Left hand paste state
-        self.paste_cooldown = 0
+    def __init__(self, metrics=None, rules: Optional[Sequence[GestureRule]] = None):
+        self.metrics = metrics
+        if rules is None:
+            rules = default_rules(config)
+        
+        pairs = list(DISTANCE_PAIRS)
+        for rule in rules:
+            pair = (rule.hand1, rule.index1, rule.hand2, rule.index2)
+            if pair not in pairs:
+                pairs.append(pair)
+        
+        # Distances relative to hand size: each hand's size is gathered in the
+        # same pass as the pairs, after them, and pairs divide by the mean
+        # size of their two hands
+        self.normalize = config.GESTURE_DISTANCE_MODE == "hand_size"
+        wrist, knuckle = HAND_SIZE_LANDMARKS
+        gathered = pairs + [(label, wrist, label, knuckle) for label in HAND_LABELS] if self.normalize else pairs
+        self._pair_hands = np.array([
+            [HAND_LABELS.index(h1) for h1, _, _, _ in pairs],
+            [HAND_LABELS.index(h2) for _, _, h2, _ in pairs],
+        ])
+        
+        # Per-frame distance cache, filled by update() in a single vectorized pass
+        self._rows = np.array([
+            [HAND_LABELS.index(h1) * NUM_LANDMARKS + i1 for h1, i1, _, _ in gathered],
+            [HAND_LABELS.index(h2) * NUM_LANDMARKS + i2 for _, _, h2, i2 in gathered],
+        ])
+        self._points = np.zeros((len(HAND_LABELS) * NUM_LANDMARKS, 3), dtype=np.float32)
+        self._pair_slots = {pair: i for i, pair in enumerate(pairs)}
+        self._hand_masks = {
+            label: np.array([label in (h1, h2) for h1, _, h2, _ in pairs])
+            for label in HAND_LABELS
+        }
+        self._frame_hands = {}
+        self._distances = []
+        
+        # Timestamp of the frame being evaluated, set by update(). Detectors
+        # read time from here so recorded sessions replay deterministically.
+        self.frame_time = 0.0
+        
+        # Discrete gestures, all evaluated together by update()
+        self.rules = RuleEvaluator(rules, self._pair_slots)
+        self.fired: List[str] = []
         
         # Right hand scroll state
+        scale = threshold_scale(config)
+        self.scroll_up_threshold = config.SCROLL_UP_THRESHOLD * scale
+        self.scroll_down_threshold = config.SCROLL_DOWN_THRESHOLD * scale
         self.scroll_direction = None
         self.scroll_buffer = deque(maxlen=5)
         
-        # Right hand desktop switching state
-        self.desktop_switch_left_cooldown = 0
-        self.desktop_switch_right_cooldown = 0
-        
         # Drag mode state
         self.drag_active = False
-        self.drag_start_cooldown = 0
-        self.drag_end_cooldown = 0
     
-    def get_fingertip_position(self, landmarks: List[Dict], finger_index: int) -> Optional[Tuple[float, float]]:
-        if not landmarks or len(landmarks) <= finger_index:
-            return None
-        tip = landmarks[finger_index]
-        return (tip['x'], tip['y'])
+    def evaluate(self, hands_data: Dict[str, Optional[HandData]], timestamp: Optional[float] = None) -> GestureEvents:
+        """
+        Run every detector exactly once for a frame and return the result.
+        The only entry point the main loop needs; it has no other side
+        effects on the detector than advancing its per-gesture state.
+        """
+        if self.metrics is None:
+            return self._evaluate(hands_data, timestamp)
+        
+        start = time.perf_counter()
+        events = self._evaluate(hands_data, timestamp)
+        self.metrics.observe('gestures.evaluate', time.perf_counter() - start)
+        return events
     
-    def calculate_distance_2d(self, landmarks: List[Dict], index1: int, index2: int) -> float:
-        if not landmarks or len(landmarks) <= max(index1, index2):
-            return float('inf')
-        
-        p1 = landmarks[index1]
-        p2 = landmarks[index2]
-        
-        dx = p1['x'] - p2['x']
-        dy = p1['y'] - p2['y']
-        
-        return np.sqrt(dx**2 + dy**2)
+    def _evaluate(self, hands_data: Dict[str, Optional[HandData]], timestamp: Optional[float]) -> GestureEvents:
+        self.update(hands_data, timestamp)
+        
+        actions = []
+        drag = None
+        for name in self.fired:
+            transition = DRAG_RULES.get(name)
+            if transition is None:
+                actions.append(name)
+            else:
+                drag = transition
+                self.drag_active = transition == 'start'
+        
+        scroll = None
+        cursor = None
+        right = hands_data.get('Right')
+        if right is not None:
+            scroll = self.detect_scroll_gesture(right, self.scroll_up_threshold, self.scroll_down_threshold)
+            # The cursor holds still while scrolling or switching desktops
+            if scroll is None and 'desktop_left' not in actions and 'desktop_right' not in actions:
+                cursor = self.get_fingertip_position(right, 8)
+        
+        return GestureEvents(self.frame_time, tuple(actions), scroll, cursor, drag)
     
-    def calculate_distance_between_hands(self, left_landmarks: List[Dict], right_landmarks: List[Dict], 
-                                         left_index: int, right_index: int) -> float:
-        if not left_landmarks or not right_landmarks:
-            return float('inf')
-        if len(left_landmarks) <= left_index or len(right_landmarks) <= right_index:
+    def update(self, hands_data: Dict[str, Optional[HandData]], timestamp: Optional[float] = None):
+        """
+        Start a new frame: record its time, compute every landmark distance
+        at once and evaluate all gesture rules on them
+        """
+        self.frame_time = time.perf_counter() if timestamp is None else timestamp
+        
+        left = hands_data.get('Left')
+        right = hands_data.get('Right')
+        self._frame_hands = {'Left': left, 'Right': right}
+        
+        if left is None and right is None:
+            self._distances = [float('inf')] * len(self._pair_slots)
+            self.fired = []
+            return
+        
+        points = (left if left is not None else right).frame_points
+        if points is None or (left is not None and right is not None and left.frame_points is not right.frame_points):
+            # Hands from different arrays: gather them into one
+            points = self._points
+            for i, hand in enumerate((left, right)):
+                if hand is not None:
+                    points[i * NUM_LANDMARKS:(i + 1) * NUM_LANDMARKS] = hand.landmarks
+        
+        pairs = points[self._rows]
+        diff = pairs[0] - pairs[1]
+        distances = np.hypot(diff[:, 0], diff[:, 1])
+        if self.normalize:
+            sizes = distances[len(self._pair_slots):]
+            hand_size = (sizes[self._pair_hands[0]] + sizes[self._pair_hands[1]]) * 0.5
+            distances = distances[:len(self._pair_slots)] / np.maximum(hand_size, MIN_HAND_SIZE)
+        
+        for label, hand in (('Left', left), ('Right', right)):
+            if hand is None:
+                distances[self._hand_masks[label]] = np.inf
+        
+        self.fired = self.rules.evaluate(distances, self._frame_hands, self.frame_time, self.drag_active)
+        self._distances = distances.tolist()
+    
+    def _distance(self, hand1: HandData, index1: int, hand2: HandData, index2: int) -> float:
+        if hand1 is None or hand2 is None:
             return float('inf')
-        
-        p1 = left_landmarks[left_index]
-        p2 = right_landmarks[right_index]
-        
-        dx = p1['x'] - p2['x']
-        dy = p1['y'] - p2['y']
-        
-        return np.sqrt(dx**2 + dy**2)
+        slot = self._pair_slots.get((hand1.label, index1, hand2.label, index2))
+        if slot is not None and self._frame_hands.get(hand1.label) is hand1 \
+                and self._frame_hands.get(hand2.label) is hand2:
+            return self._distances[slot]
+        distance = self.calculate_distance_between_hands(hand1, hand2, index1, index2)
+        if self.normalize:
+            distance /= max((self.hand_size(hand1) + self.hand_size(hand2)) * 0.5, MIN_HAND_SIZE)
+        return distance
     
-    def detect_single_click(self, landmarks: List[Dict], threshold: float, max_time: float) -> bool:
-        if self.single_click_cooldown > 0:
-            self.single_click_cooldown -= 1
-            return False
-        
-        distance = self.calculate_distance_2d(landmarks, 4, 8)
-        current_time = time.time()
-        
-        if distance < threshold:
-            if self.single_click_start_time is None:
-                self.single_click_start_time = current_time
-        else:
-            if self.single_click_start_time is not None:
-                hold_duration = current_time - self.single_click_start_time
-                self.single_click_start_time = None
-                
-                if hold_duration < max_time:
-                    self.single_click_cooldown = 15
-                    return True
-            
-            self.single_click_start_time = None
-        
-        return False
+    def hand_size(self, landmarks: HandData) -> float:
+        """Wrist to middle-finger knuckle in pixels, the unit of distances in "hand_size" mode"""
+        return self.calculate_distance_2d(landmarks, *HAND_SIZE_LANDMARKS)
     
-    def detect_double_click(self, landmarks: List[Dict], threshold: float) -> bool:
-        if self.double_click_cooldown > 0:
-            self.double_click_cooldown -= 1
-            return False
-        
-        distance = self.calculate_distance_2d(landmarks, 4, 12)
-        
-        if distance < threshold:
-            self.double_click_cooldown = 20
-            return True
-        
-        return False
+    def get_fingertip_position(self, landmarks: Optional[HandData], finger_index: int) -> Optional[Tuple[float, float]]:
+        if landmarks is None or finger_index >= NUM_LANDMARKS:
+            return None
+        x, y = landmarks.landmarks[finger_index, :2]
+        return (float(x), float(y))
     
-    def detect_copy(self, landmarks: List[Dict], threshold: float) -> bool:
-        if self.copy_cooldown > 0:
-            self.copy_cooldown -= 1
-            return False
-        
-        distance = self.calculate_distance_2d(landmarks, 4, 16)
-        
-        if distance < threshold:
-            self.copy_cooldown = 20
-            return True
-        
-        return False
+    def calculate_distance_2d(self, landmarks: Optional[HandData], index1: int, index2: int) -> float:
+        return self.calculate_distance_between_hands(landmarks, landmarks, index1, index2)
     
-    def detect_paste(self, landmarks: List[Dict], threshold: float) -> bool:
-        if self.paste_cooldown > 0:
-            self.paste_cooldown -= 1
-            return False
-        
-        distance = self.calculate_distance_2d(landmarks, 4, 20)
-        
-        if distance < threshold:
-            self.paste_cooldown = 20
-            return True
+    def calculate_distance_between_hands(self, left_landmarks: Optional[HandData], right_landmarks: Optional[HandData],
+                                         left_index: int, right_index: int) -> float:
+        if left_landmarks is None or right_landmarks is None:
+            return float('inf')
+        if max(left_index, right_index) >= NUM_LANDMARKS:
+            return float('inf')
         
-        return False
+        dx, dy = left_landmarks.landmarks[left_index, :2] - right_landmarks.landmarks[right_index, :2]
+        return float(np.hypot(dx, dy))
     
-    def detect_scroll_gesture(self, landmarks: List[Dict], up_threshold: float, down_threshold: float) -> Optional[str]:
-        dist_to_upper = self.calculate_distance_2d(landmarks, 4, 11)
-        dist_to_middle = self.calculate_distance_2d(landmarks, 4, 10)
+    def detect_scroll_gesture(self, landmarks: HandData, up_threshold: float, down_threshold: float) -> Optional[str]:
+        dist_to_upper = self._distance(landmarks, 4, landmarks, 11)
+        dist_to_middle = self._distance(landmarks, 4, landmarks, 10)
         
         current_direction = None
         
@@ -162,64 +243,6 @@ class GestureDetector:
         
         return self.scroll_direction
     
-    def detect_desktop_switch_left(self, landmarks: List[Dict], threshold: float) -> bool:
-        if self.desktop_switch_left_cooldown > 0:
-            self.desktop_switch_left_cooldown -= 1
-            return False
-        
-        distance = self.calculate_distance_2d(landmarks, 4, 16)
-        
-        if distance < threshold:
-            self.desktop_switch_left_cooldown = 20
-            return True
-        
-        return False
-    
-    def detect_desktop_switch_right(self, landmarks: List[Dict], threshold: float) -> bool:
-        if self.desktop_switch_right_cooldown > 0:
-            self.desktop_switch_right_cooldown -= 1
-            return False
-        
-        distance = self.calculate_distance_2d(landmarks, 4, 20)
-        
-        if distance < threshold:
-            self.desktop_switch_right_cooldown = 20
-            return True
-        
-        return False
-    
-    def detect_drag_start(self, left_landmarks: List[Dict], right_landmarks: List[Dict], threshold: float) -> bool:
-        if self.drag_start_cooldown > 0:
-            self.drag_start_cooldown -= 1
-            return False
-        
-        if self.drag_active:
-            return False
-        
-        distance = self.calculate_distance_between_hands(left_landmarks, right_landmarks, 8, 8)
-        
-        if distance < threshold:
-            self.drag_start_cooldown = 20
-            return True
-        
-        return False
-    
-    def detect_drag_end(self, left_landmarks: List[Dict], right_landmarks: List[Dict], threshold: float) -> bool:
-        if self.drag_end_cooldown > 0:
-            self.drag_end_cooldown -= 1
-            return False
-        
-        if not self.drag_active:
-            return False
-        
-        distance = self.calculate_distance_between_hands(left_landmarks, right_landmarks, 8, 4)
-        
-        if distance < threshold:
-            self.drag_end_cooldown = 20
-            return True
-        
-        return False
-    
     def set_drag_active(self, active: bool):
         self.drag_active = active
     
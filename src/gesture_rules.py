@@ -0,0 +1,143 @@
+"""Declarative pinch gestures and their vectorized per-frame evaluation"""
+
+import itertools
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from landmarks import HandData, HAND_LABELS
+
+
+class GestureRule(NamedTuple):
+    """
+    A discrete gesture fired by bringing two landmarks closer than
+    ``threshold`` pixels. All timing is in milliseconds, so it does not
+    depend on the frame rate.
+
+    hold_ms      the pair must stay closed this long before the gesture fires
+    release_ms   if > 0 the gesture is a tap: it fires when the pair opens
+                 again within release_ms of closing, instead of on close
+    cooldown_ms  minimum time between two firings
+    drag         only evaluate while drag mode is on (True) / off (False)
+    """
+    name: str
+    hand1: str
+    index1: int
+    hand2: str
+    index2: int
+    threshold: float
+    hold_ms: float = 0.0
+    release_ms: float = 0.0
+    cooldown_ms: float = 0.0
+    drag: Optional[bool] = None
+
+
+# Landmarks whose distance measures a hand's size in the "hand_size" distance
+# mode: wrist to middle-finger MCP, which barely changes with hand pose
+HAND_SIZE_LANDMARKS = (0, 9)
+
+# Smallest hand size divided by, in pixels; guards against degenerate landmarks
+MIN_HAND_SIZE = 1.0
+
+
+def threshold_scale(config, frame_width: Optional[int] = None) -> float:
+    """
+    Factor from configured thresholds to the distances they are compared
+    with. Thresholds are tuned as pixels of a THRESHOLD_REFERENCE_WIDTH
+    frame; in "hand_size" mode distances are in hand sizes, and the
+    thresholds are divided by the hand size they were tuned for instead.
+    """
+    if config.GESTURE_DISTANCE_MODE == "hand_size":
+        return 1.0 / config.REFERENCE_HAND_SIZE
+    width = config.CAMERA_WIDTH if frame_width is None else frame_width
+    return width / config.THRESHOLD_REFERENCE_WIDTH
+
+
+def default_rules(config) -> Tuple[GestureRule, ...]:
+    """The built-in gestures, with thresholds and timing from the config module"""
+    rules = (
+        GestureRule('single_click', 'Left', 4, 'Left', 8, config.SINGLE_CLICK_THRESHOLD,
+                    release_ms=config.SINGLE_CLICK_MAX_TIME * 1000, cooldown_ms=config.SINGLE_CLICK_COOLDOWN_MS),
+        GestureRule('double_click', 'Left', 4, 'Left', 12, config.DOUBLE_CLICK_THRESHOLD,
+                    cooldown_ms=config.DOUBLE_CLICK_COOLDOWN_MS),
+        GestureRule('copy', 'Left', 4, 'Left', 16, config.COPY_THRESHOLD,
+                    cooldown_ms=config.COPY_PASTE_COOLDOWN_MS),
+        GestureRule('paste', 'Left', 4, 'Left', 20, config.PASTE_THRESHOLD,
+                    cooldown_ms=config.COPY_PASTE_COOLDOWN_MS),
+        GestureRule('desktop_left', 'Right', 4, 'Right', 16, config.DESKTOP_SWITCH_THRESHOLD,
+                    cooldown_ms=config.DESKTOP_SWITCH_COOLDOWN_MS),
+        GestureRule('desktop_right', 'Right', 4, 'Right', 20, config.DESKTOP_SWITCH_THRESHOLD,
+                    cooldown_ms=config.DESKTOP_SWITCH_COOLDOWN_MS),
+        GestureRule('drag_start', 'Left', 8, 'Right', 8, config.DRAG_START_THRESHOLD,
+                    cooldown_ms=config.DRAG_COOLDOWN_MS, drag=False),
+        GestureRule('drag_end', 'Left', 8, 'Right', 4, config.DRAG_END_THRESHOLD,
+                    cooldown_ms=config.DRAG_COOLDOWN_MS, drag=True),
+    )
+    scale = threshold_scale(config)
+    return tuple(rule._replace(threshold=rule.threshold * scale) for rule in rules)
+
+
+class RuleEvaluator:
+    """
+    Rules compiled into parallel arrays. evaluate() checks every rule for a
+    frame with a fixed number of array operations, so adding rules costs
+    almost nothing per frame.
+    """
+
+    def __init__(self, rules: Sequence[GestureRule], pair_slots: Dict[tuple, int]):
+        self.rules = tuple(rules)
+        self.names = [rule.name for rule in self.rules]
+        self.slots = np.array([pair_slots[(r.hand1, r.index1, r.hand2, r.index2)] for r in self.rules], dtype=np.intp)
+        self.thresholds = np.array([r.threshold for r in self.rules])
+        self.hold = np.array([r.hold_ms / 1000 for r in self.rules])
+        self.release = np.array([r.release_ms / 1000 for r in self.rules])
+        self.cooldown = np.array([r.cooldown_ms / 1000 for r in self.rules])
+        self.is_tap = self.release > 0
+
+        # Which rules may change state, for every combination of drag mode
+        # and per-hand usability (present and not predicted)
+        self._valid = {}
+        for drag_active in (False, True):
+            for usable in itertools.product((False, True), repeat=len(HAND_LABELS)):
+                self._valid[(drag_active,) + usable] = np.array([
+                    (r.drag is None or r.drag == drag_active)
+                    and usable[HAND_LABELS.index(r.hand1)] and usable[HAND_LABELS.index(r.hand2)]
+                    for r in self.rules
+                ], dtype=bool)
+        self.reset()
+
+    def reset(self):
+        count = len(self.rules)
+        self.press_start = np.full(count, np.nan)
+        self.last_fired = np.full(count, -np.inf)
+        self._pressed = False
+
+    def evaluate(self, distances: np.ndarray, hands: Dict[str, Optional[HandData]],
+                 timestamp: float, drag_active: bool) -> List[str]:
+        """Names of the rules that fire on this frame, in rule order"""
+        below = distances[self.slots] < self.thresholds
+        if not self._pressed and not below.any():
+            # Nothing closed now or before: no rule can change state
+            return []
+
+        # Rules whose hands are missing or only predicted keep their state untouched
+        key = (drag_active,) + tuple(
+            hands.get(label) is not None and not hands[label].predicted for label in HAND_LABELS
+        )
+        valid = self._valid[key]
+
+        closed = valid & below
+        opened = valid & ~below
+
+        np.copyto(self.press_start, timestamp, where=closed & np.isnan(self.press_start))
+        held = timestamp - self.press_start
+        ready = timestamp - self.last_fired >= self.cooldown
+        # NaN hold times (pair not closed) compare False
+        fired = ready & np.where(self.is_tap, opened & (held < self.release), closed & (held >= self.hold))
+
+        self.press_start[opened] = np.nan
+        self._pressed = not np.isnan(self.press_start).all()
+        self.last_fired[fired] = timestamp
+        if not fired.any():
+            return []
+        return [self.names[i] for i in np.flatnonzero(fired)]
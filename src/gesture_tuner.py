@@ -0,0 +1,358 @@
+"""Offline tuning of gesture thresholds and cooldowns against labeled landmark recordings"""
+
+import argparse
+import csv
+import os
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config_profile import apply_profile, save_profile
+from gesture_rules import GestureRule, HAND_SIZE_LANDMARKS, MIN_HAND_SIZE, default_rules, threshold_scale
+from landmarks import HAND_LABELS
+from recorder import PRESENT_OBSERVED, Recording
+import config
+
+
+# Config names holding each rule's threshold and cooldown. Rules that share
+# a name (the copy/paste cooldown, both desktop switches, both drag rules)
+# are tuned together, and so are both drag rules because each one only
+# fires in the drag state the other leaves behind.
+TUNED_SETTINGS = {
+    'single_click': ('SINGLE_CLICK_THRESHOLD', 'SINGLE_CLICK_COOLDOWN_MS'),
+    'double_click': ('DOUBLE_CLICK_THRESHOLD', 'DOUBLE_CLICK_COOLDOWN_MS'),
+    'copy': ('COPY_THRESHOLD', 'COPY_PASTE_COOLDOWN_MS'),
+    'paste': ('PASTE_THRESHOLD', 'COPY_PASTE_COOLDOWN_MS'),
+    'desktop_left': ('DESKTOP_SWITCH_THRESHOLD', 'DESKTOP_SWITCH_COOLDOWN_MS'),
+    'desktop_right': ('DESKTOP_SWITCH_THRESHOLD', 'DESKTOP_SWITCH_COOLDOWN_MS'),
+    'drag_start': ('DRAG_START_THRESHOLD', 'DRAG_COOLDOWN_MS'),
+    'drag_end': ('DRAG_END_THRESHOLD', 'DRAG_COOLDOWN_MS'),
+}
+
+# Default grids: (start, stop, step), thresholds in THRESHOLD_REFERENCE_WIDTH pixels
+DEFAULT_THRESHOLDS = (20.0, 80.0, 2.0)
+DEFAULT_COOLDOWNS_MS = (200.0, 1200.0, 50.0)
+# A firing counts as correct within this many seconds of a label for its gesture
+DEFAULT_TOLERANCE = 0.3
+
+
+class Session(NamedTuple):
+    """One recording prepared for simulation"""
+    times: np.ndarray                   # Recorded frame timestamps
+    threshold_scale: float              # Config threshold -> distance units, as threshold_scale() does live
+    distances: Dict[str, np.ndarray]    # Rule name -> per-frame pair distance (inf without the hand)
+    usable: Dict[str, np.ndarray]       # Rule name -> both hands observed (not missing or predicted)
+    labels: Dict[str, np.ndarray]       # Gesture name -> sorted label times on the same clock
+
+
+class Counts(NamedTuple):
+    """Per-configuration outcome for one gesture, summed over sessions"""
+    correct: np.ndarray     # Firings within tolerance of a label
+    fired: np.ndarray       # All firings
+    found: np.ndarray       # Labels with at least one firing within tolerance
+    labels: int
+
+    def __add__(self, other: 'Counts') -> 'Counts':
+        return Counts(self.correct + other.correct, self.fired + other.fired,
+                      self.found + other.found, self.labels + other.labels)
+
+    def precision(self) -> np.ndarray:
+        return np.divide(self.correct, self.fired, out=np.zeros(len(self.fired)), where=self.fired > 0)
+
+    def recall(self) -> np.ndarray:
+        return self.found / self.labels if self.labels else np.zeros(len(self.found))
+
+    def f1(self) -> np.ndarray:
+        precision, recall = self.precision(), self.recall()
+        total = precision + recall
+        return np.divide(2 * precision * recall, total, out=np.zeros(len(total)), where=total > 0)
+
+
+def labels_path_for(recording_path: str) -> str:
+    return os.path.splitext(recording_path)[0] + ".labels.csv"
+
+
+def load_labels(path: str) -> Dict[str, np.ndarray]:
+    """
+    Read a labels file: CSV rows of ``time,gesture`` with the time in
+    seconds since the first recorded frame and a rule name such as
+    ``copy``. A header row and lines starting with '#' are skipped.
+    """
+    labels: Dict[str, List[float]] = {}
+    with open(path, newline='') as f:
+        for row in csv.reader(f):
+            if not row or row[0].lstrip().startswith('#'):
+                continue
+            try:
+                time_s = float(row[0])
+            except ValueError:
+                # Header
+                continue
+            gesture = row[1].strip()
+            if gesture not in TUNED_SETTINGS:
+                raise ValueError(f"{path}: unknown gesture '{gesture}'")
+            labels.setdefault(gesture, []).append(time_s)
+    return {gesture: np.sort(np.array(times)) for gesture, times in labels.items()}
+
+
+def load_session(recording_path: str, labels: Dict[str, np.ndarray], rules: Sequence[GestureRule]) -> Session:
+    recording = Recording(recording_path)
+    if not len(recording):
+        raise ValueError(f"Empty recording: {recording_path}")
+    timestamps = np.asarray(recording.timestamps, dtype=np.float64)
+    present = np.asarray(recording.records['present'])
+    landmarks = recording.records['landmarks']
+    sizes = None
+    if config.GESTURE_DISTANCE_MODE == "hand_size":
+        wrist, knuckle = HAND_SIZE_LANDMARKS
+        diff = landmarks[:, :, wrist, :2] - landmarks[:, :, knuckle, :2]
+        sizes = np.hypot(diff[..., 0], diff[..., 1])
+
+    distances, usable = {}, {}
+    for rule in rules:
+        hand1, hand2 = HAND_LABELS.index(rule.hand1), HAND_LABELS.index(rule.hand2)
+        # Same float32 arithmetic as GestureDetector.update
+        diff = landmarks[:, hand1, rule.index1, :2] - landmarks[:, hand2, rule.index2, :2]
+        distance = np.hypot(diff[:, 0], diff[:, 1])
+        if sizes is not None:
+            distance /= np.maximum((sizes[:, hand1] + sizes[:, hand2]) * 0.5, MIN_HAND_SIZE)
+        distance[(present[:, hand1] == 0) | (present[:, hand2] == 0)] = np.inf
+        distances[rule.name] = distance
+        usable[rule.name] = (present[:, hand1] == PRESENT_OBSERVED) & (present[:, hand2] == PRESENT_OBSERVED)
+
+    # Labels count from the first frame; the simulation keeps the recorded clock so
+    # hold and cooldown comparisons round exactly as they did live
+    labels = {gesture: times + timestamps[0] for gesture, times in labels.items()}
+    return Session(timestamps, threshold_scale(config, recording.frame_width), distances, usable, labels)
+
+
+def simulate(session: Session, rules: Sequence[GestureRule], thresholds: np.ndarray,
+             cooldowns: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Run RuleEvaluator's state machine for many configurations at once.
+
+    ``thresholds`` and ``cooldowns`` have one row per rule and one column
+    per configuration, in distance units (see threshold_scale) and seconds. Frames are visited once
+    and every step updates all configurations with array operations; frames
+    where no configuration has a pair closed or pressed are skipped. Drag
+    state is tracked per configuration for the drag rules.
+
+    Returns, per rule, the indices of frames where it fired in some
+    configuration and a (frames, configurations) boolean array of which.
+    """
+    rule_count, config_count = thresholds.shape
+    distances = np.stack([session.distances[rule.name] for rule in rules])
+    usable = np.stack([session.usable[rule.name] for rule in rules])
+    hold = np.array([rule.hold_ms / 1000 for rule in rules])[:, None]
+    release = np.array([rule.release_ms / 1000 for rule in rules])[:, None]
+    is_tap = release > 0
+    needs_drag = np.array([rule.drag is True for rule in rules])[:, None]
+    needs_no_drag = np.array([rule.drag is False for rule in rules])[:, None]
+    gated = needs_drag.any() or needs_no_drag.any()
+    starts = [i for i, rule in enumerate(rules) if rule.name == 'drag_start']
+    ends = [i for i, rule in enumerate(rules) if rule.name == 'drag_end']
+
+    press_start = np.full((rule_count, config_count), np.nan)
+    last_fired = np.full((rule_count, config_count), -np.inf)
+    drag_active = np.zeros(config_count, dtype=bool)
+    closed_somewhere = (distances < thresholds.max(axis=1)[:, None]).any(axis=0)
+    pressed = False
+    events: List[List[Tuple[int, np.ndarray]]] = [[] for _ in rules]
+
+    for frame in range(len(session.times)):
+        if not pressed and not closed_somewhere[frame]:
+            continue
+        now = session.times[frame]
+        below = distances[:, frame, None] < thresholds
+        valid = np.broadcast_to(usable[:, frame, None], below.shape)
+        if gated:
+            valid = valid & ~(needs_drag & ~drag_active) & ~(needs_no_drag & drag_active)
+
+        closed = valid & below
+        opened = valid & ~below
+        np.copyto(press_start, now, where=closed & np.isnan(press_start))
+        held = now - press_start
+        ready = now - last_fired >= cooldowns
+        fired = ready & np.where(is_tap, opened & (held < release), closed & (held >= hold))
+
+        press_start[opened] = np.nan
+        pressed = not np.isnan(press_start).all()
+        if not fired.any():
+            continue
+        last_fired[fired] = now
+        for i in np.flatnonzero(fired.any(axis=1)):
+            events[i].append((frame, fired[i].copy()))
+        for i in starts:
+            drag_active |= fired[i]
+        for i in ends:
+            drag_active &= ~fired[i]
+
+    result = []
+    for rule_events in events:
+        if rule_events:
+            frames, fired = zip(*rule_events)
+            result.append((np.array(frames), np.stack(fired)))
+        else:
+            result.append((np.zeros(0, dtype=np.intp), np.zeros((0, config_count), dtype=bool)))
+    return result
+
+
+def score(times: np.ndarray, frames: np.ndarray, fired: np.ndarray, labels: np.ndarray,
+          tolerance: float) -> Counts:
+    """Match one rule's firings (from simulate) against its label times, for every configuration"""
+    config_count = fired.shape[1]
+    fired_count = fired.sum(axis=0)
+    if not len(labels):
+        zeros = np.zeros(config_count, dtype=np.int64)
+        return Counts(zeros, fired_count, zeros, 0)
+
+    event_times = times[frames]
+    # Distance from each firing to the nearest label on either side
+    after = np.searchsorted(labels, event_times)
+    before = labels[np.maximum(after - 1, 0)]
+    after = labels[np.minimum(after, len(labels) - 1)]
+    nearest = np.minimum(np.abs(event_times - before), np.abs(after - event_times))
+    correct = fired[nearest <= tolerance].sum(axis=0)
+
+    # A label is found when any firing falls in its window: differences of a running count
+    running = np.vstack([np.zeros((1, config_count), dtype=np.int64), np.cumsum(fired, axis=0)])
+    low = np.searchsorted(event_times, labels - tolerance, side='left')
+    high = np.searchsorted(event_times, labels + tolerance, side='right')
+    found = (running[high] - running[low] > 0).sum(axis=0)
+    return Counts(correct, fired_count, found, len(labels))
+
+
+def grid(start: float, stop: float, step: float) -> np.ndarray:
+    return np.round(np.arange(start, stop + step / 2, step), 6)
+
+
+def tune_group(sessions: Sequence[Session], rules: Sequence[GestureRule], threshold_values: np.ndarray,
+               cooldown_values_ms: np.ndarray, tolerance: float) -> Dict[str, object]:
+    """
+    Search every combination of the group's threshold settings and its
+    cooldown setting. Settings that only affect unlabeled gestures keep
+    their current value. The winner maximizes the summed F1 of the labeled
+    gestures; ties go to the combination closest to the current settings.
+    """
+    labeled = {rule.name for rule in rules if any(rule.name in session.labels for session in sessions)}
+    threshold_names = sorted({TUNED_SETTINGS[rule.name][0] for rule in rules})
+    cooldown_name = TUNED_SETTINGS[rules[0].name][1]
+    current = {name: float(getattr(config, name)) for name in threshold_names + [cooldown_name]}
+
+    axes = []
+    for name in threshold_names:
+        tuned = any(TUNED_SETTINGS[rule][0] == name for rule in labeled)
+        axes.append(threshold_values if tuned else np.array([current[name]]))
+    axes.append(cooldown_values_ms)
+    # Every combination, plus the current settings as the last column
+    columns = [axis.ravel() for axis in np.meshgrid(*axes, indexing='ij')]
+    columns = [np.append(column, current[name]) for column, name in zip(columns, threshold_names + [cooldown_name])]
+    values = dict(zip(threshold_names + [cooldown_name], columns))
+
+    counts: Dict[str, Optional[Counts]] = {rule.name: None for rule in rules}
+    for session in sessions:
+        thresholds = np.stack([values[TUNED_SETTINGS[rule.name][0]] * session.threshold_scale for rule in rules])
+        cooldowns = np.broadcast_to(values[cooldown_name] / 1000, thresholds.shape)
+        for rule, (frames, fired) in zip(rules, simulate(session, rules, thresholds, cooldowns)):
+            labels = session.labels.get(rule.name, np.zeros(0))
+            rule_counts = score(session.times, frames, fired, labels, tolerance)
+            counts[rule.name] = rule_counts if counts[rule.name] is None else counts[rule.name] + rule_counts
+
+    objective = sum(counts[name].f1() for name in labeled)
+    candidates = np.flatnonzero(objective >= objective.max() - 1e-9)
+    # Distance from the current settings in grid steps
+    steps = {name: threshold_values[1] - threshold_values[0] if len(threshold_values) > 1 else 1.0
+             for name in threshold_names}
+    steps[cooldown_name] = cooldown_values_ms[1] - cooldown_values_ms[0] if len(cooldown_values_ms) > 1 else 1.0
+    distance = sum(np.abs(values[name][candidates] - current[name]) / steps[name] for name in values)
+    best = candidates[np.argmin(distance)]
+
+    return {
+        'settings': {name: float(values[name][best]) for name in values},
+        'combinations': len(objective) - 1,
+        'gestures': {
+            rule.name: {
+                'labels': counts[rule.name].labels,
+                'current': _quality(counts[rule.name], -1),
+                'tuned': _quality(counts[rule.name], best),
+            }
+            for rule in rules if rule.name in labeled
+        },
+    }
+
+
+def _quality(counts: Counts, column: int) -> Dict[str, float]:
+    return {
+        'precision': float(counts.precision()[column]),
+        'recall': float(counts.recall()[column]),
+        'f1': float(counts.f1()[column]),
+        'fired': int(counts.fired[column]),
+    }
+
+
+def tune(sessions: Sequence[Session], threshold_values: np.ndarray, cooldown_values_ms: np.ndarray,
+         tolerance: float = DEFAULT_TOLERANCE) -> Dict[str, Dict[str, object]]:
+    """tune_group for every cooldown setting with at least one labeled gesture, keyed by that setting"""
+    rules = [rule for rule in default_rules(config) if rule.name in TUNED_SETTINGS]
+    groups: Dict[str, List[GestureRule]] = {}
+    for rule in rules:
+        groups.setdefault(TUNED_SETTINGS[rule.name][1], []).append(rule)
+
+    results = {}
+    for cooldown_name, group in groups.items():
+        if any(rule.name in session.labels for rule in group for session in sessions):
+            results[cooldown_name] = tune_group(sessions, group, threshold_values, cooldown_values_ms, tolerance)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune gesture thresholds and cooldowns on labeled recordings")
+    parser.add_argument('recordings', nargs='+', help="Files written with RECORD_SESSION_PATH")
+    parser.add_argument('--labels', nargs='+',
+                        help="Labels file per recording (default: <recording>.labels.csv next to it)")
+    parser.add_argument('--thresholds', nargs=3, type=float, default=DEFAULT_THRESHOLDS,
+                        metavar=('START', 'STOP', 'STEP'), help="Threshold grid in reference-width pixels")
+    parser.add_argument('--cooldowns', nargs=3, type=float, default=DEFAULT_COOLDOWNS_MS,
+                        metavar=('START', 'STOP', 'STEP'), help="Cooldown grid in ms")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Seconds between a firing and its label that still count as a match")
+    parser.add_argument('--output', default=config.PROFILE_PATH or "profile.json", help="Profile file to write")
+    parser.add_argument('--dry-run', action='store_true', help="Only report, do not write the profile")
+    args = parser.parse_args()
+
+    label_paths = args.labels or [labels_path_for(path) for path in args.recordings]
+    if len(label_paths) != len(args.recordings):
+        parser.error("--labels needs one file per recording")
+
+    if os.path.exists(args.output):
+        # Compare against the settings the application runs with
+        apply_profile(args.output, config)
+    rules = default_rules(config)
+    sessions = [load_session(path, load_labels(labels), rules) for path, labels in zip(args.recordings, label_paths)]
+    results = tune(sessions, grid(*args.thresholds), grid(*args.cooldowns), args.tolerance)
+    if not results:
+        print("No labels for any tunable gesture")
+        return
+
+    settings = {}
+    for group in results.values():
+        settings.update(group['settings'])
+        print(f"{group['combinations']} combinations of " + ", ".join(group['settings']))
+        for name, quality in group['gestures'].items():
+            before, after = quality['current'], quality['tuned']
+            print(f"  {name:<14} {quality['labels']:4d} labels   "
+                  f"precision {before['precision']:5.1%} -> {after['precision']:5.1%}   "
+                  f"recall {before['recall']:5.1%} -> {after['recall']:5.1%}")
+    print("Tuned settings: " + ", ".join(f"{name}={value:g}" for name, value in settings.items()))
+
+    if not args.dry_run:
+        save_profile(args.output, settings, 'tuner', {
+            'recordings': args.recordings,
+            'tolerance_s': args.tolerance,
+            'results': results,
+        })
+        print(f"Saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,49 +2,293 @@
 
 import mediapipe as mp
 import cv2
-from typing import Optional, List, Dict
+import time
+from typing import Optional, Dict, Tuple
 import numpy as np
 
+from landmarks import HandData, HAND_LABELS, allocate_frame_hands
+from landmark_predictor import ConstantVelocityPredictor
+
 
 class HandTracker:
-    def __init__(self, max_hands: int, min_detection_confidence: float, min_tracking_confidence: float):
+    def __init__(self, max_hands: int, min_detection_confidence: float, min_tracking_confidence: float,
+                 buffer_count: int = 8, metrics=None, roi: bool = False, roi_margin: float = 0.25,
+                 roi_max_side: int = 0, roi_full_frame_interval: int = 30, roi_max_area: float = 0.6,
+                 inference_interval: int = 1, adaptive_inference: bool = False,
+                 motion_threshold: float = 600.0, mirror_landmarks: bool = False,
+                 model_complexity: int = 1):
         self.mp_hands = mp.solutions.hands
         self.hands = self.mp_hands.Hands(
             max_num_hands=max_hands,
+            model_complexity=model_complexity,
             min_detection_confidence=min_detection_confidence,
             min_tracking_confidence=min_tracking_confidence
         )
         self.mp_draw = mp.solutions.drawing_utils
+        self.metrics = metrics
+
+        # Landmark storage is preallocated and recycled round-robin. A result
+        # stays valid for buffer_count frames, which covers every frame that
+        # can be in flight in the threaded pipeline.
+        self._hand_slots = allocate_frame_hands(buffer_count)
+        self._flat_slots = [
+            {label: hand.landmarks.reshape(-1) for label, hand in slots.items()}
+            for slots in self._hand_slots
+        ]
+        self._next_buffer = 0
+        self._frame_size = (0, 0)
+        self._scale = np.ones(3, dtype=np.float32)
+        self._offset = np.zeros(3, dtype=np.float32)
+        
+        # Frames arrive unflipped: mirror x when converting to pixels and
+        # swap the handedness labels, which MediaPipe reports assuming a
+        # mirrored (selfie) image
+        self.mirror_landmarks = mirror_landmarks
+        self._labels = {'Left': 'Right', 'Right': 'Left'} if mirror_landmarks else {'Left': 'Left', 'Right': 'Right'}
+        
+        # Destination buffers for color conversion and crop resizing, reused
+        # while the image size stays the same
+        self._image_buffers = {}
+        
+        # Region-of-interest mode: run the model on a crop around the hands
+        # found in the previous frame instead of the whole frame
+        self.max_hands = max_hands
+        self.roi_enabled = roi
+        self.roi_margin = roi_margin
+        self.roi_max_side = roi_max_side
+        self.roi_full_frame_interval = roi_full_frame_interval
+        self.roi_max_area = roi_max_area
+        self._roi = None
+        self._roi_frames = 0
+        
+        # Inference decimation: run the model every inference_interval frames
+        # (or on every frame while hands move faster than motion_threshold
+        # pixels/s) and predict landmarks in between
+        self.inference_interval = max(1, inference_interval)
+        self.adaptive_inference = adaptive_inference
+        self.motion_threshold = motion_threshold
+        self.predictor = None
+        if self.inference_interval > 1:
+            self.predictor = ConstantVelocityPredictor()
+        self._frames_since_inference = 0
+    
+    def warm_up(self, frame_shape: tuple, frames: int = 1):
+        """
+        Run the model on blank frames so the first camera frame does not pay
+        for graph initialization, and size the conversion buffer for frame_shape
+        """
+        if frames <= 0:
+            return
+        rgb_frame = self._image_buffer('rgb', frame_shape, np.uint8)
+        rgb_frame[:] = 0
+        for _ in range(frames):
+            # No hands on a blank frame, so no tracking state carries over
+            self.hands.process(rgb_frame)
+    
+    def track(self, frame: np.ndarray, timestamp: float):
+        """
+        Landmarks for one frame. Returns (results, hands_data); results is
+        None on frames where the landmarks were predicted instead of inferred.
+        """
+        if self._should_infer():
+            results = self.process_frame(frame)
+            hands_data = self.extract_hands_data(results, frame.shape)
+            self._frames_since_inference = 0
+            if self.predictor is not None:
+                self.predictor.observe(hands_data, timestamp)
+            return results, hands_data
+        
+        self._frames_since_inference += 1
+        return None, self._predict_hands_data(timestamp)
+    
+    def _should_infer(self) -> bool:
+        if self.predictor is None or not self.predictor.has_hands():
+            return True
+        if self._frames_since_inference + 1 >= self.inference_interval:
+            return True
+        return self.adaptive_inference and self.predictor.speed() > self.motion_threshold
+    
+    def _predict_hands_data(self, timestamp: float) -> Dict[str, Optional[HandData]]:
+        slots = self._hand_slots[self._next_buffer]
+        self._next_buffer = (self._next_buffer + 1) % len(self._hand_slots)
+        
+        hands_data = {'Left': None, 'Right': None}
+        for label in HAND_LABELS:
+            if self.predictor.predict(slots[label], timestamp):
+                hands_data[label] = slots[label]
+        
+        if self.metrics is not None:
+            self.metrics.increment('tracker.predicted_frames')
+        return hands_data
     
     def process_frame(self, frame: np.ndarray) -> Optional[object]:
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        return self.hands.process(rgb_frame)
+        start = time.perf_counter() if self.metrics is not None else 0.0
+        
+        roi = self._select_roi() if self.roi_enabled else None
+        image = frame if roi is None else self._crop(frame, roi)
+        rgb_frame = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self._image_buffer('rgb', image.shape, image.dtype))
+        converted = time.perf_counter() if self.metrics is not None else 0.0
+        
+        results = self.hands.process(rgb_frame)
+        if self.roi_enabled:
+            if roi is not None:
+                self._map_to_frame(results, roi, frame.shape)
+            self._track_roi(results, frame.shape)
+        
+        if self.metrics is not None:
+            self.metrics.observe('tracker.preprocess', converted - start, end=converted)
+            self.metrics.observe('tracker.inference', time.perf_counter() - converted)
+            if roi is None and self.roi_enabled:
+                self.metrics.increment('tracker.full_frame_searches')
+        return results
+    
+    def _image_buffer(self, name: str, shape: tuple, dtype) -> np.ndarray:
+        buffer = self._image_buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._image_buffers[name] = buffer
+        return buffer
+    
+    def _select_roi(self) -> Optional[Tuple[int, int, int, int]]:
+        if self._roi is None:
+            return None
+        # While fewer hands than max_hands are tracked, periodically look at
+        # the whole frame so a hand entering outside the crop is found
+        if self._roi_frames >= self.roi_full_frame_interval:
+            self._roi_frames = 0
+            return None
+        self._roi_frames += 1
+        return self._roi
     
-    def extract_hands_data(self, results: object, frame_shape: tuple) -> Dict[str, List]:
-        hands_data = {'Left': [], 'Right': []}
+    def _crop(self, frame: np.ndarray, roi: Tuple[int, int, int, int]) -> np.ndarray:
+        x0, y0, x1, y1 = roi
+        crop = frame[y0:y1, x0:x1]
+        longest = max(x1 - x0, y1 - y0)
+        if self.roi_max_side and longest > self.roi_max_side:
+            scale = self.roi_max_side / longest
+            size = (round((x1 - x0) * scale), round((y1 - y0) * scale))
+            resized = self._image_buffer('roi', (size[1], size[0]) + crop.shape[2:], crop.dtype)
+            crop = cv2.resize(crop, size, dst=resized, interpolation=cv2.INTER_LINEAR)
+        return crop
+    
+    def _map_to_frame(self, results: object, roi: Tuple[int, int, int, int], frame_shape: tuple):
+        """Convert landmarks normalized to the crop into landmarks normalized to the full frame"""
+        if not results.multi_hand_landmarks:
+            return
+        
+        h, w = frame_shape[:2]
+        x0, y0, x1, y1 = roi
+        scale_x = (x1 - x0) / w
+        scale_y = (y1 - y0) / h
+        offset_x = x0 / w
+        offset_y = y0 / h
+        
+        for hand_landmarks in results.multi_hand_landmarks:
+            for lm in hand_landmarks.landmark:
+                lm.x = offset_x + lm.x * scale_x
+                lm.y = offset_y + lm.y * scale_y
+                # z shares the scale of x
+                lm.z = lm.z * scale_x
+    
+    def _track_roi(self, results: object, frame_shape: tuple):
+        """Choose the crop for the next frame from this frame's hands"""
+        if not results.multi_hand_landmarks:
+            # Tracking lost: search the full frame next time
+            self._roi = None
+            return
+        
+        if len(results.multi_hand_landmarks) >= self.max_hands:
+            self._roi_frames = 0
+        
+        h, w = frame_shape[:2]
+        xs = [lm.x for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        ys = [lm.y for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        left, right = min(xs) * w, max(xs) * w
+        top, bottom = min(ys) * h, max(ys) * h
+        
+        # Keep the current crop while the hands stay well inside it: a
+        # stable crop lets MediaPipe keep tracking instead of re-detecting
+        # At least 5% of the frame so small or distant hands still have room to move
+        margin = max(self.roi_margin * max(right - left, bottom - top), 0.05 * min(w, h))
+        if self._roi is not None:
+            x0, y0, x1, y1 = self._roi
+            inner = margin / 2
+            if left - inner >= x0 and right + inner <= x1 and top - inner >= y0 and bottom + inner <= y1:
+                return
+        
+        x0 = max(0, int(left - margin))
+        y0 = max(0, int(top - margin))
+        x1 = min(w, int(right + margin) + 1)
+        y1 = min(h, int(bottom + margin) + 1)
+        
+        if (x1 - x0) * (y1 - y0) > self.roi_max_area * w * h:
+            # Cropping would barely save anything
+            self._roi = None
+            return
+        
+        if self._roi is None:
+            self._roi_frames = 0
+        self._roi = (x0, y0, x1, y1)
+    
+    def extract_hands_data(self, results: object, frame_shape: tuple) -> Dict[str, Optional[HandData]]:
+        if self.metrics is None:
+            return self._extract_hands_data(results, frame_shape)
+        
+        start = time.perf_counter()
+        hands_data = self._extract_hands_data(results, frame_shape)
+        self.metrics.observe('tracker.extract', time.perf_counter() - start)
+        return hands_data
+    
+    def _extract_hands_data(self, results: object, frame_shape: tuple) -> Dict[str, Optional[HandData]]:
+        hands_data = {'Left': None, 'Right': None}
         
         if not results.multi_hand_landmarks:
             return hands_data
         
-        h, w, _ = frame_shape
+        h, w = frame_shape[:2]
+        if self._frame_size != (w, h):
+            self._frame_size = (w, h)
+            if self.mirror_landmarks:
+                # x -> w - x * w
+                self._scale = np.array([-w, h, 1.0], dtype=np.float32)
+                self._offset = np.array([w, 0.0, 0.0], dtype=np.float32)
+            else:
+                self._scale = np.array([w, h, 1.0], dtype=np.float32)
+        slots = self._hand_slots[self._next_buffer]
+        flat_slots = self._flat_slots[self._next_buffer]
+        self._next_buffer = (self._next_buffer + 1) % len(self._hand_slots)
         
+        hand = None
         for hand_landmarks, hand_info in zip(results.multi_hand_landmarks, results.multi_handedness):
-            label = hand_info.classification[0].label
-            landmarks = []
+            classification = hand_info.classification[0]
+            label = self._labels[classification.label]
+            hand = slots[label]
             
+            values = []
+            extend = values.extend
             for lm in hand_landmarks.landmark:
-                landmarks.append({
-                    'x': lm.x * w,
-                    'y': lm.y * h,
-                    'z': lm.z
-                })
+                extend((lm.x, lm.y, lm.z))
+            flat_slots[label][:] = values
+            hand.score = classification.score
+            hand.predicted = False
             
-            hands_data[label] = landmarks
+            hands_data[label] = hand
+        
+        # Both hands share one array, so pixel scaling is a single operation
+        if hands_data['Left'] is not None and hands_data['Right'] is not None:
+            points = hand.frame_points
+        else:
+            points = hand.landmarks
+        points *= self._scale
+        if self.mirror_landmarks:
+            points += self._offset
         
         return hands_data
     
     def draw_landmarks(self, frame: np.ndarray, results: object):
-        if results.multi_hand_landmarks:
+        # Draws in the coordinates of the frame as tracked, i.e. before any
+        # mirroring of the preview
+        if results is not None and results.multi_hand_landmarks:
             for hand_landmarks in results.multi_hand_landmarks:
                 self.mp_draw.draw_landmarks(
                     frame,
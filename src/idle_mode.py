@@ -0,0 +1,195 @@
+"""Idle power mode: cheap presence checks instead of full tracking while no hands are in view"""
+
+import time
+from typing import Dict, Optional
+
+import cv2
+import numpy as np
+
+from landmarks import HandData
+
+
+ACTIVE = "active"
+IDLE = "idle"
+
+# Motion test while idle: thumbnail width and the per-channel change that counts
+THUMBNAIL_WIDTH = 64
+MOTION_LEVEL = 30
+
+
+class IdleTracker:
+    """
+    Wraps a hand tracker with the same track() contract and switches
+    between two states:
+
+    active  every frame goes through the full tracker. After ``timeout``
+            seconds (frame time) without any hand, switch to idle.
+    idle    only ``check_fps`` frames per second are looked at, downscaled
+            to ``check_width`` pixels wide, by ``presence_tracker``, a
+            light tracker (e.g. the lite model looking for one hand) that
+            is loaded up front so going idle never waits for a model.
+            Every other frame only gets a motion test on a tiny thumbnail:
+            when more than ``motion_fraction`` of it changed, that frame is
+            checked too, so a hand moving into view is found on the frame
+            it appears. The frame on which a hand is found goes straight
+            through the full tracker, so tracking resumes on that same
+            frame.
+
+    With metrics, it reports idle.entered / idle.wakeups counters, the
+    idle.wake_latency histogram (capture of the frame with the hand to
+    its full tracking result) and CPU gauges per state. CPU is only
+    accounted with metrics, and a worker process (TRACKER_PROCESS) is only
+    asked for its CPU time once it reports its model loaded.
+    """
+
+    def __init__(self, tracker, presence_tracker, timeout: float = 10.0,
+                 check_fps: float = 5.0, check_width: int = 320, motion_fraction: float = 0.01,
+                 metrics=None):
+        self.tracker = tracker
+        self.presence_tracker = presence_tracker
+        self.timeout = timeout
+        self.check_interval = 1.0 / check_fps if check_fps > 0 else 0.0
+        self.check_width = check_width
+        self.motion_fraction = motion_fraction
+        self.metrics = metrics
+
+        self.state = ACTIVE
+        self._last_hands_time = None
+        self._next_check = 0.0
+        self._small = None
+        self._thumbnails = None
+        self._thumbnail_diff = None
+        self._no_hands = {'Left': None, 'Right': None}
+
+        # CPU seconds and wall seconds spent per state, settled at state
+        # changes and about once a second (with metrics only)
+        self.cpu_seconds = {ACTIVE: 0.0, IDLE: 0.0}
+        self.wall_seconds = {ACTIVE: 0.0, IDLE: 0.0}
+        self._sample_cpu = None
+        self._sample_wall = time.perf_counter()
+
+    def _cpu_time(self) -> Optional[float]:
+        """This process's CPU time plus the tracker worker's, or None while the worker is not ready"""
+        # A tracker worker process (TRACKER_PROCESS) does the heavy lifting elsewhere
+        worker_cpu = 0.0
+        if hasattr(self.tracker, 'worker_cpu_time'):
+            # Asking a loading worker would wait for its model (and its CPU is model loading anyway)
+            if not getattr(self.tracker, 'ready', True):
+                return None
+            worker_cpu = self.tracker.worker_cpu_time()
+        return time.process_time() + worker_cpu
+
+    def _settle_cpu(self):
+        """Add the CPU and wall time since the last sample to the current state; needs metrics"""
+        cpu, wall = self._cpu_time(), time.perf_counter()
+        # With the worker not ready yet, cpu is None: start over once it is, without its loading time
+        if cpu is not None and self._sample_cpu is not None:
+            # A restarted worker starts counting from zero again
+            self.cpu_seconds[self.state] += max(0.0, cpu - self._sample_cpu)
+            self.wall_seconds[self.state] += wall - self._sample_wall
+        self._sample_cpu, self._sample_wall = cpu, wall
+
+        rates = {state: self.cpu_usage(state) for state in (ACTIVE, IDLE)}
+        self.metrics.set_gauge('idle.cpu_active_percent', rates[ACTIVE] * 100)
+        self.metrics.set_gauge('idle.cpu_idle_percent', rates[IDLE] * 100)
+        self.metrics.set_gauge('idle.cpu_saved_seconds', self.cpu_saved())
+        self.metrics.set_gauge('idle.idle', 1.0 if self.state == IDLE else 0.0)
+
+    def cpu_usage(self, state: str) -> float:
+        """CPU seconds per wall second while in ``state`` (1.0 = one core)"""
+        wall = self.wall_seconds[state]
+        return self.cpu_seconds[state] / wall if wall > 0 else 0.0
+
+    def cpu_saved(self) -> float:
+        """Estimated CPU seconds idle mode saved compared with tracking at the active rate"""
+        return max(0.0, (self.cpu_usage(ACTIVE) - self.cpu_usage(IDLE)) * self.wall_seconds[IDLE])
+
+    def _set_state(self, state: str):
+        if self.metrics is not None:
+            self._settle_cpu()
+        self.state = state
+
+    def track(self, frame: np.ndarray, timestamp: float):
+        if self.metrics is not None and self._sample_cpu is None:
+            # Start accounting with the first frame, not while the model was loading
+            self._sample_cpu, self._sample_wall = self._cpu_time(), time.perf_counter()
+        if self.state == IDLE:
+            return self._track_idle(frame, timestamp)
+
+        results, hands_data = self.tracker.track(frame, timestamp)
+        self._after_active_frame(hands_data, timestamp)
+        return results, hands_data
+
+    def _after_active_frame(self, hands_data: Dict[str, Optional[HandData]], timestamp: float):
+        if hands_data['Left'] is not None or hands_data['Right'] is not None or self._last_hands_time is None:
+            self._last_hands_time = timestamp
+        elif timestamp - self._last_hands_time >= self.timeout:
+            self._set_state(IDLE)
+            self._next_check = timestamp
+            if self.metrics is not None:
+                self.metrics.increment('idle.entered')
+            return
+
+        if self.metrics is not None and time.perf_counter() - self._sample_wall >= 1.0:
+            self._settle_cpu()
+
+    def _moved(self, frame: np.ndarray) -> bool:
+        """Whether the frame differs from the previous one in more than motion_fraction of a thumbnail"""
+        if self.motion_fraction <= 0:
+            return False
+        height, width = frame.shape[:2]
+        size = (THUMBNAIL_WIDTH, max(1, round(height * THUMBNAIL_WIDTH / width)))
+        if self._thumbnails is None or self._thumbnails[0].shape[:2] != (size[1], size[0]):
+            shape = (size[1], size[0]) + frame.shape[2:]
+            self._thumbnails = [np.zeros(shape, dtype=frame.dtype), np.zeros(shape, dtype=frame.dtype)]
+            self._thumbnail_diff = np.zeros(shape, dtype=frame.dtype)
+        previous, current = self._thumbnails
+        # Nearest-neighbour sampling: a few microseconds even for full-HD frames
+        cv2.resize(frame, size, dst=current, interpolation=cv2.INTER_NEAREST)
+        cv2.absdiff(current, previous, dst=self._thumbnail_diff)
+        self._thumbnails.reverse()
+        changed = np.count_nonzero(self._thumbnail_diff > MOTION_LEVEL)
+        return changed > self.motion_fraction * self._thumbnail_diff.size
+
+    def _track_idle(self, frame: np.ndarray, timestamp: float):
+        moved = self._moved(frame)
+        if timestamp < self._next_check and not moved:
+            return None, self._no_hands
+        self._next_check = timestamp + self.check_interval
+        if self.metrics is not None:
+            self.metrics.increment('idle.motion_checks' if moved else 'idle.presence_checks')
+            if time.perf_counter() - self._sample_wall >= 1.0:
+                self._settle_cpu()
+
+        if not self._hand_present(frame, timestamp):
+            return None, self._no_hands
+
+        # Wake up: this very frame gets full tracking
+        self._set_state(ACTIVE)
+        self._thumbnails = None
+        self._last_hands_time = timestamp
+        results, hands_data = self.tracker.track(frame, timestamp)
+        if self.metrics is not None:
+            self.metrics.increment('idle.wakeups')
+            self.metrics.observe('idle.wake_latency', max(0.0, time.perf_counter() - timestamp), trace=False)
+        return results, hands_data
+
+    def _hand_present(self, frame: np.ndarray, timestamp: float) -> bool:
+        height, width = frame.shape[:2]
+        if width > self.check_width:
+            size = (self.check_width, max(1, round(height * self.check_width / width)))
+            if self._small is None or self._small.shape[:2] != (size[1], size[0]):
+                self._small = np.empty((size[1], size[0]) + frame.shape[2:], dtype=frame.dtype)
+            frame = cv2.resize(frame, size, dst=self._small, interpolation=cv2.INTER_AREA)
+
+        _, hands_data = self.presence_tracker.track(frame, timestamp)
+        return hands_data['Left'] is not None or hands_data['Right'] is not None
+
+    def draw_landmarks(self, frame: np.ndarray, results: object):
+        self.tracker.draw_landmarks(frame, results)
+
+    def close(self):
+        if self.metrics is not None and self._sample_cpu is not None:
+            self._settle_cpu()
+        self.presence_tracker.close()
+        self.tracker.close()
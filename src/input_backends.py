@@ -0,0 +1,215 @@
+"""Input-injection backends used by MouseController"""
+
+from collections import Counter
+from typing import List, Tuple
+
+# pyautogui and python-xlib are imported when a backend needs them: they
+# take a noticeable share of startup time and headless runs never use them
+pyautogui = None
+X = XK = xdisplay = xtest = None
+
+
+def _import_pyautogui():
+    global pyautogui
+    if pyautogui is None:
+        try:
+            import pyautogui as module
+        except Exception:
+            # pyautogui needs a display; headless runs (replay, CI) use NullMouseController
+            raise RuntimeError("pyautogui is not available; choose another INPUT_BACKEND or use NullMouseController")
+        pyautogui = module
+
+
+def _import_xlib():
+    global X, XK, xdisplay, xtest
+    if xdisplay is None:
+        try:
+            from Xlib import X, XK, display as xdisplay
+            from Xlib.ext import xtest
+        except ImportError:
+            # python-xlib ships with pyautogui on Linux; other platforms use pyautogui
+            raise RuntimeError("python-xlib is not installed; the xtest backend needs it")
+
+
+class PyAutoGuiBackend:
+    """Portable backend; pyautogui validates arguments and checks the failsafe on every call"""
+
+    def __init__(self):
+        _import_pyautogui()
+        pyautogui.FAILSAFE = False
+        pyautogui.PAUSE = 0
+
+    def size(self) -> Tuple[int, int]:
+        width, height = pyautogui.size()
+        return width, height
+
+    def move_to(self, x: int, y: int):
+        pyautogui.moveTo(x, y, _pause=False)
+
+    def click(self):
+        pyautogui.click(_pause=False)
+
+    def double_click(self):
+        pyautogui.doubleClick(_pause=False)
+
+    def scroll(self, amount: int):
+        pyautogui.scroll(amount, _pause=False)
+
+    def mouse_down(self):
+        pyautogui.mouseDown(_pause=False)
+
+    def mouse_up(self):
+        pyautogui.mouseUp(_pause=False)
+
+    def hotkey(self, *keys: str):
+        pyautogui.hotkey(*keys, _pause=False)
+
+    def close(self):
+        pass
+
+
+# pyautogui key names -> X keysym names
+_X_KEY_NAMES = {
+    'ctrl': 'Control_L',
+    'win': 'Super_L',
+    'alt': 'Alt_L',
+    'shift': 'Shift_L',
+    'left': 'Left',
+    'right': 'Right',
+    'up': 'Up',
+    'down': 'Down',
+}
+
+_X_BUTTON_LEFT = 1
+_X_SCROLL_UP = 4
+_X_SCROLL_DOWN = 5
+
+
+class XTestBackend:
+    """
+    Direct X11 injection through the XTEST extension. One display
+    connection is opened up front and reused; events are flushed without
+    waiting for a server round trip.
+    """
+
+    def __init__(self, display_name: str = None):
+        _import_xlib()
+        self.display = xdisplay.Display(display_name)
+        if not self.display.has_extension('XTEST'):
+            self.display.close()
+            raise RuntimeError("The X server does not support the XTEST extension")
+        self._keycodes = {}
+
+    def size(self) -> Tuple[int, int]:
+        screen = self.display.screen()
+        return screen.width_in_pixels, screen.height_in_pixels
+
+    def move_to(self, x: int, y: int):
+        xtest.fake_input(self.display, X.MotionNotify, x=x, y=y)
+        self.display.flush()
+
+    def _press_button(self, button: int, times: int = 1):
+        for _ in range(times):
+            xtest.fake_input(self.display, X.ButtonPress, button)
+            xtest.fake_input(self.display, X.ButtonRelease, button)
+        self.display.flush()
+
+    def click(self):
+        self._press_button(_X_BUTTON_LEFT)
+
+    def double_click(self):
+        self._press_button(_X_BUTTON_LEFT, 2)
+
+    def scroll(self, amount: int):
+        # Like pyautogui on X11: one wheel click per unit
+        self._press_button(_X_SCROLL_UP if amount > 0 else _X_SCROLL_DOWN, abs(amount))
+
+    def mouse_down(self):
+        xtest.fake_input(self.display, X.ButtonPress, _X_BUTTON_LEFT)
+        self.display.flush()
+
+    def mouse_up(self):
+        xtest.fake_input(self.display, X.ButtonRelease, _X_BUTTON_LEFT)
+        self.display.flush()
+
+    def _keycode(self, key: str) -> int:
+        keycode = self._keycodes.get(key)
+        if keycode is None:
+            keysym = XK.string_to_keysym(_X_KEY_NAMES.get(key, key))
+            keycode = self._keycodes[key] = self.display.keysym_to_keycode(keysym)
+            if not keycode:
+                raise ValueError(f"No keycode for key: {key}")
+        return keycode
+
+    def hotkey(self, *keys: str):
+        keycodes = [self._keycode(key) for key in keys]
+        for keycode in keycodes:
+            xtest.fake_input(self.display, X.KeyPress, keycode)
+        for keycode in reversed(keycodes):
+            xtest.fake_input(self.display, X.KeyRelease, keycode)
+        self.display.flush()
+
+    def close(self):
+        self.display.close()
+
+
+class RecordingBackend:
+    """Keeps every call in memory instead of touching the OS; for tests and benchmarks"""
+
+    def __init__(self, screen_size: Tuple[int, int] = (1920, 1080)):
+        self.screen_size = screen_size
+        self.calls: List[tuple] = []
+        self.counts = Counter()
+        self.position = (0, 0)
+        self.button_down = False
+
+    def _record(self, name: str, *args):
+        self.calls.append((name,) + args)
+        self.counts[name] += 1
+
+    def size(self) -> Tuple[int, int]:
+        return self.screen_size
+
+    def move_to(self, x: int, y: int):
+        self.position = (x, y)
+        self._record('move_to', x, y)
+
+    def click(self):
+        self._record('click')
+
+    def double_click(self):
+        self._record('double_click')
+
+    def scroll(self, amount: int):
+        self._record('scroll', amount)
+
+    def mouse_down(self):
+        self.button_down = True
+        self._record('mouse_down')
+
+    def mouse_up(self):
+        self.button_down = False
+        self._record('mouse_up')
+
+    def hotkey(self, *keys: str):
+        self._record('hotkey', *keys)
+
+    def clear(self):
+        self.calls.clear()
+        self.counts.clear()
+
+    def close(self):
+        pass
+
+
+BACKENDS = ("pyautogui", "xtest", "recording")
+
+
+def create_backend(name: str):
+    if name == "pyautogui":
+        return PyAutoGuiBackend()
+    if name == "xtest":
+        return XTestBackend()
+    if name == "recording":
+        return RecordingBackend()
+    raise ValueError(f"Unknown input backend: {name} (expected one of {', '.join(BACKENDS)})")
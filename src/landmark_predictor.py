@@ -0,0 +1,63 @@
+"""Constant-velocity landmark prediction for frames skipped by the hand model"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from landmarks import HandData, HAND_LABELS, NUM_LANDMARKS
+
+
+class ConstantVelocityPredictor:
+    """
+    Keeps the last observed landmarks and a smoothed per-landmark velocity
+    for each hand, and extrapolates them to the time of a skipped frame.
+    """
+
+    def __init__(self, velocity_smoothing: float = 0.5):
+        self.velocity_smoothing = velocity_smoothing
+        self.positions = {label: np.zeros((NUM_LANDMARKS, 3), dtype=np.float32) for label in HAND_LABELS}
+        self.velocities = {label: np.zeros((NUM_LANDMARKS, 3), dtype=np.float32) for label in HAND_LABELS}
+        self.times = {label: None for label in HAND_LABELS}
+        self.scores = {label: 0.0 for label in HAND_LABELS}
+
+    def observe(self, hands_data: Dict[str, Optional[HandData]], timestamp: float):
+        for label in HAND_LABELS:
+            hand = hands_data.get(label)
+            if hand is None:
+                # Never extrapolate a hand the model no longer sees
+                self.times[label] = None
+                continue
+
+            last_time = self.times[label]
+            if last_time is not None and timestamp > last_time:
+                velocity = (hand.landmarks - self.positions[label]) / (timestamp - last_time)
+                self.velocities[label] += self.velocity_smoothing * (velocity - self.velocities[label])
+            else:
+                self.velocities[label].fill(0.0)
+
+            self.positions[label][:] = hand.landmarks
+            self.times[label] = timestamp
+            self.scores[label] = hand.score
+
+    def has_hands(self) -> bool:
+        return any(t is not None for t in self.times.values())
+
+    def speed(self) -> float:
+        """Largest mean landmark speed over the tracked hands, in landmark units per second"""
+        speeds = [
+            float(np.hypot(self.velocities[label][:, 0], self.velocities[label][:, 1]).mean())
+            for label in HAND_LABELS if self.times[label] is not None
+        ]
+        return max(speeds, default=0.0)
+
+    def predict(self, hand: HandData, timestamp: float) -> bool:
+        """Write the extrapolated landmarks for hand.label into hand; False if the hand is not tracked"""
+        last_time = self.times[hand.label]
+        if last_time is None:
+            return False
+
+        np.multiply(self.velocities[hand.label], timestamp - last_time, out=hand.landmarks)
+        hand.landmarks += self.positions[hand.label]
+        hand.score = self.scores[hand.label]
+        hand.predicted = True
+        return True
@@ -0,0 +1,45 @@
+"""Array-backed hand landmark representation"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+NUM_LANDMARKS = 21
+HAND_LABELS = ('Left', 'Right')
+
+
+class HandData:
+    """
+    One detected hand: (21, 3) float32 landmarks (x, y in pixels, z as
+    reported), handedness label and score.
+
+    When both hands of a frame are stored together, ``frame_points`` is the
+    shared (42, 3) array with Left rows first and ``landmarks`` is a view
+    into it, which lets per-frame math address both hands at once.
+
+    ``predicted`` marks landmarks extrapolated by a motion model on frames
+    where the hand model did not run.
+    """
+
+    __slots__ = ('landmarks', 'label', 'score', 'frame_points', 'predicted')
+
+    def __init__(self, landmarks: np.ndarray, label: str, score: float = 0.0,
+                 frame_points: Optional[np.ndarray] = None, predicted: bool = False):
+        self.landmarks = landmarks
+        self.label = label
+        self.score = score
+        self.frame_points = frame_points
+        self.predicted = predicted
+
+
+def allocate_frame_hands(count: int) -> List[Dict[str, HandData]]:
+    """Preallocate ``count`` frames of Left/Right HandData sharing one array per frame"""
+    points = np.zeros((count, len(HAND_LABELS) * NUM_LANDMARKS, 3), dtype=np.float32)
+    frames = []
+    for b in range(count):
+        frames.append({
+            label: HandData(points[b, i * NUM_LANDMARKS:(i + 1) * NUM_LANDMARKS], label, frame_points=points[b])
+            for i, label in enumerate(HAND_LABELS)
+        })
+    return frames
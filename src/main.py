@@ -1,9 +1,19 @@
 """Main application entry point"""
 
+import time
+
+# Reference point for the startup time report
+STARTED_AT = time.perf_counter()
+
 import sys
 import os
+import signal
+import multiprocessing
+import threading
+from concurrent.futures import Future
 import cv2
-import time
+import numpy as np
+from typing import TYPE_CHECKING, Callable, Optional
 
 # Fix imports for PyInstaller
 if getattr(sys, 'frozen', False):
@@ -14,39 +24,29 @@ else:
     # Running as script
     application_path = os.path.dirname(os.path.abspath(__file__))
 
+# hand_tracker (MediaPipe) and tracker_process are imported by
+# create_hand_tracker, off the main thread or not at all. Modules that only
+# some modes use are imported where that mode is set up.
 from camera import Camera
-from hand_tracker import HandTracker
 from gesture_detector import GestureDetector
-from mouse_controller import MouseController
+from mouse_controller import MouseController, NullMouseController
+from input_backends import create_backend
+from actions import ActionFeedback, dispatch, handle_gestures
+from cursor_filter import create_filter
+from config_profile import apply_profile
+from metrics import FrameRateCounter, Metrics, MetricsExporter
+from tracing import Tracer
 import config
 
+if TYPE_CHECKING:
+    from network import StreamReceiver, StreamSender
+    from preview import PreviewRenderer
 
-def main():
-    camera = Camera(
-        config.CAMERA_INDEX,
-        config.CAMERA_WIDTH,
-        config.CAMERA_HEIGHT,
-        config.CAMERA_FPS
-    )
-    
-    hand_tracker = HandTracker(
-        config.MAX_NUM_HANDS,
-        config.MIN_DETECTION_CONFIDENCE,
-        config.MIN_TRACKING_CONFIDENCE
-    )
-    
-    gesture_detector = GestureDetector()
-    
-    mouse_controller = MouseController(
-        config.SMOOTHING_FACTOR,
-        config.MOUSE_SPEED_MULTIPLIER,
-        config.SCREEN_PADDING
-    )
-    
-    prev_time = 0
-    action_display_counter = 0
-    action_text = ""
-    
+
+WINDOW_NAME = "AI CV Gesture Mouse Control"
+
+
+def print_help():
     print("Starting AI CV Gesture Mouse Control...")
     print("=== LEFT HAND GESTURES ===")
     print("Thumb + Index (quick): Single Click")
@@ -65,202 +65,566 @@ def main():
     print("Left Index + Right Index: Start Drag (Mouse Down)")
     print("Left Index + Right Thumb: End Drag (Mouse Up)")
     print("")
-    print("Press 'q' to quit")
+    if config.DISPLAY_MODE == "headless":
+        print("Running headless: press Ctrl+C or send SIGTERM to quit")
+    else:
+        print("Press 'q' in the preview window or Ctrl+C to quit")
+
+
+def draw_overlay(frame, results, hand_tracker, gesture_detector, feedback, fps: float):
+    # Draw landmarks
+    if config.SHOW_LANDMARKS:
+        hand_tracker.draw_landmarks(frame, results)
+
+    # Frames are captured unflipped when the landmarks are mirrored instead:
+    # mirror the shown image in place, after the landmarks and before any text
+    if config.MIRROR_LANDMARKS:
+        cv2.flip(frame, 1, dst=frame)
+
+    # Display action feedback
+    if feedback.counter > 0:
+        cv2.putText(
+            frame,
+            feedback.text,
+            (50, 100),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1.2,
+            feedback.color(),
+            3
+        )
+        feedback.counter -= 1
+
+    # Display drag mode status
+    if gesture_detector.is_drag_active():
+        cv2.putText(
+            frame,
+            "DRAG MODE ACTIVE",
+            (50, 150),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.8,
+            (255, 0, 255),
+            2
+        )
+
+    # Display FPS
+    if config.SHOW_FPS:
+        cv2.putText(
+            frame,
+            f"FPS: {int(fps)}",
+            (10, 30),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.7,
+            (0, 255, 0),
+            2
+        )
+
+
+def install_stop_handlers(stop: threading.Event):
+    """Turn Ctrl+C and termination signals into a clean shutdown request"""
+    def request_stop(signum, frame):
+        stop.set()
+
+    for name in ("SIGINT", "SIGTERM", "SIGBREAK"):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), request_stop)
+
+
+def install_trace_handlers(tracer: Tracer) -> Callable[[int], None]:
+    """
+    Dump the trace ring on SIGUSR1 (where available); returns the key
+    handler that does the same for 't' in the preview window
+    """
+    def dump_trace():
+        tracer.dump_in_background(config.TRACE_PATH, config.TRACE_SECONDS)
+
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda signum, frame: dump_trace())
+
+    def on_key(key: int):
+        if key == ord('t'):
+            dump_trace()
+
+    return on_key
+
+
+def create_preview(hand_tracker, gesture_detector,
+                   on_key: Optional[Callable[[int], None]] = None) -> Optional['PreviewRenderer']:
+    if config.DISPLAY_MODE != "preview":
+        return None
+    from preview import PreviewRenderer
+
+    def render(frame, results, feedback, fps):
+        draw_overlay(frame, results, hand_tracker, gesture_detector, feedback, fps)
+
+    return PreviewRenderer(render, WINDOW_NAME, config.PREVIEW_FPS, on_key)
+
+
+def show_frame(frame, results, hand_tracker, gesture_detector, feedback, fps: float,
+               preview: Optional['PreviewRenderer'], on_key: Optional[Callable[[int], None]] = None) -> bool:
+    """Display work for one frame in the configured DISPLAY_MODE; returns False when the user quits"""
+    if config.DISPLAY_MODE == "window":
+        draw_overlay(frame, results, hand_tracker, gesture_detector, feedback, fps)
+        cv2.imshow(WINDOW_NAME, frame)
+        key = cv2.waitKey(1) & 0xFF
+        if on_key is not None and key != 0xFF:
+            on_key(key)
+        return key != ord('q')
+
+    # No overlay on this thread: only expire feedback text at frame rate
+    feedback.tick()
+    if preview is not None:
+        if preview.due():
+            preview.submit(frame, results, feedback.snapshot(), fps)
+        return not preview.stop_requested.is_set()
+    return True
+
+
+def report_first_frame():
+    print(f"First frame processed {time.perf_counter() - STARTED_AT:.2f} s after launch")
+
+
+def run_serial(camera, hand_tracker, gesture_detector, mouse_controller, recorder=None,
+               preview: Optional['PreviewRenderer'] = None, stop: Optional[threading.Event] = None,
+               on_key: Optional[Callable[[int], None]] = None, sender: Optional['StreamSender'] = None):
+    frame_rate = FrameRateCounter()
+    feedback = ActionFeedback()
+    first_frame = True
+
+    while stop is None or not stop.is_set():
+        success, frame = camera.read_frame()
+        if not success:
+            if camera.failed:
+                break
+            # A stalled camera, not a closed one: read again
+            continue
+
+        results, hands_data = hand_tracker.track(frame, camera.frame_timestamp)
+        if recorder is not None:
+            recorder.write(camera.frame_timestamp, hands_data)
+
+        events = handle_gestures(hands_data, gesture_detector, mouse_controller, feedback, camera.frame_timestamp)
+        if sender is not None:
+            sender.send(camera.frame_timestamp, hands_data, events)
+        if first_frame:
+            first_frame = False
+            report_first_frame()
+
+        fps = frame_rate.tick()
+        if not show_frame(frame, results, hand_tracker, gesture_detector, feedback, fps, preview, on_key):
+            break
+
+
+def run_pipelined(camera, hand_tracker, gesture_detector, mouse_controller, recorder=None, metrics=None,
+                  preview: Optional['PreviewRenderer'] = None, stop: Optional[threading.Event] = None,
+                  on_key: Optional[Callable[[int], None]] = None, sender: Optional['StreamSender'] = None):
+    from pipeline import Pipeline, Stage, StopPipeline
+    frame_rate = FrameRateCounter()
+    feedback = ActionFeedback()
+    queue_size = config.PIPELINE_QUEUE_SIZE
+
+    # Camera buffers are recycled as soon as the next frame is read, so
+    # frames in flight live in a pool large enough that no buffer is reused
+    # while a queue or stage still holds it
+    pool_size = 3 * (queue_size + 1) + 2
+    frame_pool = [None] * pool_size
+    frame_count = [0]
+    gesture_count = [0]
+    last_report = [time.time()]
+
+    def capture():
+        success, frame = camera.read_frame()
+        while not success:
+            # Wait out camera stalls; only a closed camera or a stop request ends capture
+            if camera.failed or (stop is not None and stop.is_set()):
+                raise StopPipeline()
+            success, frame = camera.read_frame()
+
+        slot = frame_count[0] % pool_size
+        frame_count[0] += 1
+        if frame_pool[slot] is None or frame_pool[slot].shape != frame.shape:
+            frame_pool[slot] = np.empty_like(frame)
+        np.copyto(frame_pool[slot], frame)
+        return {'frame': frame_pool[slot], 'timestamp': camera.frame_timestamp, 'frame_id': camera.frame_id}
+
+    def inference(item):
+        if metrics is not None:
+            metrics.set_frame(item['frame_id'])
+        item['results'], item['hands_data'] = hand_tracker.track(item['frame'], item['timestamp'])
+        return item
+
+    def gestures(item):
+        if metrics is not None:
+            metrics.set_frame(item['frame_id'])
+        if recorder is not None:
+            recorder.write(item['timestamp'], item['hands_data'])
+        events = handle_gestures(item['hands_data'], gesture_detector, mouse_controller, feedback, item['timestamp'])
+        if sender is not None:
+            sender.send(item['timestamp'], item['hands_data'], events)
+        gesture_count[0] += 1
+        if gesture_count[0] == 1:
+            report_first_frame()
+        if config.DISPLAY_MODE != "window":
+            # Last stage: nothing is rendered on the pipeline
+            display(item)
+        return item
+
+    def display(item):
+        if stop is not None and stop.is_set():
+            raise StopPipeline()
+        if metrics is not None:
+            metrics.set_frame(item['frame_id'])
+
+        now = time.time()
+        if now - last_report[0] >= config.PIPELINE_REPORT_INTERVAL:
+            last_report[0] = now
+            print(pipeline.format_stats())
+
+        fps = frame_rate.tick()
+        if not show_frame(item['frame'], item['results'], hand_tracker, gesture_detector, feedback, fps,
+                          preview, on_key):
+            raise StopPipeline()
+
+    # Stale frames are worthless to inference and preview, but every
+    # inference result must reach the gesture stage so click timing and
+    # cooldowns see a consistent sequence
+    stages = [
+        Stage("inference", inference, queue_size, "drop_oldest"),
+        Stage("gestures", gestures, queue_size, "block"),
+    ]
+    if config.DISPLAY_MODE == "window":
+        stages.append(Stage("preview", display, queue_size, "drop_oldest"))
+    pipeline = Pipeline(capture, stages, metrics)
+    try:
+        pipeline.run()
+    finally:
+        print(pipeline.format_stats())
+
+
+def run_receiver(receiver: 'StreamReceiver', mouse_controller, metrics=None, stop: Optional[threading.Event] = None):
+    """NETWORK_MODE "receive": perform the actions for the landmarks or gesture events a sender streams"""
+    feedback = ActionFeedback()
+    gesture_detector = None
+    frame_size = None
+    last_report = time.time()
+
+    while stop is None or not stop.is_set():
+        # Wake up now and then to notice a stop request
+        packet = receiver.receive(timeout=0.5)
+        if packet is None:
+            continue
+        if metrics is not None:
+            metrics.set_frame(packet.sequence)
+
+        if packet.frame_size != frame_size:
+            # Cursor mapping and gesture thresholds follow the sender's frame size
+            if frame_size is None:
+                print(f"Receiving from a {packet.frame_size[0]}x{packet.frame_size[1]} sender")
+            frame_size = packet.frame_size
+            config.CAMERA_WIDTH, config.CAMERA_HEIGHT = frame_size
+            gesture_detector = GestureDetector(metrics)
+
+        if packet.events is not None:
+            dispatch(packet.events, mouse_controller, feedback, packet.timestamp)
+        else:
+            handle_gestures(packet.hands_data, gesture_detector, mouse_controller, feedback, packet.timestamp)
+        feedback.tick()
+
+        now = time.time()
+        if now - last_report >= config.PIPELINE_REPORT_INTERVAL:
+            last_report = now
+            print(format_receiver_stats(receiver))
+
+
+def format_receiver_stats(receiver: 'StreamReceiver') -> str:
+    return (f"Received {receiver.received} datagrams ({receiver.bytes_received} bytes): "
+            f"{receiver.stale} stale, {receiver.lost} lost")
+
+
+def create_hand_tracker(metrics):
+    """The configured hand tracker, with its model loaded and warmed up on blank frames"""
+    tracker_options = dict(
+        metrics=metrics,
+        roi=config.ROI_ENABLED,
+        roi_margin=config.ROI_MARGIN,
+        roi_max_side=config.ROI_MAX_SIDE,
+        roi_full_frame_interval=config.ROI_FULL_FRAME_INTERVAL,
+        roi_max_area=config.ROI_MAX_AREA,
+        inference_interval=config.INFERENCE_INTERVAL,
+        adaptive_inference=config.ADAPTIVE_INFERENCE,
+        motion_threshold=config.INFERENCE_MOTION_THRESHOLD,
+        mirror_landmarks=config.MIRROR_LANDMARKS,
+        model_complexity=config.MODEL_COMPLEXITY
+    )
+    frame_shape = (config.CAMERA_HEIGHT, config.CAMERA_WIDTH, 3)
+    
+    if config.TRACKER_PROCESS:
+        from tracker_process import ProcessHandTracker
+        # Returns at once; the worker loads and warms up its model on its own
+        return ProcessHandTracker(
+            config.MAX_NUM_HANDS,
+            config.MIN_DETECTION_CONFIDENCE,
+            config.MIN_TRACKING_CONFIDENCE,
+            timeout=config.TRACKER_PROCESS_TIMEOUT,
+            warmup_shape=frame_shape,
+            warmup_frames=config.MODEL_WARMUP_FRAMES,
+            **tracker_options
+        )
+    
+    from hand_tracker import HandTracker
+    hand_tracker = HandTracker(
+        config.MAX_NUM_HANDS,
+        config.MIN_DETECTION_CONFIDENCE,
+        config.MIN_TRACKING_CONFIDENCE,
+        **tracker_options
+    )
+    hand_tracker.warm_up(frame_shape, config.MODEL_WARMUP_FRAMES)
+    return hand_tracker
+
+
+def create_presence_tracker():
+    """Light tracker for idle-mode presence checks: lite model, one hand, no extras"""
+    from hand_tracker import HandTracker
+    return HandTracker(
+        1,
+        config.MIN_DETECTION_CONFIDENCE,
+        config.MIN_TRACKING_CONFIDENCE,
+        buffer_count=2,
+        model_complexity=0
+    )
+
+
+def load_in_background(create: Callable[[], object], name: str) -> Future:
+    """
+    Run create() and return a future holding its result. With
+    CONCURRENT_STARTUP it runs on a background thread, so importing
+    MediaPipe and loading models overlap with opening the camera and the
+    rest of the setup.
+    """
+    future = Future()
+    
+    def load():
+        try:
+            future.set_result(create())
+        except BaseException as error:
+            future.set_exception(error)
+    
+    if config.CONCURRENT_STARTUP:
+        threading.Thread(target=load, name=name, daemon=True).start()
+    else:
+        load()
+    return future
+
+
+def load_hand_trackers(metrics) -> Future:
+    """create_hand_tracker for every camera (one without CAMERAS); the future holds the list"""
+    return load_in_background(
+        lambda: [create_hand_tracker(metrics) for _ in range(max(1, len(config.CAMERAS)))],
+        "model-init"
+    )
+
+
+def load_settings():
+    """Calibrate if CALIBRATION_MODE asks for it, then apply the performance profile"""
+    path = config.PROFILE_PATH
+    if not path:
+        return
+    if config.CALIBRATION_MODE == "always" or (config.CALIBRATION_MODE == "missing" and not os.path.exists(path)):
+        from calibration import run_calibration
+        run_calibration(path, config.CALIBRATION_LATENCY_BUDGET_MS, config.CALIBRATION_FRAMES)
+    if os.path.exists(path):
+        applied = apply_profile(path, config)
+        print(f"Loaded profile {path}: " + ", ".join(f"{name}={value}" for name, value in applied.items()))
+
+
+def create_mouse_controller(metrics):
+    mouse_controller = MouseController(
+        config.SMOOTHING_FACTOR,
+        config.MOUSE_SPEED_MULTIPLIER,
+        config.SCREEN_PADDING,
+        metrics=metrics,
+        cursor_filter=create_filter(config.CURSOR_FILTER, config),
+        backend=create_backend(config.INPUT_BACKEND)
+    )
+    if config.ASYNC_ACTUATION:
+        from actuator import AsyncActuator
+        mouse_controller = AsyncActuator(mouse_controller, metrics)
+    return mouse_controller
+
+
+def start_exporter(metrics) -> Optional[MetricsExporter]:
+    if not (config.METRICS_ENABLED and config.METRICS_EXPORT_PATH):
+        return None
+    exporter = MetricsExporter(
+        metrics,
+        config.METRICS_EXPORT_PATH,
+        config.METRICS_EXPORT_FORMAT,
+        config.METRICS_EXPORT_INTERVAL
+    )
+    exporter.start()
+    return exporter
+
+
+def dump_trace_at_exit(tracer: Tracer):
+    # The whole ring, so a lag that just made the user quit is in it
+    tracer.dump(config.TRACE_PATH)
+    print(f"Trace written to {config.TRACE_PATH}")
+
+
+def receive_main(metrics, tracer: Optional[Tracer]):
+    """NETWORK_MODE "receive": no camera or model, only input injection for a remote tracker"""
+    from network import StreamReceiver
+    mouse_controller = create_mouse_controller(metrics)
+    exporter = start_exporter(metrics)
+    receiver = StreamReceiver(config.NETWORK_HOST, config.NETWORK_PORT, config.NETWORK_MAX_AGE, metrics=metrics)
+    print(f"Waiting for a sender on {receiver.address[0]}:{receiver.address[1]}; press Ctrl+C to quit")
+    
+    stop = threading.Event()
+    install_stop_handlers(stop)
+    if tracer is not None:
+        install_trace_handlers(tracer)
     
     try:
-        while True:
-            success, frame = camera.read_frame()
-            if not success:
-                break
-            
-            results = hand_tracker.process_frame(frame)
-            hands_data = hand_tracker.extract_hands_data(results, frame.shape)
-            
-            # Drag mode detection (highest priority)
-            if hands_data['Left'] and hands_data['Right']:
-                if gesture_detector.detect_drag_start(
-                    hands_data['Left'],
-                    hands_data['Right'],
-                    config.DRAG_START_THRESHOLD
-                ):
-                    mouse_controller.mouse_down()
-                    gesture_detector.set_drag_active(True)
-                    action_display_counter = 20
-                    action_text = "DRAG ON"
-                    print("Drag mode activated!")
-                
-                if gesture_detector.detect_drag_end(
-                    hands_data['Left'],
-                    hands_data['Right'],
-                    config.DRAG_END_THRESHOLD
-                ):
-                    mouse_controller.mouse_up()
-                    gesture_detector.set_drag_active(False)
-                    action_display_counter = 20
-                    action_text = "DRAG OFF"
-                    print("Drag mode deactivated!")
-            
-            # Right hand gestures
-            if hands_data['Right']:
-                # Desktop switching
-                if gesture_detector.detect_desktop_switch_left(
-                    hands_data['Right'],
-                    config.DESKTOP_SWITCH_THRESHOLD
-                ):
-                    mouse_controller.switch_desktop_left()
-                    action_display_counter = 20
-                    action_text = "DESKTOP LEFT"
-                    print("Switch desktop left!")
-                
-                if gesture_detector.detect_desktop_switch_right(
-                    hands_data['Right'],
-                    config.DESKTOP_SWITCH_THRESHOLD
-                ):
-                    mouse_controller.switch_desktop_right()
-                    action_display_counter = 20
-                    action_text = "DESKTOP RIGHT"
-                    print("Switch desktop right!")
-                
-                # Scrolling
-                scroll_direction = gesture_detector.detect_scroll_gesture(
-                    hands_data['Right'],
-                    config.SCROLL_UP_THRESHOLD,
-                    config.SCROLL_DOWN_THRESHOLD
-                )
-                
-                if scroll_direction == "up":
-                    mouse_controller.scroll_up(config.SCROLL_SPEED)
-                    action_display_counter = 5
-                    action_text = "SCROLL UP"
-                elif scroll_direction == "down":
-                    mouse_controller.scroll_down(config.SCROLL_SPEED)
-                    action_display_counter = 5
-                    action_text = "SCROLL DOWN"
-                elif not gesture_detector.detect_desktop_switch_left(hands_data['Right'], config.DESKTOP_SWITCH_THRESHOLD) and \
-                     not gesture_detector.detect_desktop_switch_right(hands_data['Right'], config.DESKTOP_SWITCH_THRESHOLD):
-                    # Cursor movement when not scrolling or switching desktops
-                    index_tip = gesture_detector.get_fingertip_position(hands_data['Right'], 8)
-                    
-                    if index_tip:
-                        screen_x, screen_y = mouse_controller.map_to_screen(
-                            index_tip[0],
-                            index_tip[1],
-                            config.CAMERA_WIDTH,
-                            config.CAMERA_HEIGHT
-                        )
-                        
-                        smooth_x, smooth_y = mouse_controller.smooth_movement(screen_x, screen_y)
-                        mouse_controller.move_mouse(smooth_x, smooth_y)
-            
-            # Left hand gestures
-            if hands_data['Left']:
-                # Single click
-                if gesture_detector.detect_single_click(
-                    hands_data['Left'],
-                    config.SINGLE_CLICK_THRESHOLD,
-                    config.SINGLE_CLICK_MAX_TIME
-                ):
-                    mouse_controller.click()
-                    action_display_counter = 20
-                    action_text = "SINGLE CLICK"
-                    print("Single click!")
-                
-                # Double click
-                if gesture_detector.detect_double_click(
-                    hands_data['Left'],
-                    config.DOUBLE_CLICK_THRESHOLD
-                ):
-                    mouse_controller.double_click()
-                    action_display_counter = 20
-                    action_text = "DOUBLE CLICK"
-                    print("Double click!")
-                
-                # Copy
-                if gesture_detector.detect_copy(
-                    hands_data['Left'],
-                    config.COPY_THRESHOLD
-                ):
-                    mouse_controller.copy()
-                    action_display_counter = 20
-                    action_text = "COPY (Ctrl+C)"
-                    print("Copy!")
-                
-                # Paste
-                if gesture_detector.detect_paste(
-                    hands_data['Left'],
-                    config.PASTE_THRESHOLD
-                ):
-                    mouse_controller.paste()
-                    action_display_counter = 20
-                    action_text = "PASTE (Ctrl+V)"
-                    print("Paste!")
-            
-            # Display action feedback
-            if action_display_counter > 0:
-                color = (0, 255, 0)
-                if "SCROLL" in action_text:
-                    color = (0, 255, 255) if "UP" in action_text else (255, 100, 0)
-                elif "DRAG" in action_text:
-                    color = (255, 0, 255)
-                elif "DESKTOP" in action_text:
-                    color = (255, 165, 0)
-                elif "COPY" in action_text or "PASTE" in action_text:
-                    color = (0, 200, 255)
-                
-                cv2.putText(
-                    frame,
-                    action_text,
-                    (50, 100),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    1.2,
-                    color,
-                    3
-                )
-                action_display_counter -= 1
-            
-            # Display drag mode status
-            if gesture_detector.is_drag_active():
-                cv2.putText(
-                    frame,
-                    "DRAG MODE ACTIVE",
-                    (50, 150),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.8,
-                    (255, 0, 255),
-                    2
-                )
-            
-            # Draw landmarks
-            if config.SHOW_LANDMARKS:
-                hand_tracker.draw_landmarks(frame, results)
-            
-            # Calculate and display FPS
-            if config.SHOW_FPS:
-                curr_time = time.time()
-                fps = 1 / (curr_time - prev_time) if prev_time > 0 else 0
-                prev_time = curr_time
-                
-                cv2.putText(
-                    frame,
-                    f"FPS: {int(fps)}",
-                    (10, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.7,
-                    (0, 255, 0),
-                    2
-                )
-            
-            cv2.imshow("AI CV Gesture Mouse Control", frame)
-            
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                break
+        run_receiver(receiver, mouse_controller, metrics, stop)
+    finally:
+        mouse_controller.close()
+        if exporter is not None:
+            exporter.stop()
+        print(format_receiver_stats(receiver))
+        receiver.close()
+        if tracer is not None:
+            dump_trace_at_exit(tracer)
+        print("Application closed successfully")
+
+
+def main():
+    print_help()
+    load_settings()
+    # Trace spans are recorded through the metrics hooks, so tracing needs a registry too
+    tracer = Tracer(config.TRACE_CAPACITY) if config.TRACE_ENABLED else None
+    metrics = Metrics(tracer) if config.METRICS_ENABLED or tracer is not None else None
+    if config.NETWORK_MODE == "receive":
+        receive_main(metrics, tracer)
+        return
+    
+    hand_trackers_future = load_hand_trackers(metrics)
+    # Loaded now, not when idle mode first needs it on the frame loop
+    presence_tracker_future = None
+    if config.IDLE_ENABLED:
+        presence_tracker_future = load_in_background(create_presence_tracker, "presence-init")
+    buffer_allocator = None
+    if config.TRACKER_PROCESS and not config.CAMERAS:
+        # Needed before the camera so it can capture straight into the
+        # shared-memory ring; creating it does not wait for the model
+        buffer_allocator = hand_trackers_future.result()[0].allocate_frames
+    
+    # With several cameras, Camera reads a mosaic of their views
+    if config.CAMERAS:
+        from multi_camera import create_rig
+        source = create_rig(config)
+    else:
+        from capture_sources import create_source
+        source = create_source(config.CAMERA_SOURCE, config)
+    camera = Camera(
+        config.CAMERA_INDEX,
+        config.CAMERA_WIDTH,
+        config.CAMERA_HEIGHT,
+        config.CAMERA_FPS,
+        threaded=config.CAMERA_THREADED,
+        buffer_count=config.CAMERA_BUFFER_COUNT,
+        metrics=metrics,
+        buffer_allocator=buffer_allocator,
+        mirror=not config.MIRROR_LANDMARKS,
+        source=source
+    )
+    print(f"Capturing from {camera.source.describe()}")
+    if camera.source.width and camera.source.height:
+        # Cursor mapping and recordings use the configured frame size: follow what the source delivers
+        config.CAMERA_WIDTH, config.CAMERA_HEIGHT = camera.source.width, camera.source.height
+    
+    gesture_detector = GestureDetector(metrics)
+    
+    sender = None
+    if config.NETWORK_MODE == "send":
+        from network import StreamSender
+        # Input is injected by the receiver; gestures are still detected here for the overlay and "events"
+        mouse_controller = NullMouseController(config.SMOOTHING_FACTOR, config.MOUSE_SPEED_MULTIPLIER,
+                                               config.SCREEN_PADDING)
+        sender = StreamSender(config.NETWORK_HOST, config.NETWORK_PORT, (config.CAMERA_WIDTH, config.CAMERA_HEIGHT),
+                              config.NETWORK_PAYLOAD, config.NETWORK_QUANTIZE, metrics)
+        print(f"Streaming {config.NETWORK_PAYLOAD} to {config.NETWORK_HOST}:{config.NETWORK_PORT}")
+    else:
+        mouse_controller = create_mouse_controller(metrics)
+    exporter = start_exporter(metrics)
+    
+    recorder = None
+    if config.RECORD_SESSION_PATH:
+        from recorder import SessionRecorder
+        recorder = SessionRecorder(config.RECORD_SESSION_PATH, config.CAMERA_WIDTH, config.CAMERA_HEIGHT)
+        print(f"Recording landmarks to {config.RECORD_SESSION_PATH}")
+    
+    stop = threading.Event()
+    install_stop_handlers(stop)
+    on_key = None
+    if tracer is not None:
+        on_key = install_trace_handlers(tracer)
+        triggers = [] if config.DISPLAY_MODE == "headless" else ["press 't' in the window"]
+        if hasattr(signal, "SIGUSR1"):
+            triggers.append(f"send SIGUSR1 to process {os.getpid()}")
+        print(f"Tracing frames: {' or '.join(triggers + ['quit'])} to write {config.TRACE_PATH}")
+    
+    hand_trackers = hand_trackers_future.result()
+    hand_tracker = hand_trackers[0]
+    if config.CAMERAS:
+        from multi_camera import MultiCameraTracker, camera_transforms
+        hand_tracker = MultiCameraTracker(
+            hand_trackers,
+            camera_transforms(config.CAMERAS, config.CAMERA_WIDTH, config.CAMERA_HEIGHT, config.SCREEN_PADDING),
+            parallel=config.CAMERA_PARALLEL,
+            switch_margin=config.CAMERA_SWITCH_MARGIN,
+            metrics=metrics
+        )
+    if config.IDLE_ENABLED:
+        from idle_mode import IdleTracker
+        hand_tracker = IdleTracker(
+            hand_tracker,
+            presence_tracker_future.result(),
+            timeout=config.IDLE_TIMEOUT,
+            check_fps=config.IDLE_CHECK_FPS,
+            check_width=config.IDLE_CHECK_WIDTH,
+            motion_fraction=config.IDLE_MOTION_FRACTION,
+            metrics=metrics
+        )
+    preview = create_preview(hand_tracker, gesture_detector, on_key)
+    
+    try:
+        if config.PIPELINE_MODE == "threaded":
+            run_pipelined(camera, hand_tracker, gesture_detector, mouse_controller, recorder, metrics, preview, stop,
+                          on_key, sender)
+        else:
+            run_serial(camera, hand_tracker, gesture_detector, mouse_controller, recorder, preview, stop, on_key,
+                       sender)
     
     finally:
+        # With ASYNC_ACTUATION this also flushes queued actions and releases the button if a drag is active
+        mouse_controller.close()
+        if exporter is not None:
+            exporter.stop()
+        if recorder is not None:
+            recorder.close()
+        if sender is not None:
+            sender.close()
+        if preview is not None:
+            preview.close()
         camera.release()
         hand_tracker.close()
-        cv2.destroyAllWindows()
+        if tracer is not None:
+            dump_trace_at_exit(tracer)
+        if config.DISPLAY_MODE == "window":
+            cv2.destroyAllWindows()
         print("Application closed successfully")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Needed by the tracker worker process in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
+    main()
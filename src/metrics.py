@@ -0,0 +1,223 @@
+"""Low-overhead latency histograms, counters and periodic export"""
+
+import bisect
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+
+def _bucket_bounds() -> List[float]:
+    # Log-spaced upper bounds from 10 us to ~30 s, about 5% apart
+    bounds = []
+    bound = 10e-6
+    while bound < 30.0:
+        bounds.append(bound)
+        bound *= 1.05
+    return bounds
+
+
+BUCKET_BOUNDS = _bucket_bounds()
+
+
+class Histogram:
+    """Fixed-size histogram of durations in seconds; percentiles are accurate to one bucket (~5%)"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = math.ceil(q * self.count)
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.max
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(0.50),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            'max': self.max,
+        }
+
+
+class Metrics:
+    """
+    Registry of named histograms, counters and gauges.
+
+    Components take an optional Metrics instance and skip all bookkeeping
+    when it is None, so disabled instrumentation costs one attribute check.
+    Updates from several threads are not locked; a rare lost increment is
+    an acceptable price for keeping the hot path cheap. Only adding a new
+    name takes a lock, so an export copying the registry never sees a
+    dictionary change size while it iterates.
+
+    With a tracing.Tracer, every observed duration is also recorded as a
+    span ending now (or at ``end``), attributed to the frame set with
+    set_frame() on the calling thread. Observations that are latencies
+    across threads rather than work done here pass ``trace=False``.
+    """
+
+    def __init__(self, tracer=None):
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.gauges: Dict[str, float] = {}
+        self.tracer = tracer
+        self.start_time = time.time()
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float, end: Optional[float] = None, trace: bool = True):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, Histogram())
+        histogram.record(seconds)
+        if self.tracer is not None and trace:
+            if end is None:
+                end = time.perf_counter()
+            self.tracer.add(name, end - seconds, seconds)
+
+    def set_frame(self, frame_id: int):
+        """Attribute the calling thread's following spans to ``frame_id``"""
+        if self.tracer is not None:
+            self.tracer.set_frame(frame_id)
+
+    @property
+    def frame_id(self) -> int:
+        """Frame the calling thread is working on (0 without a tracer)"""
+        return self.tracer.frame_id if self.tracer is not None else 0
+
+    def increment(self, name: str, amount: int = 1):
+        if name not in self.counters:
+            with self._lock:
+                self.counters.setdefault(name, 0)
+        self.counters[name] += amount
+
+    def set_gauge(self, name: str, value: float):
+        if name not in self.gauges:
+            with self._lock:
+                self.gauges.setdefault(name, value)
+        self.gauges[name] = value
+
+    def _sorted_items(self):
+        """Sorted copies of the histogram, counter and gauge items, taken while no name is being added"""
+        with self._lock:
+            items = list(self.histograms.items()), list(self.counters.items()), list(self.gauges.items())
+        return tuple(sorted(entries) for entries in items)
+
+    def snapshot(self) -> Dict[str, object]:
+        histograms, counters, gauges = self._sorted_items()
+        return {
+            'timestamp': time.time(),
+            'uptime': time.time() - self.start_time,
+            'latency_seconds': {name: h.summary() for name, h in histograms},
+            'counters': dict(counters),
+            'gauges': dict(gauges),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        lines = [
+            "# HELP airmouse_latency_seconds Per-stage and end-to-end latency",
+            "# TYPE airmouse_latency_seconds summary",
+        ]
+        histograms, counters, gauges = self._sorted_items()
+        for name, histogram in histograms:
+            summary = histogram.summary()
+            for quantile, key in (('0.5', 'p50'), ('0.95', 'p95'), ('0.99', 'p99')):
+                value = summary[key]
+                lines.append(f'airmouse_latency_seconds{{stage="{name}",quantile="{quantile}"}} {value:.6f}')
+            lines.append(f'airmouse_latency_seconds_sum{{stage="{name}"}} {histogram.total:.6f}')
+            lines.append(f'airmouse_latency_seconds_count{{stage="{name}"}} {histogram.count}')
+
+        lines += [
+            "# HELP airmouse_latency_max_seconds Largest observed latency per stage",
+            "# TYPE airmouse_latency_max_seconds gauge",
+        ]
+        for name, histogram in histograms:
+            lines.append(f'airmouse_latency_max_seconds{{stage="{name}"}} {histogram.max:.6f}')
+
+        lines += [
+            "# HELP airmouse_events_total Dropped frames and emitted actions",
+            "# TYPE airmouse_events_total counter",
+        ]
+        for name, value in counters:
+            lines.append(f'airmouse_events_total{{event="{name}"}} {value}')
+
+        lines += [
+            "# HELP airmouse_gauge Current values such as CPU usage per idle state",
+            "# TYPE airmouse_gauge gauge",
+        ]
+        for name, value in gauges:
+            lines.append(f'airmouse_gauge{{name="{name}"}} {value:.6f}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str, fmt: str = "json"):
+        text = self.to_prometheus() if fmt == "prometheus" else self.to_json()
+        # Write then rename so readers never see a half-written file
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+
+class MetricsExporter:
+    """Background thread that dumps a Metrics registry to a file every interval seconds"""
+
+    def __init__(self, metrics: Metrics, path: str, fmt: str = "json", interval: float = 10.0):
+        self.metrics = metrics
+        self.path = path
+        self.fmt = fmt
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.metrics.dump(self.path, self.fmt)
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        self.metrics.dump(self.path, self.fmt)
+
+
+class FrameRateCounter:
+    """Frame rate averaged over the last ``window`` frames instead of a single frame interval"""
+
+    def __init__(self, window: int = 30):
+        self.times = deque(maxlen=window)
+
+    def tick(self, timestamp: Optional[float] = None) -> float:
+        self.times.append(time.perf_counter() if timestamp is None else timestamp)
+        return self.fps()
+
+    def fps(self) -> float:
+        if len(self.times) < 2 or self.times[-1] <= self.times[0]:
+            return 0.0
+        return (len(self.times) - 1) / (self.times[-1] - self.times[0])
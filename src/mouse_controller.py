@@ -1,24 +1,37 @@
-"""Mouse control using PyAutoGUI"""
+"""Mouse control through a pluggable input backend"""
 
-import pyautogui
 import numpy as np
+import time
+from collections import Counter
 from typing import Optional, Tuple
 
+from cursor_filter import EmaFilter
+from input_backends import PyAutoGuiBackend, RecordingBackend
+
 
 class MouseController:
-    def __init__(self, smoothing: float, speed_multiplier: float, padding: int):
-        pyautogui.FAILSAFE = False
-        pyautogui.PAUSE = 0
+    def __init__(self, smoothing: float, speed_multiplier: float, padding: int,
+                 screen_size: Optional[Tuple[int, int]] = None, metrics=None, cursor_filter=None,
+                 backend=None):
+        # Any object with the methods of input_backends.PyAutoGuiBackend
+        if backend is None:
+            backend = PyAutoGuiBackend()
+        self.backend = backend
         
-        self.screen_width, self.screen_height = pyautogui.size()
+        if screen_size is None:
+            screen_size = backend.size()
+        self.screen_width, self.screen_height = screen_size
         self.smoothing = smoothing
         self.speed_multiplier = speed_multiplier
         self.padding = padding
         
-        self.prev_x = None
-        self.prev_y = None
+        # Any object with filter(x, y, timestamp) and reset(), see cursor_filter.py
+        if cursor_filter is None:
+            cursor_filter = EmaFilter(smoothing * speed_multiplier)
+        self.cursor_filter = cursor_filter
+        self.metrics = metrics
     
-    def map_to_screen(self, x: float, y: float, frame_width: int, frame_height: int) -> Tuple[int, int]:
+    def map_to_screen(self, x: float, y: float, frame_width: int, frame_height: int) -> Tuple[float, float]:
         screen_x = np.interp(
             x,
             [self.padding, frame_width - self.padding],
@@ -30,49 +43,103 @@ class MouseController:
             [0, self.screen_height]
         )
         
-        return int(screen_x), int(screen_y)
+        # Kept as floats: rounding happens once, after filtering
+        return float(screen_x), float(screen_y)
     
-    def smooth_movement(self, x: int, y: int) -> Tuple[int, int]:
-        if self.prev_x is None or self.prev_y is None:
-            self.prev_x, self.prev_y = x, y
-            return x, y
-        
-        smooth_x = int(self.prev_x + (x - self.prev_x) * self.smoothing * self.speed_multiplier)
-        smooth_y = int(self.prev_y + (y - self.prev_y) * self.smoothing * self.speed_multiplier)
-        
-        self.prev_x, self.prev_y = smooth_x, smooth_y
-        
-        return smooth_x, smooth_y
+    def smooth_movement(self, x: float, y: float, timestamp: Optional[float] = None) -> Tuple[int, int]:
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        smooth_x, smooth_y = self.cursor_filter.filter(x, y, timestamp)
+        return round(smooth_x), round(smooth_y)
+    
+    def _perform(self, name: str, func, *args, **kwargs):
+        if self.metrics is None:
+            func(*args, **kwargs)
+            return
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        self.metrics.observe('mouse.' + name, time.perf_counter() - start)
+        self.metrics.increment('actions.' + name)
+    
+    def move_mouse(self, x: int, y: int, frame_timestamp: Optional[float] = None):
+        self._perform('move', self.backend.move_to, x, y)
+        if self.metrics is not None and frame_timestamp is not None:
+            self.metrics.observe('latency.capture_to_cursor', time.perf_counter() - frame_timestamp, trace=False)
+    
+    def click(self):
+        self._perform('click', self.backend.click)
+    
+    def double_click(self):
+        self._perform('double_click', self.backend.double_click)
+    
+    def scroll_up(self, speed: int):
+        self._perform('scroll', self.backend.scroll, speed)
+    
+    def scroll_down(self, speed: int):
+        self._perform('scroll', self.backend.scroll, -speed)
+    
+    def copy(self):
+        self._perform('copy', self.backend.hotkey, 'ctrl', 'c')
+    
+    def paste(self):
+        self._perform('paste', self.backend.hotkey, 'ctrl', 'v')
+    
+    def switch_desktop_left(self):
+        self._perform('desktop_left', self.backend.hotkey, 'ctrl', 'win', 'left')
+    
+    def switch_desktop_right(self):
+        self._perform('desktop_right', self.backend.hotkey, 'ctrl', 'win', 'right')
+    
+    def mouse_down(self):
+        self._perform('mouse_down', self.backend.mouse_down)
+    
+    def mouse_up(self):
+        self._perform('mouse_up', self.backend.mouse_up)
+    
+    def close(self):
+        self.backend.close()
+
+
+class NullMouseController(MouseController):
+    """Computes cursor positions like MouseController but only counts actions instead of performing them"""
+    
+    def __init__(self, smoothing: float, speed_multiplier: float, padding: int,
+                 screen_size: Tuple[int, int] = (1920, 1080), metrics=None, cursor_filter=None):
+        super().__init__(smoothing, speed_multiplier, padding, screen_size, metrics, cursor_filter,
+                         RecordingBackend(screen_size))
+        self.actions = Counter()
+        self.position = None
     
-    def move_mouse(self, x: int, y: int):
-        pyautogui.moveTo(x, y, _pause=False)
+    def move_mouse(self, x: int, y: int, frame_timestamp: Optional[float] = None):
+        self.position = (x, y)
+        self.actions['move'] += 1
     
     def click(self):
-        pyautogui.click(_pause=False)
+        self.actions['click'] += 1
     
     def double_click(self):
-        pyautogui.doubleClick(_pause=False)
+        self.actions['double_click'] += 1
     
     def scroll_up(self, speed: int):
-        pyautogui.scroll(speed, _pause=False)
+        self.actions['scroll_up'] += 1
     
     def scroll_down(self, speed: int):
-        pyautogui.scroll(-speed, _pause=False)
+        self.actions['scroll_down'] += 1
     
     def copy(self):
-        pyautogui.hotkey('ctrl', 'c', _pause=False)
+        self.actions['copy'] += 1
     
     def paste(self):
-        pyautogui.hotkey('ctrl', 'v', _pause=False)
+        self.actions['paste'] += 1
     
     def switch_desktop_left(self):
-        pyautogui.hotkey('ctrl', 'win', 'left', _pause=False)
+        self.actions['desktop_left'] += 1
     
     def switch_desktop_right(self):
-        pyautogui.hotkey('ctrl', 'win', 'right', _pause=False)
+        self.actions['desktop_right'] += 1
     
     def mouse_down(self):
-        pyautogui.mouseDown(_pause=False)
+        self.actions['mouse_down'] += 1
     
     def mouse_up(self):
-        pyautogui.mouseUp(_pause=False)
\ No newline at end of file
+        self.actions['mouse_up'] += 1
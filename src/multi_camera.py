@@ -0,0 +1,256 @@
+"""Several cameras tracked in parallel, with landmarks fused into one screen-calibrated frame"""
+
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from camera import Camera
+from capture_sources import create_source
+from landmarks import HandData, HAND_LABELS, allocate_frame_hands
+
+
+def camera_settings(config, entry: Dict[str, object]):
+    """The config module's settings with one CAMERAS entry applied, for create_source"""
+    settings = types.SimpleNamespace(**{name: getattr(config, name) for name in dir(config) if name.isupper()})
+    for key, name in (('source', 'CAMERA_SOURCE'), ('index', 'CAMERA_INDEX'), ('path', 'CAMERA_SOURCE_PATH')):
+        if key in entry:
+            setattr(settings, name, entry[key])
+    return settings
+
+
+def homography_from_screen_corners(corners: Sequence[Sequence[float]], width: int, height: int,
+                                   padding: float) -> np.ndarray:
+    """
+    Homography from a camera's landmark pixels to the shared frame, given
+    where this camera saw the index fingertip while it pointed at the
+    screen's top-left, top-right, bottom-right and bottom-left corners.
+    Those points land where MouseController maps the screen corners (the
+    frame inset by SCREEN_PADDING), so every camera moves the cursor to
+    the same place for the same fingertip.
+    """
+    target = np.float32([[padding, padding], [width - padding, padding],
+                         [width - padding, height - padding], [padding, height - padding]])
+    return cv2.getPerspectiveTransform(np.float32(corners), target)
+
+
+def camera_transforms(entries: Sequence[Dict[str, object]], width: int, height: int,
+                      padding: float) -> List[np.ndarray]:
+    """Per CAMERAS entry: its "screen_corners", its 3x3 "homography", or the identity"""
+    transforms = []
+    for entry in entries:
+        if 'screen_corners' in entry:
+            transforms.append(homography_from_screen_corners(entry['screen_corners'], width, height, padding))
+        elif 'homography' in entry:
+            transforms.append(np.array(entry['homography'], dtype=np.float64).reshape(3, 3))
+        else:
+            transforms.append(np.eye(3))
+    return transforms
+
+
+class CameraRig:
+    """
+    Several frame sources read as one source: read() returns a mosaic of
+    the views stacked vertically, so each view is a contiguous slice and
+    Camera, the pipeline, recording and the preview handle the mosaic like
+    any frame. Views are resized to the first source's size if they differ.
+
+    threaded  every source captures on its own Camera thread; read() waits
+              for the first source's next frame and takes the newest frame
+              of the others, or repeats their last one if they have none.
+    otherwise sources are read in turn, every frame of each, which suits
+              file sources and benchmarks.
+    """
+
+    def __init__(self, sources: Sequence[object], threaded: bool = True):
+        self.sources = list(sources)
+        self.width = self.sources[0].width
+        self.height = self.sources[0].height
+        self.fps = getattr(self.sources[0], 'fps', 0.0)
+        self.threaded = threaded
+        self._cameras = None
+        self._last: List[Optional[np.ndarray]] = [None] * len(self.sources)
+        if threaded:
+            self._cameras = [
+                Camera(0, source.width, source.height, self.fps, threaded=True, mirror=False, source=source)
+                for source in self.sources
+            ]
+
+    def views(self, mosaic: np.ndarray) -> List[np.ndarray]:
+        height = mosaic.shape[0] // len(self.sources)
+        return [mosaic[i * height:(i + 1) * height] for i in range(len(self.sources))]
+
+    def _read_view(self, index: int) -> Tuple[bool, Optional[np.ndarray]]:
+        if self._cameras is None:
+            return self.sources[index].read()
+        camera = self._cameras[index]
+        # Only the first camera sets the pace; it waits out stalls until it fails
+        success, frame = camera.read_frame(timeout=1.0 if index == 0 else 0.0)
+        while index == 0 and not success and not camera.failed:
+            success, frame = camera.read_frame(timeout=1.0)
+        if success:
+            self._last[index] = frame
+            return True, frame
+        if index == 0 or self._last[index] is None:
+            return False, None
+        # Still valid: a camera keeps its last frame until the next successful read
+        return True, self._last[index]
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        shape = (self.height * len(self.sources), self.width, 3)
+        if image is None or image.shape != shape:
+            image = np.empty(shape, dtype=np.uint8)
+
+        for index, view in enumerate(self.views(image)):
+            success, frame = self._read_view(index)
+            if not success:
+                return False, None
+            if frame.shape == view.shape:
+                np.copyto(view, frame)
+            else:
+                cv2.resize(frame, (self.width, self.height), dst=view, interpolation=cv2.INTER_AREA)
+        return True, image
+
+    def describe(self) -> str:
+        return f"{len(self.sources)} cameras: " + "; ".join(source.describe() for source in self.sources)
+
+    def release(self):
+        if self._cameras is not None:
+            for camera in self._cameras:
+                camera.release()
+        else:
+            for source in self.sources:
+                source.release()
+
+
+def create_rig(config, threaded: bool = True) -> CameraRig:
+    """A CameraRig over one source per CAMERAS entry"""
+    return CameraRig([create_source(settings.CAMERA_SOURCE, settings)
+                      for settings in (camera_settings(config, entry) for entry in config.CAMERAS)], threaded)
+
+
+class MultiCameraTracker:
+    """
+    One hand tracker per view of a CameraRig mosaic, behind the
+    HandTracker.track contract; results is the list of each tracker's
+    results.
+
+    Views are tracked in parallel: the calling thread takes the first one
+    and a thread pool the others. MediaPipe releases the GIL while it
+    runs, and with TRACKER_PROCESS every tracker is a worker process the
+    pool threads only wait on, so the cameras then use a process pool.
+
+    Each camera's landmarks are mapped into the shared frame with its
+    homography (see camera_transforms) and fused per hand: a hand stays
+    with the camera that has it until that camera loses it or another one
+    sees it with a score higher by ``switch_margin``, so the cursor does
+    not jump between two slightly disagreeing views.
+    """
+
+    def __init__(self, trackers: Sequence[object], transforms: Sequence[np.ndarray], parallel: bool = True,
+                 switch_margin: float = 0.1, buffer_count: int = 4, metrics=None):
+        if len(trackers) != len(transforms):
+            raise ValueError("Need one transform per tracker")
+        self.trackers = list(trackers)
+        self.transforms = [np.asarray(transform, dtype=np.float32) for transform in transforms]
+        self._identity = [np.array_equal(transform, np.eye(3)) for transform in self.transforms]
+        self.switch_margin = switch_margin
+        self.metrics = metrics
+
+        self._pool = None
+        if parallel and len(self.trackers) > 1:
+            self._pool = ThreadPoolExecutor(len(self.trackers) - 1, thread_name_prefix="camera-tracker")
+        # Camera each hand is currently taken from
+        self.owners: Dict[str, Optional[int]] = {label: None for label in HAND_LABELS}
+        self._hand_slots = allocate_frame_hands(buffer_count)
+        self._next_buffer = 0
+
+    def views(self, frame: np.ndarray) -> List[np.ndarray]:
+        height = frame.shape[0] // len(self.trackers)
+        return [frame[i * height:(i + 1) * height] for i in range(len(self.trackers))]
+
+    def _track_view(self, index: int, view: np.ndarray, timestamp: float, frame_id: int):
+        if self.metrics is not None:
+            self.metrics.set_frame(frame_id)
+        return self.trackers[index].track(view, timestamp)
+
+    def track(self, frame: np.ndarray, timestamp: float):
+        views = self.views(frame)
+        if self._pool is None:
+            tracked = [tracker.track(view, timestamp) for tracker, view in zip(self.trackers, views)]
+        else:
+            frame_id = self.metrics.frame_id if self.metrics is not None else 0
+            futures = [self._pool.submit(self._track_view, i, views[i], timestamp, frame_id)
+                       for i in range(1, len(views))]
+            tracked = [self.trackers[0].track(views[0], timestamp)] + [future.result() for future in futures]
+
+        if self.metrics is None:
+            return [results for results, _ in tracked], self._fuse([hands for _, hands in tracked])
+
+        start = time.perf_counter()
+        hands_data = self._fuse([hands for _, hands in tracked])
+        self.metrics.observe('tracker.fuse', time.perf_counter() - start)
+        return [results for results, _ in tracked], hands_data
+
+    def _fuse(self, camera_hands: List[Dict[str, Optional[HandData]]]) -> Dict[str, Optional[HandData]]:
+        slots = self._hand_slots[self._next_buffer]
+        self._next_buffer = (self._next_buffer + 1) % len(self._hand_slots)
+
+        hands_data = {'Left': None, 'Right': None}
+        for label in HAND_LABELS:
+            seen = [(index, hands[label]) for index, hands in enumerate(camera_hands) if hands.get(label) is not None]
+            if not seen:
+                self.owners[label] = None
+                continue
+
+            owner = self.owners[label]
+            current = next((hand for index, hand in seen if index == owner), None)
+            best_index, best = max(seen, key=lambda item: item[1].score)
+            if current is None or best.score > current.score + self.switch_margin:
+                if owner is not None and self.metrics is not None:
+                    self.metrics.increment('tracker.camera_switches')
+                owner, current = best_index, best
+                self.owners[label] = owner
+
+            hand = slots[label]
+            self._to_shared(current.landmarks, owner, hand.landmarks)
+            hand.score = current.score
+            hand.predicted = current.predicted
+            hands_data[label] = hand
+        return hands_data
+
+    def _to_shared(self, points: np.ndarray, camera: int, out: np.ndarray):
+        if self._identity[camera]:
+            np.copyto(out, points)
+            return
+        transform = self.transforms[camera]
+        xy = points[:, :2]
+        scale = xy @ transform[2, :2] + transform[2, 2]
+        out[:, 0] = (xy @ transform[0, :2] + transform[0, 2]) / scale
+        out[:, 1] = (xy @ transform[1, :2] + transform[1, 2]) / scale
+        out[:, 2] = points[:, 2]
+
+    @property
+    def ready(self) -> bool:
+        """Whether every tracker has its model loaded (TRACKER_PROCESS workers report it)"""
+        return all(getattr(tracker, 'ready', True) for tracker in self.trackers)
+
+    def worker_cpu_time(self) -> float:
+        """CPU seconds of the trackers' worker processes (TRACKER_PROCESS)"""
+        return sum(tracker.worker_cpu_time() for tracker in self.trackers if hasattr(tracker, 'worker_cpu_time'))
+
+    def draw_landmarks(self, frame: np.ndarray, results: object):
+        # Each camera draws on its own view, in its own coordinates
+        if results is None:
+            results = [None] * len(self.trackers)
+        for tracker, view, view_results in zip(self.trackers, self.views(frame), results):
+            tracker.draw_landmarks(view, view_results)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+        for tracker in self.trackers:
+            tracker.close()
@@ -0,0 +1,356 @@
+"""Split mode: hand landmarks or gesture events streamed between machines as compact UDP datagrams"""
+
+import socket
+import struct
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from actions import ACTIONS
+from gesture_detector import GestureEvents
+from landmarks import HandData, HAND_LABELS, NUM_LANDMARKS, allocate_frame_hands
+
+
+MAGIC = b'GM'
+VERSION = 1
+
+KIND_LANDMARKS = 1
+KIND_EVENTS = 2
+
+# Header flags
+FLAG_INT16 = 0x01       # Coordinates and scores quantized to int16
+FLAG_CURSOR = 0x02      # Events: a cursor position follows
+
+# Header: magic, version, kind, flags, hand bits, sequence, capture timestamp
+# (sender's time.perf_counter), frame width, frame height. Hand bit i marks
+# HAND_LABELS[i] present, bit 4 + i marks it predicted.
+HEADER = struct.Struct('<2sBBBBIdHH')
+
+# int16 quantization: x and y as fractions of the frame size in steps of
+# 1 / QUANT_STEPS, so values within twice the frame size keep a resolution
+# of about 0.1 px on a 1280 px frame; z as reported in steps of 1 / Z_STEPS
+QUANT_STEPS = 16384.0
+Z_STEPS = 1024.0
+SCORE_STEPS = 32767.0
+
+# Events body: action bits (ACTION_NAMES order), scroll, drag
+EVENTS = struct.Struct('<HBB')
+CURSOR_FLOAT = struct.Struct('<ff')
+CURSOR_INT16 = struct.Struct('<hh')
+ACTION_NAMES = tuple(ACTIONS)
+SCROLL_CODES = {None: 0, 'up': 1, 'down': 2}
+DRAG_CODES = {None: 0, 'start': 1, 'end': 2}
+SCROLL_NAMES = {code: name for name, code in SCROLL_CODES.items()}
+DRAG_NAMES = {code: name for name, code in DRAG_CODES.items()}
+
+MAX_DATAGRAM = HEADER.size + len(HAND_LABELS) * (NUM_LANDMARKS * 3 + 1) * 4
+
+# A sequence number this far behind the last one means the sender restarted
+SEQUENCE_RESTART = 1000
+# Clock offset estimate relaxation, seconds per second: follows a sender
+# clock running up to this much slower than the receiver's
+OFFSET_RELAX = 1e-3
+
+
+class Packet(NamedTuple):
+    """One decoded datagram"""
+    kind: int
+    sequence: int
+    # Capture time; the receiver translates it to its own time.perf_counter
+    timestamp: float
+    frame_size: Tuple[int, int]
+    # KIND_LANDMARKS: the frame's hands; KIND_EVENTS: None
+    hands_data: Optional[Dict[str, Optional[HandData]]] = None
+    # KIND_EVENTS: the sender's gesture events; KIND_LANDMARKS: None
+    events: Optional[GestureEvents] = None
+
+
+def _quantize_scale(frame_size: Tuple[int, int]) -> np.ndarray:
+    width, height = frame_size
+    return np.array([QUANT_STEPS / width, QUANT_STEPS / height, Z_STEPS], dtype=np.float32)
+
+
+def encode_landmarks(buffer: bytearray, sequence: int, timestamp: float, frame_size: Tuple[int, int],
+                     hands_data: Dict[str, Optional[HandData]], quantize: bool = False) -> int:
+    """
+    Pack one frame's hands into ``buffer`` (at least MAX_DATAGRAM bytes);
+    returns the datagram length. Each present hand adds its score and 21
+    x, y, z, as float32 (256 bytes) or int16 (128 bytes).
+    """
+    hand_bits = 0
+    offset = HEADER.size
+    scale = _quantize_scale(frame_size) if quantize else None
+    for i, label in enumerate(HAND_LABELS):
+        hand = hands_data.get(label)
+        if hand is None:
+            continue
+        hand_bits |= 1 << i
+        if hand.predicted:
+            hand_bits |= 1 << (4 + i)
+        if quantize:
+            values = np.empty(NUM_LANDMARKS * 3 + 1, dtype='<i2')
+            values[0] = round(hand.score * SCORE_STEPS)
+            np.clip(np.rint(hand.landmarks * scale), -32768, 32767, out=values[1:].reshape(NUM_LANDMARKS, 3),
+                    casting='unsafe')
+        else:
+            values = np.empty(NUM_LANDMARKS * 3 + 1, dtype='<f4')
+            values[0] = hand.score
+            values[1:] = hand.landmarks.ravel()
+        data = values.tobytes()
+        buffer[offset:offset + len(data)] = data
+        offset += len(data)
+
+    HEADER.pack_into(buffer, 0, MAGIC, VERSION, KIND_LANDMARKS, FLAG_INT16 if quantize else 0, hand_bits,
+                     sequence, timestamp, *frame_size)
+    return offset
+
+
+def encode_events(buffer: bytearray, sequence: int, timestamp: float, frame_size: Tuple[int, int],
+                  events: GestureEvents, quantize: bool = False) -> int:
+    """Pack one frame's gesture events into ``buffer``; 26 bytes, plus 4 or 8 with a cursor position"""
+    action_bits = 0
+    for name in events.actions:
+        action_bits |= 1 << ACTION_NAMES.index(name)
+    EVENTS.pack_into(buffer, HEADER.size, action_bits, SCROLL_CODES[events.scroll], DRAG_CODES[events.drag])
+    offset = HEADER.size + EVENTS.size
+
+    flags = FLAG_INT16 if quantize else 0
+    if events.cursor is not None:
+        flags |= FLAG_CURSOR
+        x, y = events.cursor
+        if quantize:
+            scale = _quantize_scale(frame_size)
+            CURSOR_INT16.pack_into(buffer, offset, *(max(-32768, min(32767, round(value * step)))
+                                                     for value, step in ((x, scale[0]), (y, scale[1]))))
+            offset += CURSOR_INT16.size
+        else:
+            CURSOR_FLOAT.pack_into(buffer, offset, x, y)
+            offset += CURSOR_FLOAT.size
+
+    HEADER.pack_into(buffer, 0, MAGIC, VERSION, KIND_EVENTS, flags, 0, sequence, timestamp, *frame_size)
+    return offset
+
+
+def decode(data: bytes, slots: Optional[Dict[str, HandData]] = None) -> Packet:
+    """
+    Unpack a datagram; landmarks go into ``slots`` (one frame of
+    allocate_frame_hands) or fresh arrays. Raises ValueError for anything
+    that is not a well-formed datagram of this version.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("Datagram too short")
+    magic, version, kind, flags, hand_bits, sequence, timestamp, width, height = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a gesture stream datagram")
+    if width == 0 or height == 0:
+        raise ValueError("Datagram without a frame size")
+    frame_size = (width, height)
+    quantized = bool(flags & FLAG_INT16)
+
+    if kind == KIND_EVENTS:
+        if len(data) < HEADER.size + EVENTS.size:
+            raise ValueError("Truncated events datagram")
+        action_bits, scroll, drag = EVENTS.unpack_from(data, HEADER.size)
+        cursor = None
+        if flags & FLAG_CURSOR:
+            cursor_format = CURSOR_INT16 if quantized else CURSOR_FLOAT
+            if len(data) < HEADER.size + EVENTS.size + cursor_format.size:
+                raise ValueError("Truncated events datagram")
+            x, y = cursor_format.unpack_from(data, HEADER.size + EVENTS.size)
+            if quantized:
+                x, y = x * width / QUANT_STEPS, y * height / QUANT_STEPS
+            cursor = (x, y)
+        actions = tuple(name for i, name in enumerate(ACTION_NAMES) if action_bits & (1 << i))
+        events = GestureEvents(timestamp, actions, SCROLL_NAMES.get(scroll), cursor, DRAG_NAMES.get(drag))
+        return Packet(kind, sequence, timestamp, frame_size, events=events)
+
+    if kind != KIND_LANDMARKS:
+        raise ValueError(f"Unknown datagram kind {kind}")
+
+    if slots is None:
+        slots = allocate_frame_hands(1)[0]
+    dtype = np.dtype('<i2') if quantized else np.dtype('<f4')
+    hand_size = (NUM_LANDMARKS * 3 + 1) * dtype.itemsize
+    present = [bool(hand_bits & (1 << i)) for i in range(len(HAND_LABELS))]
+    if len(data) != HEADER.size + sum(present) * hand_size:
+        raise ValueError("Landmark datagram has the wrong length")
+
+    hands_data = {}
+    offset = HEADER.size
+    for i, label in enumerate(HAND_LABELS):
+        if not present[i]:
+            hands_data[label] = None
+            continue
+        values = np.frombuffer(data, dtype=dtype, count=NUM_LANDMARKS * 3 + 1, offset=offset)
+        offset += hand_size
+        hand = slots[label]
+        if quantized:
+            hand.score = float(values[0]) / SCORE_STEPS
+            np.divide(values[1:].reshape(NUM_LANDMARKS, 3), _quantize_scale(frame_size), out=hand.landmarks)
+        else:
+            hand.score = float(values[0])
+            hand.landmarks[:] = values[1:].reshape(NUM_LANDMARKS, 3)
+        hand.predicted = bool(hand_bits & (1 << (4 + i)))
+        hands_data[label] = hand
+    return Packet(kind, sequence, timestamp, frame_size, hands_data=hands_data)
+
+
+class StreamSender:
+    """
+    Sends every frame's hands (payload "landmarks") or gesture events
+    (payload "events") to a StreamReceiver, one datagram per frame, with
+    the frame's capture timestamp and a sequence number.
+
+    Landmarks let the receiver run the gesture logic itself and are the
+    better choice on lossy links: a lost frame is like a dropped camera
+    frame. Events are about ten times smaller, but a lost datagram loses
+    whatever it carried, a click included.
+    """
+
+    def __init__(self, host: str, port: int, frame_size: Tuple[int, int], payload: str = "landmarks",
+                 quantize: bool = False, metrics=None):
+        if payload not in ("landmarks", "events"):
+            raise ValueError(f"Unknown network payload: {payload} (expected landmarks or events)")
+        self.address = (host, port)
+        self.frame_size = frame_size
+        self.payload = payload
+        self.quantize = quantize
+        self.metrics = metrics
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sequence = 0
+        self.bytes_sent = 0
+        self._buffer = bytearray(MAX_DATAGRAM)
+
+    def send(self, timestamp: float, hands_data: Dict[str, Optional[HandData]],
+             events: Optional[GestureEvents] = None):
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+        if self.payload == "events":
+            length = encode_events(self._buffer, self.sequence, timestamp, self.frame_size, events, self.quantize)
+        else:
+            length = encode_landmarks(self._buffer, self.sequence, timestamp, self.frame_size, hands_data,
+                                      self.quantize)
+        try:
+            self.socket.sendto(memoryview(self._buffer)[:length], self.address)
+        except OSError:
+            # Receiver not up yet (ICMP port unreachable) or a full send buffer: UDP drops this frame
+            if self.metrics is not None:
+                self.metrics.increment('network.send_errors')
+            return
+        self.bytes_sent += length
+        if self.metrics is not None:
+            self.metrics.increment('network.sent')
+            self.metrics.increment('network.bytes_sent', length)
+
+    def close(self):
+        self.socket.close()
+
+
+class StreamReceiver:
+    """
+    Receives a StreamSender's datagrams and hands out the fresh ones.
+
+    Sender and receiver clocks are not comparable, so staleness is judged
+    by delay: the smallest receive-minus-capture difference seen so far is
+    the clock offset plus the best-case latency, and a packet arriving more
+    than ``max_age`` seconds later than that is stale. Packets that are not
+    newer than the last one (duplicates, reordering) are dropped. Late
+    landmark packets are dropped too; late events packets only lose their
+    cursor position, so a late click still clicks. Timestamps are
+    translated to this machine's time.perf_counter.
+    """
+
+    def __init__(self, host: str, port: int, max_age: float = 0.1, buffer_count: int = 4, metrics=None):
+        self.max_age = max_age
+        self.metrics = metrics
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((host, port))
+        self.address = self.socket.getsockname()
+        self.last_sequence: Optional[int] = None
+        self.received = 0
+        self.stale = 0
+        self.lost = 0
+        self.bytes_received = 0
+        self._offset: Optional[float] = None
+        self._offset_time = 0.0
+        self._last_timestamp = float('-inf')
+        self._hand_slots = allocate_frame_hands(buffer_count)
+        self._next_buffer = 0
+        self._buffer = bytearray(MAX_DATAGRAM)
+
+    def _count(self, name: str, value: int = 1):
+        if self.metrics is not None:
+            self.metrics.increment(name, value)
+
+    def _is_newer(self, sequence: int) -> bool:
+        last = self.last_sequence
+        if last is None or sequence > last or last - sequence > SEQUENCE_RESTART:
+            if last is not None and sequence > last + 1:
+                self.lost += sequence - last - 1
+                self._count('network.lost', sequence - last - 1)
+            self.last_sequence = sequence
+            return True
+        return False
+
+    def _delay(self, timestamp: float, now: float) -> float:
+        """Seconds this packet arrived later than the fastest one, with the clock offset updated"""
+        sample = now - timestamp
+        if self._offset is None:
+            self._offset = sample
+        else:
+            self._offset = min(sample, self._offset + OFFSET_RELAX * (now - self._offset_time))
+        self._offset_time = now
+        return sample - self._offset
+
+    def receive(self, timeout: Optional[float] = None) -> Optional[Packet]:
+        """The next fresh packet, or None when ``timeout`` seconds pass without one"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            self.socket.settimeout(remaining)
+            try:
+                length, _ = self.socket.recvfrom_into(self._buffer)
+            except socket.timeout:
+                return None
+            except OSError:
+                # Windows raises WSAEMSGSIZE for a datagram larger than the buffer
+                # (elsewhere it arrives truncated and fails to decode)
+                self._count('network.malformed')
+                return None
+            now = time.perf_counter()
+
+            slots = self._hand_slots[self._next_buffer]
+            try:
+                packet = decode(memoryview(self._buffer)[:length], slots)
+            except ValueError:
+                self._count('network.malformed')
+                continue
+            self._next_buffer = (self._next_buffer + 1) % len(self._hand_slots)
+            self.received += 1
+            self.bytes_received += length
+            self._count('network.received')
+            self._count('network.bytes_received', length)
+
+            delay = self._delay(packet.timestamp, now)
+            newer = self._is_newer(packet.sequence)
+            fresh = newer and delay <= self.max_age
+            if not fresh:
+                self.stale += 1
+                self._count('network.stale')
+                # Late events still carry their actions; a duplicate or reordered datagram is dropped
+                if packet.kind == KIND_LANDMARKS or not newer:
+                    continue
+
+            # Capture time on this clock, assuming the best-case latency;
+            # kept monotonic for the gesture timing and cursor filter
+            timestamp = max(packet.timestamp + self._offset, self._last_timestamp)
+            self._last_timestamp = timestamp
+            if self.metrics is not None:
+                self.metrics.observe('network.delay', delay, trace=False)
+            events = packet.events
+            if events is not None:
+                events = events._replace(timestamp=timestamp, cursor=events.cursor if fresh else None)
+            return packet._replace(timestamp=timestamp, events=events)
+
+    def close(self):
+        self.socket.close()
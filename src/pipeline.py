@@ -0,0 +1,196 @@
+"""Threaded stage pipeline with bounded queues between stages"""
+
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class StopPipeline(Exception):
+    """Raised by the source or any stage to shut the pipeline down"""
+
+
+class Stage:
+    """
+    One step of the pipeline. ``func`` receives the item produced by the
+    previous step and returns the item for the next one, or None to drop it.
+
+    ``policy`` decides what happens when the stage's input queue is full:
+    "drop_oldest" discards the oldest queued item so the stage always works
+    on the newest data (right for real-time frames), "block" makes the
+    upstream stage wait (right when every item must be processed).
+    """
+
+    POLICIES = ("drop_oldest", "block")
+
+    def __init__(self, name: str, func: Callable[[object], Optional[object]],
+                 queue_size: int = 1, policy: str = "drop_oldest"):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        self.name = name
+        self.func = func
+        self.policy = policy
+        self.queue = queue.Queue(maxsize=queue_size)
+
+        self.processed = 0
+        self.dropped = 0
+        self.busy_time = 0.0
+        self.max_depth = 0
+
+
+class Pipeline:
+    """
+    Runs ``source`` and every stage but the last on worker threads. The last
+    stage runs on the thread that calls run(), so GUI work such as
+    cv2.imshow stays on the main thread.
+    """
+
+    def __init__(self, source: Callable[[], object], stages: List[Stage], metrics=None):
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+        self.source = source
+        self.stages = stages
+        self.metrics = metrics
+
+        self.produced = 0
+        self._stop = threading.Event()
+        self._threads = []
+        self._error = None
+        self._start_time = None
+
+    def _put(self, stage: Stage, item: object):
+        if stage.policy == "block":
+            while not self._stop.is_set():
+                try:
+                    stage.queue.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+        else:
+            while True:
+                try:
+                    stage.queue.put_nowait(item)
+                    break
+                except queue.Full:
+                    try:
+                        stage.queue.get_nowait()
+                        stage.dropped += 1
+                        if self.metrics is not None:
+                            self.metrics.increment(f'pipeline.{stage.name}.dropped')
+                    except queue.Empty:
+                        pass
+
+        depth = stage.queue.qsize()
+        if depth > stage.max_depth:
+            stage.max_depth = depth
+
+    def _get(self, stage: Stage) -> Optional[object]:
+        while not self._stop.is_set():
+            try:
+                return stage.queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
+
+    def _run_source(self):
+        try:
+            while not self._stop.is_set():
+                item = self.source()
+                self.produced += 1
+                self._put(self.stages[0], item)
+        except StopPipeline:
+            self._stop.set()
+        except BaseException as e:
+            self._error = e
+            self._stop.set()
+
+    def _process(self, index: int) -> bool:
+        stage = self.stages[index]
+        item = self._get(stage)
+        if item is None:
+            return False
+
+        start = time.perf_counter()
+        result = stage.func(item)
+        elapsed = time.perf_counter() - start
+        stage.busy_time += elapsed
+        stage.processed += 1
+        if self.metrics is not None:
+            self.metrics.observe(f'pipeline.{stage.name}', elapsed)
+
+        if result is not None and index + 1 < len(self.stages):
+            self._put(self.stages[index + 1], result)
+        return True
+
+    def _run_stage(self, index: int):
+        try:
+            while not self._stop.is_set():
+                self._process(index)
+        except StopPipeline:
+            self._stop.set()
+        except BaseException as e:
+            self._error = e
+            self._stop.set()
+
+    def start(self):
+        self._start_time = time.perf_counter()
+        workers = [threading.Thread(target=self._run_source, name="pipeline-source", daemon=True)]
+        for index, stage in enumerate(self.stages[:-1]):
+            workers.append(threading.Thread(
+                target=self._run_stage,
+                args=(index,),
+                name=f"pipeline-{stage.name}",
+                daemon=True
+            ))
+        for worker in workers:
+            worker.start()
+        self._threads = workers
+
+    def run(self):
+        """Start the workers and process the last stage until stopped"""
+        self.start()
+        try:
+            while not self._stop.is_set():
+                self._process(len(self.stages) - 1)
+        except StopPipeline:
+            pass
+        finally:
+            self.stop()
+
+        if self._error is not None:
+            raise self._error
+
+    def stop(self):
+        self._stop.set()
+        for worker in self._threads:
+            worker.join(timeout=1.0)
+        self._threads = []
+
+    def stats(self) -> Dict[str, object]:
+        elapsed = time.perf_counter() - self._start_time if self._start_time else 0.0
+        sink = self.stages[-1]
+        stages = {}
+        for stage in self.stages:
+            stages[stage.name] = {
+                'processed': stage.processed,
+                'dropped': stage.dropped,
+                'queue_depth': stage.queue.qsize(),
+                'max_queue_depth': stage.max_depth,
+                'avg_ms': stage.busy_time / stage.processed * 1000 if stage.processed else 0.0,
+            }
+        return {
+            'elapsed': elapsed,
+            'produced': self.produced,
+            'throughput': sink.processed / elapsed if elapsed > 0 else 0.0,
+            'stages': stages,
+        }
+
+    def format_stats(self) -> str:
+        stats = self.stats()
+        parts = [f"{stats['throughput']:.1f} fps"]
+        for name, s in stats['stages'].items():
+            parts.append(
+                f"{name}: q={s['queue_depth']}/{s['max_queue_depth']} "
+                f"drop={s['dropped']} {s['avg_ms']:.1f}ms"
+            )
+        return " | ".join(parts)
@@ -0,0 +1,86 @@
+"""Preview window rendered on its own thread at a limited frame rate"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+import cv2
+import numpy as np
+
+
+class PreviewRenderer:
+    """
+    Shows copies of recent frames without slowing the frame loop. The loop
+    asks due() and only then pays for submit(), which copies the frame;
+    drawing, cv2.imshow and cv2.waitKey all happen on the preview thread.
+    Frames submitted while the previous one is still being drawn replace it.
+
+    ``render(frame, *args)`` draws the overlay onto the copied frame, and
+    ``on_key(key)`` receives keys other than 'q' pressed in the window.
+    """
+
+    def __init__(self, render: Callable[..., None], window_name: str, max_fps: float = 10.0,
+                 on_key: Optional[Callable[[int], None]] = None):
+        self.render = render
+        self.on_key = on_key
+        self.window_name = window_name
+        self.interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        # Set when the user presses 'q' in the preview window
+        self.stop_requested = threading.Event()
+
+        self._buffers = []
+        self._pending = None
+        self._next_due = 0.0
+        self._cond = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="preview", daemon=True)
+        self._thread.start()
+
+    def due(self) -> bool:
+        return time.perf_counter() >= self._next_due
+
+    def submit(self, frame: np.ndarray, *args):
+        self._next_due = time.perf_counter() + self.interval
+        with self._cond:
+            # Two buffers: one being drawn, one holding the newest submission
+            if self._pending is not None:
+                buffer = self._pending[0]
+            else:
+                buffer = self._buffers.pop() if self._buffers else None
+            if buffer is None or buffer.shape != frame.shape:
+                buffer = np.empty_like(frame)
+            np.copyto(buffer, frame)
+            self._pending = (buffer, args)
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or not self._running)
+                if not self._running:
+                    break
+                frame, args = self._pending
+                self._pending = None
+
+            self.render(frame, *args)
+            cv2.imshow(self.window_name, frame)
+            key = cv2.waitKey(1) & 0xFF
+            if key == ord('q'):
+                self.stop_requested.set()
+            elif key != 0xFF and self.on_key is not None:
+                self.on_key(key)
+
+            with self._cond:
+                self._buffers.append(frame)
+
+        try:
+            cv2.destroyWindow(self.window_name)
+        except cv2.error:
+            # No frame was ever shown
+            pass
+
+    def close(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout=1.0)
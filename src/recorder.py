@@ -0,0 +1,100 @@
+"""Landmark session recording in a compact, memory-mappable binary format"""
+
+import struct
+from typing import Dict, Optional
+
+import numpy as np
+
+from landmarks import HandData, HAND_LABELS, NUM_LANDMARKS
+
+
+MAGIC = b'GMREC\x00\x00\x01'
+HEADER_FORMAT = '<8sII'     # magic, frame width, frame height
+HEADER_SIZE = 64            # Padded so records start at an aligned offset
+
+# One fixed-size record per frame, so a file is a header followed by a flat
+# array that np.memmap can open without parsing. 'present' is 0 for a
+# missing hand, PRESENT_OBSERVED or PRESENT_PREDICTED.
+PRESENT_OBSERVED = 1
+PRESENT_PREDICTED = 2
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('present', 'u1', (len(HAND_LABELS),)),
+    ('score', '<f4', (len(HAND_LABELS),)),
+    ('landmarks', '<f4', (len(HAND_LABELS), NUM_LANDMARKS, 3)),
+])
+
+
+class SessionRecorder:
+    def __init__(self, path: str, frame_width: int, frame_height: int):
+        self.file = open(path, 'wb')
+        header = struct.pack(HEADER_FORMAT, MAGIC, frame_width, frame_height)
+        self.file.write(header.ljust(HEADER_SIZE, b'\x00'))
+
+        self._record = np.zeros(1, dtype=RECORD_DTYPE)
+        self.frames = 0
+
+    def write(self, timestamp: float, hands_data: Dict[str, Optional[HandData]]):
+        record = self._record[0]
+        record['timestamp'] = timestamp
+        for i, label in enumerate(HAND_LABELS):
+            hand = hands_data.get(label)
+            if hand is None:
+                record['present'][i] = 0
+                record['score'][i] = 0.0
+                record['landmarks'][i] = 0.0
+                continue
+            record['present'][i] = PRESENT_PREDICTED if hand.predicted else PRESENT_OBSERVED
+            record['score'][i] = hand.score
+            record['landmarks'][i] = hand.landmarks
+
+        self.file.write(self._record.tobytes())
+        self.frames += 1
+
+    def close(self):
+        self.file.close()
+
+
+class Recording:
+    """Read-only, memory-mapped view of a file written by SessionRecorder"""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            magic, width, height = struct.unpack(HEADER_FORMAT, f.read(struct.calcsize(HEADER_FORMAT)))
+        if magic != MAGIC:
+            raise ValueError(f"Not a landmark recording: {path}")
+
+        self.frame_width = width
+        self.frame_height = height
+        try:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE)
+        except ValueError:
+            # np.memmap refuses empty files
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self.records['timestamp']
+
+    def hands_at(self, index: int) -> Dict[str, Optional[HandData]]:
+        """hands_data for one frame; landmarks are views into the mapped file"""
+        record = self.records[index]
+        points = record['landmarks'].reshape(len(HAND_LABELS) * NUM_LANDMARKS, 3)
+
+        hands_data = {}
+        for i, label in enumerate(HAND_LABELS):
+            if record['present'][i]:
+                hands_data[label] = HandData(
+                    points[i * NUM_LANDMARKS:(i + 1) * NUM_LANDMARKS],
+                    label,
+                    float(record['score'][i]),
+                    frame_points=points,
+                    predicted=bool(record['present'][i] == PRESENT_PREDICTED)
+                )
+            else:
+                hands_data[label] = None
+        return hands_data
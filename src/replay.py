@@ -0,0 +1,83 @@
+"""Headless, faster-than-real-time replay of recorded landmark sessions"""
+
+import argparse
+import json
+import time
+from typing import Dict
+
+from actions import ActionFeedback, handle_gestures
+from gesture_detector import GestureDetector
+from mouse_controller import NullMouseController
+from recorder import Recording
+import config
+
+
+def _discard(message: str):
+    pass
+
+
+def apply_frame_size(recording: Recording):
+    """Cursor mapping and gesture thresholds follow the recorded frame size, as they did live"""
+    if recording.frame_width and recording.frame_height:
+        config.CAMERA_WIDTH, config.CAMERA_HEIGHT = recording.frame_width, recording.frame_height
+
+
+def replay_session(recording: Recording, gesture_detector: GestureDetector,
+                   mouse_controller: NullMouseController) -> Dict[str, object]:
+    """
+    Feed every recorded frame through the gesture logic as fast as possible.
+    Gesture timing uses the recorded timestamps, so the same recording
+    always produces the same actions. Call apply_frame_size(recording)
+    before creating gesture_detector.
+    """
+    feedback = ActionFeedback()
+    timestamps = recording.timestamps.tolist()
+
+    start = time.perf_counter()
+    for index in range(len(recording)):
+        handle_gestures(
+            recording.hands_at(index),
+            gesture_detector,
+            mouse_controller,
+            feedback,
+            timestamps[index],
+            _discard
+        )
+    elapsed = time.perf_counter() - start
+
+    return {
+        'frames': len(recording),
+        'elapsed': elapsed,
+        'fps': len(recording) / elapsed if elapsed > 0 else 0.0,
+        'actions': dict(sorted(mouse_controller.actions.items())),
+        'final_position': mouse_controller.position,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded landmark session through the gesture logic")
+    parser.add_argument('recording', help="File written with RECORD_SESSION_PATH")
+    parser.add_argument('--repeat', type=int, default=1, help="Replay several times to measure throughput")
+    parser.add_argument('--json', action='store_true', help="Print the result as JSON")
+    args = parser.parse_args()
+
+    recording = Recording(args.recording)
+    apply_frame_size(recording)
+    for _ in range(args.repeat):
+        result = replay_session(
+            recording,
+            GestureDetector(),
+            NullMouseController(config.SMOOTHING_FACTOR, config.MOUSE_SPEED_MULTIPLIER, config.SCREEN_PADDING)
+        )
+
+        if args.json:
+            print(json.dumps(result))
+        else:
+            print(f"{result['frames']} frames in {result['elapsed'] * 1000:.1f} ms "
+                  f"({result['fps']:.0f} frames/s)")
+            for name, count in result['actions'].items():
+                print(f"  {name}: {count}")
+
+
+if __name__ == "__main__":
+    main()
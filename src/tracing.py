@@ -0,0 +1,134 @@
+"""Per-frame trace spans in a fixed-size ring, exported as Chrome/Perfetto trace-event JSON"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class Tracer:
+    """
+    Keeps the last ``capacity`` spans (name, thread, start, duration, frame
+    ID) in preallocated arrays.
+
+    Recording takes no lock: a writer claims the next slot with next() on
+    an itertools.count, which is atomic in CPython, and then fills that
+    slot. Only the first span with a new name, or from a new thread, takes
+    a lock to register it. Exporting while frames are being traced may catch a slot that is
+    being overwritten; that affects only the oldest span.
+
+    Spans carry the ID of the frame their thread is working on, which the
+    frame loop sets with set_frame(); Camera does this on every read.
+    """
+
+    def __init__(self, capacity: int = 65536):
+        self.capacity = capacity
+        self._counter = itertools.count()
+        self._starts = np.zeros(capacity, dtype=np.float64)
+        self._durations = np.zeros(capacity, dtype=np.float64)
+        self._frames = np.zeros(capacity, dtype=np.int64)
+        self._threads = np.zeros(capacity, dtype=np.int64)
+        self._names = np.zeros(capacity, dtype=np.int32)
+        self._written = np.zeros(capacity, dtype=bool)
+
+        self._name_ids: Dict[str, int] = {}
+        self._name_list: List[str] = []
+        self._thread_names: Dict[int, str] = {}
+        self._names_lock = threading.Lock()
+        self._local = threading.local()
+        # time.perf_counter has an arbitrary origin: anchor it to wall-clock time for the export
+        self._origin = time.time() - time.perf_counter()
+
+    def set_frame(self, frame_id: int):
+        """Attribute this thread's following spans to ``frame_id``"""
+        self._local.frame_id = frame_id
+
+    @property
+    def frame_id(self) -> int:
+        return getattr(self._local, 'frame_id', 0)
+
+    def _name_id(self, name: str) -> int:
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            with self._names_lock:
+                name_id = self._name_ids.get(name)
+                if name_id is None:
+                    self._name_list.append(name)
+                    name_id = self._name_ids[name] = len(self._name_list) - 1
+        return name_id
+
+    def add(self, name: str, start: float, duration: float, frame_id: Optional[int] = None):
+        """Record a span that started at ``start`` (time.perf_counter) and lasted ``duration`` seconds"""
+        thread = threading.get_ident()
+        if thread not in self._thread_names:
+            with self._names_lock:
+                self._thread_names[thread] = threading.current_thread().name
+
+        slot = next(self._counter) % self.capacity
+        self._written[slot] = False
+        self._starts[slot] = start
+        self._durations[slot] = duration
+        self._frames[slot] = self.frame_id if frame_id is None else frame_id
+        self._threads[slot] = thread
+        self._names[slot] = self._name_id(name)
+        self._written[slot] = True
+
+    def to_chrome_trace(self, seconds: Optional[float] = None) -> Dict[str, object]:
+        """
+        Spans as trace events ("X" complete events, timestamps in
+        microseconds), optionally only those of the last ``seconds``. Open
+        the JSON in chrome://tracing or https://ui.perfetto.dev.
+        """
+        valid = self._written.copy()
+        starts = self._starts[valid]
+        durations = self._durations[valid]
+        frames = self._frames[valid]
+        threads = self._threads[valid]
+        names = self._names[valid]
+
+        order = np.argsort(starts, kind='stable')
+        if seconds is not None and len(order):
+            order = order[starts[order] >= time.perf_counter() - seconds]
+
+        with self._names_lock:
+            thread_names = list(self._thread_names.items())
+            name_list = list(self._name_list)
+
+        pid = os.getpid()
+        events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': thread, 'args': {'name': name}}
+            for thread, name in thread_names
+        ]
+        for i in order:
+            name = name_list[names[i]]
+            events.append({
+                'name': name,
+                'cat': name.split('.', 1)[0],
+                'ph': 'X',
+                'ts': (starts[i] + self._origin) * 1e6,
+                'dur': durations[i] * 1e6,
+                'pid': pid,
+                'tid': int(threads[i]),
+                'args': {'frame': int(frames[i])},
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def dump(self, path: str, seconds: Optional[float] = None):
+        trace = self.to_chrome_trace(seconds)
+        # Write then rename so a viewer never opens a half-written file
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(trace, f)
+        os.replace(tmp_path, path)
+
+    def dump_in_background(self, path: str, seconds: Optional[float] = None):
+        """dump() on a separate thread, so a request from the frame loop or a signal handler never stalls it"""
+        def dump():
+            self.dump(path, seconds)
+            print(f"Trace of the last {seconds:g} s written to {path}" if seconds else f"Trace written to {path}")
+
+        threading.Thread(target=dump, name="trace-dump", daemon=True).start()
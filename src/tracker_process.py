@@ -0,0 +1,305 @@
+"""Hand tracking in a worker process, with frames passed through shared memory"""
+
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from landmarks import HAND_LABELS, NUM_LANDMARKS, allocate_frame_hands
+
+
+class SharedFrameRing:
+    """``count`` equally shaped frames in one shared-memory block, viewed as numpy arrays"""
+
+    def __init__(self, shape: Tuple[int, ...], dtype, count: int, name: Optional[str] = None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.count = count
+        frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self.owner = name is None
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=frame_bytes * count)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.name = self.memory.name
+        self.buffers = [
+            np.ndarray(self.shape, self.dtype, buffer=self.memory.buf, offset=i * frame_bytes)
+            for i in range(count)
+        ]
+        self._slots = {buffer.ctypes.data: i for i, buffer in enumerate(self.buffers)}
+
+    def index_of(self, frame: np.ndarray) -> Optional[int]:
+        """Slot of ``frame`` if it is one of this ring's buffers"""
+        if frame.shape != self.shape or frame.dtype != self.dtype:
+            return None
+        return self._slots.get(frame.ctypes.data)
+
+    def close(self):
+        self.buffers = []
+        self._slots = {}
+        try:
+            self.memory.close()
+        except BufferError:
+            # Someone (e.g. a released Camera) still holds a view; the
+            # mapping goes away with the process
+            pass
+        if self.owner:
+            self.memory.unlink()
+
+
+def _worker_main(conn, tracker_kwargs: dict, warmup_shape: Optional[tuple], warmup_frames: int):
+    """Worker process: attach to the frame ring and answer one landmark message per frame"""
+    from hand_tracker import HandTracker
+
+    tracker = HandTracker(**tracker_kwargs)
+    if warmup_shape is not None:
+        tracker.warm_up(warmup_shape, warmup_frames)
+    # 'camera': the ring Camera captures into; 'staging': where other frames are copied
+    rings = {}
+    points = np.zeros((len(HAND_LABELS), NUM_LANDMARKS, 3), dtype=np.float32)
+    conn.send(('ready',))
+
+    try:
+        while True:
+            message = conn.recv()
+            kind = message[0]
+            if kind == 'frame':
+                _, sequence, ring_key, slot, timestamp = message
+                _, hands_data = tracker.track(rings[ring_key].buffers[slot], timestamp)
+                present = []
+                for i, label in enumerate(HAND_LABELS):
+                    hand = hands_data[label]
+                    if hand is None:
+                        present.append(None)
+                    else:
+                        points[i] = hand.landmarks
+                        present.append((hand.score, hand.predicted))
+                conn.send((sequence, present, points.tobytes()))
+            elif kind == 'ring':
+                _, ring_key, name, shape, dtype, count = message
+                if ring_key in rings:
+                    rings[ring_key].close()
+                rings[ring_key] = SharedFrameRing(shape, dtype, count, name)
+            elif kind == 'cpu':
+                conn.send(('cpu', time.process_time()))
+            elif kind == 'stop':
+                break
+    except (EOFError, KeyboardInterrupt):
+        # Parent went away or the console sent Ctrl+C to the whole group
+        pass
+    finally:
+        for ring in rings.values():
+            ring.close()
+        tracker.close()
+
+
+class ProcessHandTracker:
+    """
+    Drop-in replacement for HandTracker that runs MediaPipe in a separate
+    process, so inference no longer competes with gesture logic, actuation
+    and the GUI for the GIL.
+
+    Frames travel through a shared-memory ring. Camera can allocate its
+    capture buffers from that ring (see allocate_frames), in which case
+    no pixels are copied at all; any other frame is copied into a separate
+    one-frame staging block. Landmarks come back over a pipe as one small
+    message per frame.
+
+    If the worker dies or does not answer within ``timeout`` seconds it is
+    restarted; until the new worker has loaded (and, with ``warmup_shape``,
+    warmed up) its model, frames report no hands.
+    """
+
+    def __init__(self, max_hands: int, min_detection_confidence: float, min_tracking_confidence: float,
+                 buffer_count: int = 8, metrics=None, timeout: float = 2.0,
+                 warmup_shape: Optional[tuple] = None, warmup_frames: int = 1, **tracker_kwargs):
+        self.tracker_kwargs = dict(
+            max_hands=max_hands,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            **tracker_kwargs
+        )
+        self.warmup = (warmup_shape, warmup_frames)
+        self.metrics = metrics
+        self.timeout = timeout
+        self.restarts = 0
+
+        self._hand_slots = allocate_frame_hands(buffer_count)
+        self._next_buffer = 0
+        self._sequence = 0
+        self._ring = None
+        self._staging = None
+        self._worker_cpu = 0.0
+        self._last_hands_data = {'Left': None, 'Right': None}
+        self._context = multiprocessing.get_context('spawn')
+        self._start_worker()
+
+    def _start_worker(self):
+        self._conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.tracker_kwargs) + self.warmup,
+            name="hand-tracker",
+            daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+        self._ready = False
+        self._worker_cpu = 0.0
+        for ring_key, ring in (('camera', self._ring), ('staging', self._staging)):
+            if ring is not None:
+                self._send_ring(ring_key, ring)
+
+    def _send_ring(self, ring_key: str, ring: SharedFrameRing):
+        self._conn.send(('ring', ring_key, ring.name, ring.shape, ring.dtype.str, ring.count))
+
+    def _restart_worker(self, reason: str):
+        print(f"Hand tracker worker {reason}; restarting")
+        self.restarts += 1
+        if self.metrics is not None:
+            self.metrics.increment('tracker.worker_restarts')
+        self._conn.close()
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process.join(timeout=1.0)
+        self._start_worker()
+
+    def allocate_frames(self, shape: Tuple[int, ...], dtype, count: int) -> List[np.ndarray]:
+        """Capture buffers in shared memory for Camera(buffer_allocator=...)"""
+        if self._ring is not None:
+            self._ring.close()
+        self._ring = SharedFrameRing(shape, dtype, count)
+        self._send_ring('camera', self._ring)
+        return self._ring.buffers
+
+    def _slot_for(self, frame: np.ndarray) -> Tuple[str, int]:
+        if self._ring is not None:
+            slot = self._ring.index_of(frame)
+            if slot is not None:
+                return 'camera', slot
+        # Any other frame is copied into the staging block, which only this
+        # tracker uses: replacing it for a new shape never pulls the camera
+        # ring out from under Camera
+        if self._staging is None or self._staging.shape != frame.shape or self._staging.dtype != frame.dtype:
+            if self._staging is not None:
+                self._staging.close()
+            self._staging = SharedFrameRing(frame.shape, frame.dtype, 1)
+            self._send_ring('staging', self._staging)
+        np.copyto(self._staging.buffers[0], frame)
+        return 'staging', 0
+
+    def _wait_ready(self, timeout: float) -> bool:
+        if not self._conn.poll(timeout):
+            return False
+        return self._conn.recv()[0] == 'ready'
+    
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the worker has loaded its model"""
+        if not self._ready:
+            self._ready = self._wait_ready(timeout)
+        return self._ready
+
+    def track(self, frame: np.ndarray, timestamp: float):
+        """Same contract as HandTracker.track; results is always None because protobufs stay in the worker"""
+        hands_data = {'Left': None, 'Right': None}
+        start = time.perf_counter()
+
+        try:
+            if not self._ready:
+                if not self._process.is_alive():
+                    raise EOFError
+                # A (re)starting worker is loading its model: skip this frame instead of blocking
+                self._ready = self._wait_ready(0)
+                if not self._ready:
+                    return None, hands_data
+
+            self._sequence += 1
+            self._conn.send(('frame', self._sequence) + self._slot_for(frame) + (timestamp,))
+            while True:
+                if not self._conn.poll(self.timeout):
+                    self._restart_worker("timed out")
+                    return None, hands_data
+                reply = self._conn.recv()
+                # Replies to frames abandoned before a restart cannot arrive on a new pipe
+                if reply[0] == self._sequence:
+                    break
+        except (EOFError, BrokenPipeError, ConnectionResetError, OSError):
+            self._restart_worker("exited")
+            return None, hands_data
+
+        _, present, points = reply
+        slots = self._hand_slots[self._next_buffer]
+        self._next_buffer = (self._next_buffer + 1) % len(self._hand_slots)
+        frame_points = slots['Left'].frame_points
+        frame_points.reshape(-1)[:] = np.frombuffer(points, dtype=np.float32)
+        for label, info in zip(HAND_LABELS, present):
+            if info is not None:
+                hand = slots[label]
+                hand.score, hand.predicted = info
+                hands_data[label] = hand
+
+        self._last_hands_data = hands_data
+        if self.metrics is not None:
+            self.metrics.observe('tracker.process_roundtrip', time.perf_counter() - start)
+        return None, hands_data
+
+    @property
+    def ready(self) -> bool:
+        """Whether the current worker has reported its model loaded"""
+        return self._ready
+
+    def worker_cpu_time(self) -> float:
+        """
+        CPU seconds used by the current worker process. While the worker is
+        still loading its model this is the last value it reported; a worker
+        that does not answer within ``timeout`` is restarted like in track().
+        """
+        try:
+            if not self._ready:
+                if not self._process.is_alive():
+                    raise EOFError
+                # Busy loading: it would only answer once the model is up
+                self._ready = self._wait_ready(0)
+                if not self._ready:
+                    return self._worker_cpu
+
+            self._conn.send(('cpu',))
+            if not self._conn.poll(self.timeout):
+                self._restart_worker("timed out")
+                return self._worker_cpu
+            reply = self._conn.recv()
+        except (EOFError, BrokenPipeError, ConnectionResetError, OSError):
+            self._restart_worker("exited")
+            return self._worker_cpu
+
+        # track() waits for every frame reply, so nothing else can be pending
+        self._worker_cpu = reply[1]
+        return self._worker_cpu
+
+    def draw_landmarks(self, frame: np.ndarray, results: object):
+        # MediaPipe's drawing helpers need its protobufs, which stay in the
+        # worker: mark the landmarks of the last tracked frame instead, in
+        # the frame's own (unmirrored) coordinates like HandTracker does
+        width = frame.shape[1]
+        mirrored = self.tracker_kwargs.get('mirror_landmarks', False)
+        for hand in self._last_hands_data.values():
+            if hand is not None:
+                for x, y in hand.landmarks[:, :2]:
+                    cv2.circle(frame, (int(width - x if mirrored else x), int(y)), 3, (0, 0, 255), -1)
+
+    def close(self):
+        try:
+            self._conn.send(('stop',))
+        except (BrokenPipeError, OSError):
+            pass
+        self._process.join(timeout=2.0)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._conn.close()
+        for ring in (self._ring, self._staging):
+            if ring is not None:
+                ring.close()
+        self._ring = self._staging = None
@@ -0,0 +1,21 @@
+"""Shared pytest setup: make the modules in src/ importable the way main.py imports them"""
+
+import os
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARKS_DIR = os.path.join(PROJECT_ROOT, 'benchmarks')
+if BENCHMARKS_DIR not in sys.path:
+    sys.path.insert(0, BENCHMARKS_DIR)
+
+from common import write_synthetic_recording  # noqa: E402  (also puts src/ on sys.path)
+
+
+@pytest.fixture
+def synthetic_recording(tmp_path):
+    """Path of a 30 s synthetic landmark recording (see benchmarks/common.py)"""
+    path = str(tmp_path / 'session.bin')
+    write_synthetic_recording(path, frames=900, start=100.0)
+    return path
@@ -0,0 +1,101 @@
+"""AsyncActuator queueing: moves coalesce, scrolls merge, everything else keeps its order"""
+
+import threading
+
+from actuator import AsyncActuator
+
+
+class BlockingController:
+    """Records calls; the first click blocks until released, so later commands pile up in the queue"""
+
+    def __init__(self):
+        self.calls = []
+        self.blocked = threading.Event()
+        self.release = threading.Event()
+        self.closed = False
+
+    def _record(self, *call):
+        self.calls.append(call)
+
+    def move_mouse(self, x, y, frame_timestamp=None):
+        self._record('move_mouse', x, y)
+
+    def click(self):
+        self._record('click')
+        if not self.blocked.is_set():
+            self.blocked.set()
+            assert self.release.wait(5.0)
+
+    def scroll_up(self, speed):
+        self._record('scroll_up', speed)
+
+    def scroll_down(self, speed):
+        self._record('scroll_down', speed)
+
+    def copy(self):
+        self._record('copy')
+
+    def mouse_down(self):
+        self._record('mouse_down')
+
+    def mouse_up(self):
+        self._record('mouse_up')
+
+    def close(self):
+        self.closed = True
+
+
+def queue_behind_click(actuator, controller):
+    actuator.click()
+    assert controller.blocked.wait(5.0)
+
+
+def test_moves_coalesce_and_scrolls_merge_without_reordering():
+    controller = BlockingController()
+    actuator = AsyncActuator(controller)
+    queue_behind_click(actuator, controller)
+
+    for position in range(1, 4):
+        actuator.move_mouse(position, position)
+    actuator.scroll_up(5)
+    actuator.scroll_down(2)
+    actuator.click()
+    actuator.move_mouse(4, 4)
+    actuator.copy()
+    actuator.scroll_down(7)
+    controller.release.set()
+    actuator.close()
+
+    assert controller.calls == [
+        ('click',),
+        ('move_mouse', 3, 3),
+        ('scroll_up', 3),
+        ('click',),
+        ('move_mouse', 4, 4),
+        ('copy',),
+        ('scroll_down', 7),
+    ]
+    assert controller.closed
+
+
+def test_scrolls_that_cancel_out_do_nothing():
+    controller = BlockingController()
+    actuator = AsyncActuator(controller)
+    queue_behind_click(actuator, controller)
+
+    actuator.scroll_up(4)
+    actuator.scroll_down(4)
+    controller.release.set()
+    actuator.close()
+
+    assert controller.calls == [('click',)]
+
+
+def test_close_releases_a_held_button():
+    controller = BlockingController()
+    actuator = AsyncActuator(controller)
+    actuator.mouse_down()
+    actuator.move_mouse(1, 2)
+    actuator.close()
+
+    assert controller.calls == [('mouse_down',), ('move_mouse', 1, 2), ('mouse_up',)]
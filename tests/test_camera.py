@@ -0,0 +1,51 @@
+"""Threaded capture: a stalled camera is not a closed one"""
+
+import threading
+
+import numpy as np
+
+from camera import Camera
+
+
+class StallingSource:
+    """Delivers a few frames, stalls until resumed, then ends after a few more"""
+
+    width, height = 64, 48
+
+    def __init__(self, before_stall: int = 3, total: int = 6):
+        self.before_stall = before_stall
+        self.total = total
+        self.reads = 0
+        self.resume = threading.Event()
+
+    def read(self, image=None):
+        self.reads += 1
+        if self.reads > self.total:
+            return False, None
+        if self.reads > self.before_stall:
+            self.resume.wait(5.0)
+        return True, np.full((self.height, self.width, 3), self.reads, dtype=np.uint8)
+
+    def release(self):
+        self.resume.set()
+
+
+def test_a_stall_is_not_a_failure():
+    source = StallingSource()
+    camera = Camera(0, source.width, source.height, 30, threaded=True, source=source)
+    try:
+        # Drain the frames captured before the stall
+        while camera.read_frame(timeout=0.2)[0]:
+            pass
+        success, frame = camera.read_frame(timeout=0.05)
+        assert (success, frame, camera.failed) == (False, None, False)
+
+        source.resume.set()
+        assert camera.read_frame(timeout=2.0)[0]
+
+        # Frames captured before the source ended are still handed out
+        while camera.read_frame(timeout=2.0)[0]:
+            pass
+        assert camera.failed
+    finally:
+        camera.release()
@@ -0,0 +1,22 @@
+"""Cursor filters hold their output, state included, when a timestamp does not move forward"""
+
+import pytest
+
+from cursor_filter import KalmanFilter, OneEuroFilter
+
+
+@pytest.mark.parametrize('make_filter', [OneEuroFilter, lambda: KalmanFilter(prediction_time=0.03)],
+                         ids=['one_euro', 'kalman'])
+def test_stale_timestamps_keep_the_filtered_value(make_filter):
+    steady, repeated = make_filter(), make_filter()
+    for i in range(30):
+        point = (100.0 + 5 * i, 200.0 - 3 * i)
+        steady.filter(*point, i / 30)
+        repeated.filter(*point, i / 30)
+    last = repeated.filter(400.0, 500.0, 29 / 30)
+
+    # A jump arriving with the previous timestamp (or an older one) does not move the output
+    assert repeated.filter(900.0, -50.0, 29 / 30) == last
+    assert repeated.filter(900.0, -50.0, 28 / 30) == last
+    # and the next frame continues as if the stale samples never happened
+    assert repeated.filter(250.0, 110.0, 1.0) == steady.filter(250.0, 110.0, 1.0)
@@ -0,0 +1,63 @@
+"""RuleEvaluator timing: holds, taps and cooldowns in milliseconds, independent of the frame rate"""
+
+import numpy as np
+import pytest
+
+from gesture_rules import GestureRule, RuleEvaluator
+from landmarks import allocate_frame_hands
+
+PAIR = ('Left', 4, 'Left', 8)
+CLOSED = np.array([10.0])
+OPEN = np.array([100.0])
+
+
+def evaluator(**timing) -> RuleEvaluator:
+    return RuleEvaluator([GestureRule('pinch', *PAIR, threshold=40.0, **timing)], {PAIR: 0})
+
+
+def fire_times(rule: RuleEvaluator, fps: float, duration: float, closed, predicted: bool = False):
+    """Times at which the rule fires when the pair is closed whenever closed(t) is true"""
+    hands = allocate_frame_hands(1)[0]
+    hands['Left'].predicted = predicted
+    times = []
+    for i in range(int(duration * fps)):
+        t = i / fps
+        if rule.evaluate(CLOSED if closed(t) else OPEN, hands, t, drag_active=False):
+            times.append(t)
+    return times
+
+
+@pytest.mark.parametrize('fps', [15, 30, 60, 120])
+def test_hold_fires_after_hold_ms(fps):
+    times = fire_times(evaluator(hold_ms=100, cooldown_ms=10000), fps, 1.0, lambda t: t >= 0.2)
+    assert len(times) == 1
+    # On the first frame 100 ms after closing, or the next one when float rounding leaves it a hair short
+    assert 0.3 - 1e-9 <= times[0] <= 0.3 + 1 / fps + 1e-9
+
+
+@pytest.mark.parametrize('fps', [15, 30, 60, 120])
+def test_cooldown_limits_repeats_the_same_at_any_frame_rate(fps):
+    # Held closed for 2 s: fires at once, then every 500 ms
+    times = fire_times(evaluator(cooldown_ms=500), fps, 2.0, lambda t: True)
+    assert len(times) == 4
+    assert np.all(np.diff(times) >= 0.5 - 1e-9)
+    assert np.all(np.diff(times) <= 0.5 + 1 / fps + 1e-9)
+
+
+@pytest.mark.parametrize('fps', [30, 60])
+def test_tap_fires_on_release_only_when_quick(fps):
+    quick = fire_times(evaluator(release_ms=250), fps, 1.0, lambda t: 0.1 <= t < 0.25)
+    slow = fire_times(evaluator(release_ms=250), fps, 1.0, lambda t: 0.1 <= t < 0.5)
+    assert len(quick) == 1 and 0.25 <= quick[0] < 0.25 + 1 / fps
+    assert slow == []
+
+
+def test_predicted_hands_do_not_fire():
+    assert fire_times(evaluator(), 30, 1.0, lambda t: True, predicted=True) == []
+
+
+def test_drag_gated_rules_follow_drag_mode():
+    rule = RuleEvaluator([GestureRule('drag_end', *PAIR, threshold=40.0, drag=True)], {PAIR: 0})
+    hands = allocate_frame_hands(1)[0]
+    assert rule.evaluate(CLOSED, hands, 0.0, drag_active=False) == []
+    assert rule.evaluate(CLOSED, hands, 0.1, drag_active=True) == ['drag_end']
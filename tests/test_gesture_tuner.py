@@ -0,0 +1,54 @@
+"""The tuner's vectorized simulation fires exactly where the live GestureDetector does"""
+
+import numpy as np
+import pytest
+
+import config
+from gesture_detector import GestureDetector
+from gesture_rules import default_rules
+from gesture_tuner import TUNED_SETTINGS, load_session, score, simulate
+from recorder import Recording
+
+
+def live_firings(path, rules):
+    """Frame indices where each rule fired in GestureDetector, replaying the recording"""
+    recording = Recording(path)
+    detector = GestureDetector(rules=rules)
+    firings = {rule.name: [] for rule in rules}
+    for index in range(len(recording)):
+        detector.evaluate(recording.hands_at(index), float(recording.timestamps[index]))
+        for name in detector.fired:
+            firings[name].append(index)
+    return firings
+
+
+def test_simulate_matches_the_detector_for_every_configuration(synthetic_recording):
+    rules = [rule for rule in default_rules(config) if rule.name in TUNED_SETTINGS]
+    # The configured settings, and tighter thresholds with shorter cooldowns
+    variants = [rules, [rule._replace(threshold=rule.threshold * 0.6, cooldown_ms=rule.cooldown_ms / 3)
+                        for rule in rules]]
+    thresholds = np.array([[variant[i].threshold for variant in variants] for i in range(len(rules))])
+    cooldowns = np.array([[variant[i].cooldown_ms / 1000 for variant in variants] for i in range(len(rules))])
+
+    session = load_session(synthetic_recording, {}, rules)
+    simulated = simulate(session, rules, thresholds, cooldowns)
+
+    for column, variant in enumerate(variants):
+        expected = live_firings(synthetic_recording, variant)
+        for rule, (frames, fired) in zip(rules, simulated):
+            assert frames[fired[:, column]].tolist() == expected[rule.name], (column, rule.name)
+    assert any(len(frames) for frames, _ in simulated)
+
+
+def test_score_matches_firings_to_labels_within_tolerance():
+    times = np.arange(10, dtype=float)
+    frames = np.array([1, 4, 8])
+    # Configuration 0 fires on all three frames, configuration 1 only on frame 4
+    fired = np.array([[True, False], [True, True], [True, False]])
+    labels = np.array([1.2, 7.0])
+
+    counts = score(times, frames, fired, labels, tolerance=0.3)
+
+    assert [np.asarray(field).tolist() for field in counts] == [[1, 0], [3, 1], [1, 0], 2]
+    assert counts.precision() == pytest.approx([1 / 3, 0.0])
+    assert counts.recall() == pytest.approx([0.5, 0.0])
@@ -0,0 +1,106 @@
+"""IdleTracker with a tracker worker process that is still loading its model"""
+
+import numpy as np
+import pytest
+
+from idle_mode import ACTIVE, IDLE, IdleTracker
+from landmarks import allocate_frame_hands
+from metrics import Metrics
+
+
+class LoadingWorkerTracker:
+    """
+    Stands in for ProcessHandTracker: not ready for the first ``loading_frames``
+    frames, then sees a right hand on every frame. Asking a loading worker for
+    its CPU time would block until the model loads, so that fails the test.
+    """
+
+    def __init__(self, loading_frames: int = 3):
+        self.loading_frames = loading_frames
+        self.frames = 0
+        self.cpu_queries = 0
+        self.hands = allocate_frame_hands(1)[0]
+
+    @property
+    def ready(self) -> bool:
+        return self.frames >= self.loading_frames
+
+    def track(self, frame, timestamp):
+        loaded = self.ready
+        self.frames += 1
+        if not loaded:
+            return None, {'Left': None, 'Right': None}
+        return None, {'Left': None, 'Right': self.hands['Right']}
+
+    def worker_cpu_time(self) -> float:
+        if not self.ready:
+            pytest.fail("worker_cpu_time called while the worker was loading its model")
+        self.cpu_queries += 1
+        return 0.0
+
+    def draw_landmarks(self, frame, results):
+        pass
+
+    def close(self):
+        pass
+
+
+class NoHandsTracker:
+    def track(self, frame, timestamp):
+        return None, {'Left': None, 'Right': None}
+
+    def close(self):
+        pass
+
+
+class UnusedPresenceTracker:
+    def track(self, frame, timestamp):
+        pytest.fail("presence check while hands were in view")
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize('metrics', [None, Metrics()], ids=['no-metrics', 'metrics'])
+def test_hands_come_through_after_the_worker_loads(metrics):
+    tracker = LoadingWorkerTracker()
+    idle = IdleTracker(tracker, UnusedPresenceTracker(), timeout=10.0, metrics=metrics)
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+
+    seen = [idle.track(frame, i / 30)[1]['Right'] is not None for i in range(10)]
+
+    assert seen == [False] * 3 + [True] * 7
+    assert idle.state == ACTIVE
+    idle.close()
+
+
+def test_worker_cpu_is_not_queried_without_metrics():
+    tracker = LoadingWorkerTracker(loading_frames=0)
+    tracker.track = NoHandsTracker().track
+    idle = IdleTracker(tracker, NoHandsTracker(), timeout=0.1)
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+
+    for i in range(10):
+        idle.track(frame, i / 30)
+    idle.close()
+
+    assert idle.state == IDLE
+    assert tracker.cpu_queries == 0
+
+
+def test_process_tracker_hands_come_through():
+    pytest.importorskip('mediapipe')
+    from tracker_process import ProcessHandTracker
+
+    tracker = ProcessHandTracker(2, 0.5, 0.5, timeout=30.0, warmup_shape=(48, 64, 3))
+    idle = IdleTracker(tracker, UnusedPresenceTracker(), metrics=Metrics())
+    try:
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        # The first frames may arrive while the worker loads its model
+        for i in range(5):
+            idle.track(frame, i / 30)
+        assert tracker.wait_ready(60.0)
+        idle.track(frame, 1.0)
+        assert tracker.ready
+    finally:
+        idle.close()
@@ -0,0 +1,59 @@
+"""Input backends: the in-memory backend records calls in order and the factory picks backends by name"""
+
+import pytest
+
+from input_backends import RecordingBackend, create_backend
+from mouse_controller import MouseController
+
+
+def test_recording_backend_keeps_calls_in_order():
+    backend = RecordingBackend((800, 600))
+    backend.move_to(10, 20)
+    backend.click()
+    backend.scroll(-3)
+    backend.mouse_down()
+    backend.move_to(30, 40)
+    backend.mouse_up()
+    backend.hotkey('ctrl', 'c')
+    backend.double_click()
+
+    assert backend.calls == [
+        ('move_to', 10, 20),
+        ('click',),
+        ('scroll', -3),
+        ('mouse_down',),
+        ('move_to', 30, 40),
+        ('mouse_up',),
+        ('hotkey', 'ctrl', 'c'),
+        ('double_click',),
+    ]
+    assert backend.counts['move_to'] == 2
+    assert (backend.size(), backend.position, backend.button_down) == ((800, 600), (30, 40), False)
+
+    backend.clear()
+    assert backend.calls == [] and not backend.counts
+
+
+def test_mouse_controller_drives_the_backend():
+    backend = RecordingBackend()
+    controller = MouseController(0.5, 1.0, 100, backend=backend)
+    controller.move_mouse(5, 6)
+    controller.scroll_up(4)
+    controller.scroll_down(2)
+    controller.paste()
+    controller.switch_desktop_left()
+
+    assert (controller.screen_width, controller.screen_height) == (1920, 1080)
+    assert backend.calls == [
+        ('move_to', 5, 6),
+        ('scroll', 4),
+        ('scroll', -2),
+        ('hotkey', 'ctrl', 'v'),
+        ('hotkey', 'ctrl', 'win', 'left'),
+    ]
+
+
+def test_create_backend_by_name():
+    assert isinstance(create_backend('recording'), RecordingBackend)
+    with pytest.raises(ValueError, match='Unknown input backend'):
+        create_backend('carrier-pigeon')
@@ -0,0 +1,189 @@
+"""Split-mode datagrams: encode/decode round trips and the receiver's staleness rules over loopback"""
+
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from gesture_detector import GestureEvents
+from landmarks import allocate_frame_hands
+from network import (HEADER, KIND_EVENTS, KIND_LANDMARKS, MAX_DATAGRAM, StreamReceiver, StreamSender, decode,
+                     encode_events, encode_landmarks)
+
+FRAME_SIZE = (1280, 720)
+
+
+@pytest.fixture
+def hands():
+    hands = allocate_frame_hands(1)[0]
+    rng = np.random.default_rng(0)
+    hands['Left'].frame_points[:] = rng.uniform(-100, 1400, (42, 3)) * [1.0, 0.6, 0.0005]
+    hands['Left'].score = 0.93
+    hands['Right'].score = 0.51
+    hands['Right'].predicted = True
+    return hands
+
+
+def round_trip(encode, *args):
+    buffer = bytearray(MAX_DATAGRAM)
+    length = encode(buffer, 7, 123.25, FRAME_SIZE, *args)
+    return length, decode(bytes(buffer[:length]))
+
+
+def test_float32_landmarks_round_trip_exactly(hands):
+    length, packet = round_trip(encode_landmarks, hands, False)
+    assert length == HEADER.size + 2 * 64 * 4
+    assert (packet.kind, packet.sequence, packet.timestamp, packet.frame_size) == (KIND_LANDMARKS, 7, 123.25,
+                                                                                   FRAME_SIZE)
+    for label in ('Left', 'Right'):
+        np.testing.assert_array_equal(packet.hands_data[label].landmarks, hands[label].landmarks)
+        assert packet.hands_data[label].score == pytest.approx(hands[label].score)
+        assert packet.hands_data[label].predicted == hands[label].predicted
+
+
+def test_int16_landmarks_stay_within_a_tenth_of_a_pixel(hands):
+    length, packet = round_trip(encode_landmarks, hands, True)
+    assert length == HEADER.size + 2 * 64 * 2
+    for label in ('Left', 'Right'):
+        error = np.abs(packet.hands_data[label].landmarks - hands[label].landmarks)
+        assert error[:, :2].max() < 0.1
+        assert error[:, 2].max() < 1e-3
+        assert packet.hands_data[label].score == pytest.approx(hands[label].score, abs=1e-4)
+
+
+def test_missing_hands_are_not_sent(hands):
+    length, packet = round_trip(encode_landmarks, {'Left': None, 'Right': hands['Right']}, True)
+    assert length == HEADER.size + 64 * 2
+    assert packet.hands_data['Left'] is None
+    assert packet.hands_data['Right'].predicted
+
+
+@pytest.mark.parametrize('quantize', [False, True])
+def test_events_round_trip(quantize):
+    events = GestureEvents(123.25, ('single_click', 'paste'), 'down', (640.3, 100.7), 'start')
+    _, packet = round_trip(encode_events, events, quantize)
+    assert packet.kind == KIND_EVENTS
+    decoded = packet.events
+    assert (decoded.actions, decoded.scroll, decoded.drag) == (events.actions, events.scroll, events.drag)
+    assert decoded.cursor == pytest.approx(events.cursor, abs=0.1)
+
+    _, packet = round_trip(encode_events, GestureEvents(1.0), quantize)
+    assert packet.events == GestureEvents(123.25)
+
+
+@pytest.mark.parametrize('data', [b'', b'GM', b'XX' + bytes(HEADER.size), bytes(HEADER.size + 3)])
+def test_malformed_datagrams_are_rejected(data):
+    with pytest.raises(ValueError):
+        decode(data)
+
+
+def test_truncated_landmarks_are_rejected(hands):
+    buffer = bytearray(MAX_DATAGRAM)
+    length = encode_landmarks(buffer, 1, 0.0, FRAME_SIZE, hands)
+    with pytest.raises(ValueError):
+        decode(bytes(buffer[:length - 4]))
+
+
+@pytest.fixture
+def link():
+    receiver = StreamReceiver('127.0.0.1', 0, max_age=0.05)
+    senders = []
+
+    def connect(payload='landmarks'):
+        sender = StreamSender('127.0.0.1', receiver.address[1], FRAME_SIZE, payload)
+        senders.append(sender)
+        return sender
+
+    yield receiver, connect
+    for sender in senders:
+        sender.close()
+    receiver.close()
+
+
+def drain(receiver):
+    packets = []
+    while True:
+        packet = receiver.receive(timeout=0.2)
+        if packet is None:
+            return packets
+        packets.append(packet)
+
+
+def test_receiver_drops_duplicates_reordered_and_late_landmarks(link, hands):
+    receiver, connect = link
+    sender = connect()
+    for _ in range(5):
+        sender.send(time.perf_counter(), hands)
+    # Sequence 3 again, then 6 captured a second ago, then 7
+    sender.sequence = 2
+    sender.send(time.perf_counter(), hands)
+    sender.sequence = 5
+    sender.send(time.perf_counter() - 1.0, hands)
+    sender.send(time.perf_counter(), hands)
+
+    packets = drain(receiver)
+    assert [packet.sequence for packet in packets] == [1, 2, 3, 4, 5, 7]
+    assert (receiver.received, receiver.stale, receiver.lost) == (8, 2, 0)
+    timestamps = [packet.timestamp for packet in packets]
+    assert timestamps == sorted(timestamps)
+
+
+def test_receiver_counts_lost_datagrams(link, hands):
+    receiver, connect = link
+    sender = connect()
+    sender.send(time.perf_counter(), hands)
+    sender.sequence = 4
+    sender.send(time.perf_counter(), hands)
+
+    assert [packet.sequence for packet in drain(receiver)] == [1, 5]
+    assert receiver.lost == 3
+
+
+def test_late_events_keep_their_actions_but_not_the_cursor(link):
+    receiver, connect = link
+    sender = connect('events')
+    now = time.perf_counter()
+    sender.send(now, None, GestureEvents(now, cursor=(10.0, 20.0)))
+    sender.send(now - 1.0, None, GestureEvents(now - 1.0, ('copy',), cursor=(30.0, 40.0)))
+
+    fresh, late = drain(receiver)
+    assert fresh.events.cursor == pytest.approx((10.0, 20.0))
+    assert late.events.actions == ('copy',)
+    assert late.events.cursor is None
+    assert receiver.stale == 1
+
+
+def test_a_restarted_sender_is_accepted(link, hands):
+    receiver, connect = link
+    sender = connect()
+    sender.sequence = 5000
+    sender.send(time.perf_counter(), hands)
+    restarted = connect()
+    restarted.send(time.perf_counter(), hands)
+
+    assert [packet.sequence for packet in drain(receiver)] == [5001, 1]
+
+
+class OversizedSocket:
+    """Fails every receive the way Windows does for a datagram larger than the buffer"""
+
+    def settimeout(self, timeout):
+        pass
+
+    def recvfrom_into(self, buffer):
+        raise OSError(10040, "A message sent on a datagram socket was larger than the buffer")
+
+
+def test_oversized_datagrams_are_dropped_not_fatal():
+    counts = Counter()
+    receiver = StreamReceiver('127.0.0.1', 0,
+                              metrics=SimpleNamespace(increment=lambda name, value=1: counts.update({name: value})))
+    real_socket, receiver.socket = receiver.socket, OversizedSocket()
+    try:
+        assert receiver.receive(timeout=0.1) is None
+        assert counts['network.malformed'] == 1
+    finally:
+        receiver.socket = real_socket
+        receiver.close()
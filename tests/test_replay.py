@@ -0,0 +1,82 @@
+"""Recorded sessions read back exactly and replay to the same actions every time"""
+
+import numpy as np
+
+import config
+from actions import ActionFeedback, handle_gestures
+from common import write_synthetic_recording
+from gesture_detector import GestureDetector
+from landmarks import allocate_frame_hands
+from mouse_controller import NullMouseController
+from recorder import Recording, SessionRecorder
+from replay import apply_frame_size, replay_session
+
+
+def null_controller() -> NullMouseController:
+    return NullMouseController(config.SMOOTHING_FACTOR, config.MOUSE_SPEED_MULTIPLIER, config.SCREEN_PADDING)
+
+
+def test_recording_reads_back_what_was_written(tmp_path):
+    path = str(tmp_path / 'session.bin')
+    hands = allocate_frame_hands(1)[0]
+    hands['Left'].frame_points[:] = np.arange(42 * 3, dtype=np.float32).reshape(42, 3)
+    hands['Left'].score, hands['Right'].score = 0.75, 0.5
+    hands['Right'].predicted = True
+
+    recorder = SessionRecorder(path, 640, 480)
+    recorder.write(1.5, hands)
+    recorder.write(1.6, {'Left': None, 'Right': hands['Right']})
+    recorder.close()
+
+    recording = Recording(path)
+    assert (len(recording), recording.frame_width, recording.frame_height) == (2, 640, 480)
+    np.testing.assert_array_equal(recording.timestamps, [1.5, 1.6])
+
+    first = recording.hands_at(0)
+    np.testing.assert_array_equal(first['Left'].landmarks, hands['Left'].landmarks)
+    np.testing.assert_array_equal(first['Right'].landmarks, hands['Right'].landmarks)
+    assert (first['Left'].score, first['Left'].predicted) == (0.75, False)
+    assert (first['Right'].score, first['Right'].predicted) == (0.5, True)
+
+    second = recording.hands_at(1)
+    assert second['Left'] is None
+    assert second['Right'].predicted
+
+
+def test_replay_is_deterministic_and_matches_the_live_run(synthetic_recording):
+    recording = Recording(synthetic_recording)
+
+    # What the live loop did with the same frames
+    live = null_controller()
+    detector, feedback = GestureDetector(), ActionFeedback()
+    for index in range(len(recording)):
+        handle_gestures(recording.hands_at(index), detector, live, feedback, float(recording.timestamps[index]),
+                        log=lambda message: None)
+
+    first = replay_session(recording, GestureDetector(), null_controller())
+    second = replay_session(recording, GestureDetector(), null_controller())
+
+    assert first['actions'] == second['actions'] == dict(sorted(live.actions.items()))
+    assert first['final_position'] == second['final_position'] == live.position
+    # The recording exercises clicks, edits, desktop switches, scrolling and drags
+    for action in ('click', 'copy', 'paste', 'scroll_up', 'mouse_down', 'mouse_up', 'move'):
+        assert first['actions'].get(action, 0) > 0, action
+
+
+def test_replay_uses_the_recorded_frame_size(tmp_path, monkeypatch):
+    # Recorded live at 640x360, replayed on a machine configured for 1280x720
+    path = str(tmp_path / 'small.bin')
+    monkeypatch.setattr(config, 'CAMERA_WIDTH', 640)
+    monkeypatch.setattr(config, 'CAMERA_HEIGHT', 360)
+    write_synthetic_recording(path, frames=900)
+    recording = Recording(path)
+    live = replay_session(recording, GestureDetector(), null_controller())
+
+    monkeypatch.setattr(config, 'CAMERA_WIDTH', 1280)
+    monkeypatch.setattr(config, 'CAMERA_HEIGHT', 720)
+    apply_frame_size(recording)
+    assert (config.CAMERA_WIDTH, config.CAMERA_HEIGHT) == (640, 360)
+    replayed = replay_session(recording, GestureDetector(), null_controller())
+
+    assert replayed['actions'] == live['actions']
+    assert replayed['final_position'] == live['final_position']